@@ -0,0 +1,152 @@
+"""
+Micro-batching for concurrent /predict requests.
+
+Requests that arrive within a few milliseconds of each other are queued,
+stacked into one matrix and scored with a single make_prediction_batch call
+on the event loop, then each caller's future is resolved with its own
+probability. This trades up to ``max_wait_ms`` of latency for far fewer
+per-call and thread-handoff overheads under load.
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from collections.abc import Callable
+from contextlib import suppress
+
+import numpy as np
+
+from prediction import make_prediction_batch
+from prediction_logging import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+class CoalescerFull(Exception):
+    """Raised when the coalescer queue is at ``max_queue`` requests."""
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row predictions into batched scoring calls."""
+
+    def __init__(
+        self,
+        score_batch: Callable[[np.ndarray], np.ndarray] = make_prediction_batch,
+        max_batch: int = 64,
+        max_wait_ms: float = 2.0,
+        max_queue: int = 10_000,
+    ):
+        if max_batch <= 0 or max_queue <= 0:
+            raise ValueError("max_batch and max_queue must be positive")
+        self.score_batch = score_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self.batches = 0
+        self.rows = 0
+        self._pending: deque[tuple[np.ndarray, asyncio.Future]] = deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._has_items = asyncio.Event()
+        self._batch_full = asyncio.Event()
+
+    @classmethod
+    def from_env(
+        cls, score_batch: Callable[[np.ndarray], np.ndarray] = make_prediction_batch
+    ) -> "MicroBatcher | None":
+        """Build from the COALESCE_* variables, None unless PREDICT_COALESCE=1."""
+        if os.environ.get("PREDICT_COALESCE", "0") != "1":
+            return None
+        return cls(
+            score_batch=score_batch,
+            max_batch=int(os.environ.get("COALESCE_MAX_BATCH", "64")),
+            max_wait_ms=float(os.environ.get("COALESCE_MAX_WAIT_MS", "2")),
+            max_queue=int(os.environ.get("COALESCE_MAX_QUEUE", "10000")),
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "queue_depth": self.queue_depth,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+        }
+
+    async def submit(self, row: np.ndarray) -> float:
+        """Queue one encoded row and wait for its churn probability."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._start(loop)
+        if len(self._pending) >= self.max_queue:
+            raise CoalescerFull(f"{self.max_queue} predictions already queued")
+
+        future = loop.create_future()
+        self._pending.append((row, future))
+        self._has_items.set()
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+        return await future
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._loop = self._task = None
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Events and the worker task belong to one event loop, so they are
+        # created on first use in whichever loop is serving requests
+        self._loop = loop
+        self._has_items = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._pending.clear()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_items.wait()
+            if len(self._pending) < self.max_batch and self.max_wait > 0:
+                self._batch_full.clear()
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._batch_full.wait(), self.max_wait)
+
+            size = min(len(self._pending), self.max_batch)
+            batch = [self._pending.popleft() for _ in range(size)]
+            if not self._pending:
+                self._has_items.clear()
+            self._score(batch)
+
+    @staticmethod
+    def _fail(batch: list[tuple[np.ndarray, asyncio.Future]], error: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _score(self, batch: list[tuple[np.ndarray, asyncio.Future]]) -> None:
+        try:
+            probs = self.score_batch(np.stack([row for row, _ in batch])).tolist()
+        except ValueError as e:
+            # A bad row fails its batch; each caller turns this into a 400
+            self._fail(batch, e)
+            return
+        except Exception as e:
+            # Anything else is a bug: keep its traceback, and still answer the
+            # callers so the batching loop survives
+            logger.exception(
+                "coalesced_batch_failed", extra={"fields": {"rows": len(batch)}}
+            )
+            self._fail(batch, e)
+            return
+
+        self.batches += 1
+        self.rows += len(batch)
+        for (_, future), prob in zip(batch, probs, strict=True):
+            # The caller may have gone away (e.g. a cancelled request)
+            if not future.done():
+                future.set_result(prob)
@@ -0,0 +1,71 @@
+"""
+Request timing for the FastAPI routes.
+
+``TimedRoute`` wraps every route handler to count requests and errors and
+record end-to-end latency. Endpoints call ``endpoint_started()`` on entry and
+``endpoint_finished()`` just before returning, which splits the request into
+the validation stage (body parsing and pydantic) and the serialization stage
+(rendering the response) around the endpoint's own work.
+"""
+
+import time
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+import metrics
+
+# [request start, endpoint start, endpoint end] for the current request
+_MARKS: ContextVar[list[float] | None] = ContextVar("request_marks", default=None)
+
+
+def endpoint_started() -> None:
+    marks = _MARKS.get()
+    if marks is not None:
+        marks[1] = time.perf_counter()
+        metrics.VALIDATION.observe(marks[1] - marks[0])
+
+
+def endpoint_finished() -> None:
+    marks = _MARKS.get()
+    if marks is not None:
+        marks[2] = time.perf_counter()
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records request counts and latency for its path."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        route = self.path
+        latency = metrics.REQUEST_SECONDS.labels(route)
+
+        async def timed_handler(request: Request) -> Response:
+            marks = [time.perf_counter(), 0.0, 0.0]
+            token = _MARKS.set(marks)
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                end = time.perf_counter()
+                _MARKS.reset(token)
+                if marks[2]:
+                    metrics.SERIALIZATION.observe(end - marks[2])
+                latency.observe(end - marks[0])
+                metrics.REQUESTS.labels(route, str(status)).inc()
+                if status >= 400:
+                    metrics.ERRORS.labels(route, str(status)).inc()
+
+        return timed_handler
@@ -1,8 +1,54 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import os
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import Annotated
+
+import numpy as np
+from fastapi import (
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
-from prediction import make_prediction
+import metrics
+from backend.coalescer import CoalescerFull, MicroBatcher
+from backend.instrumentation import TimedRoute, endpoint_finished, endpoint_started
+from encoding import encode_row
+from model_registry import ModelRegistry, UnknownModelVersion
+from prediction import (
+    get_scorer,
+    make_prediction_batch,
+    make_prediction_row,
+    model_version,
+)
+from prediction_cache import PredictionCache
+from prediction_logging import configure_logging
+from shared_model import SharedModel
+from sweep import MAX_CELLS, MAX_CHOICES, SWEEP_DIMENSIONS, sweep
+from validation import ValidatedBatch, validate_features, validate_records
+from wire_formats import (
+    ARROW,
+    BINARY,
+    JSON,
+    NotAcceptable,
+    UnsupportedMediaType,
+    decode_features,
+    encode_explanation,
+    encode_probabilities,
+    loads,
+    media_type,
+    negotiate,
+)
 
 app = FastAPI(
     title="Telco Churn API",
@@ -10,6 +56,9 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Count and time every route declared below
+app.router.route_class = TimedRoute
+
 app.add_middleware(
     CORSMiddleware, # ty: ignore
     allow_origins=["*"],
@@ -18,6 +67,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Sampled JSON logs, written from a background thread
+configure_logging()
+
+# Opt-in, enabled by setting MODEL_REGISTRY_DIR; watched for new bundles
+REGISTRY = ModelRegistry.from_env()
+if REGISTRY is not None:
+    REGISTRY.start(float(os.environ.get("MODEL_WATCH_INTERVAL", "2")))
+
+# Set by backend.serve in its workers; the default model lives in shared memory
+SHARED = SharedModel.from_env()
+if SHARED is not None:
+    SHARED.start(float(os.environ.get("MODEL_WATCH_INTERVAL", "2")))
+
+ModelVersionHeader = Annotated[str | None, Header(alias="X-Model-Version")]
+
+def registry_scorer(version: str | None):
+    """The registry model for ``version``, None to use the default model."""
+    if REGISTRY is None:
+        if version is not None:
+            raise UnknownModelVersion("Model versions need MODEL_REGISTRY_DIR set")
+        return None if SHARED is None else SHARED.scorer
+    return REGISTRY.get(version).scorer
+
+def default_version() -> str:
+    if REGISTRY is not None:
+        return REGISTRY.get().sha256
+    if SHARED is not None:
+        return SHARED.sha256
+    return model_version()
+
+def score_default_batch(matrix: np.ndarray) -> np.ndarray:
+    return make_prediction_batch(matrix, registry_scorer(None))
+
+# Opt-in, enabled by setting PREDICTION_LOOKUP=1; scores from precomputed tables
+LOOKUP = os.environ.get("PREDICTION_LOOKUP", "0") == "1"
+
+# Opt-in, enabled by setting PREDICTION_CACHE_SIZE
+CACHE = PredictionCache.from_env(version=default_version)
+
+# Opt-in, enabled by setting PREDICT_COALESCE=1
+COALESCER = MicroBatcher.from_env(score_batch=score_default_batch)
+
+def component_metrics():
+    """Cache and coalescer statistics, collected at scrape time."""
+    if CACHE is not None:
+        stats = CACHE.stats()
+        for name in ("hits", "misses", "evictions", "invalidations"):
+            family = f"telco_cache_{name}"
+            yield family, "counter", [(family + "_total", {}, stats[name])]
+        yield "telco_cache_size", "gauge", [("telco_cache_size", {}, stats["size"])]
+    if COALESCER is not None:
+        stats = COALESCER.stats()
+        depth = stats["queue_depth"]
+        yield "telco_coalescer_queue_depth", "gauge", [
+            ("telco_coalescer_queue_depth", {}, depth)
+        ]
+        for name in ("batches", "rows"):
+            family = f"telco_coalescer_{name}"
+            yield family, "counter", [(family + "_total", {}, stats[name])]
+
+metrics.register_collector(component_metrics)
+
 class PredictionRequest(BaseModel):
     tenure: float
     monthly: float
@@ -27,53 +138,319 @@ class PredictionRequest(BaseModel):
     internet_service: str
     payment_method: str
 
-def convert_contract(months):
-    if months <= 1:
-        return 0, 0
-    elif months <= 12:
-        return 1, 0
-    else:
-        return 0, 1
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    # Bounded here so a huge grid is rejected before linspace allocates it
+    num: int = Field(10, ge=1, le=MAX_CELLS)
 
-def convert_internet(service):
-    s = service.lower().strip()
-    return (
-        1 if s == "fiber optic" else 0,
-        1 if s == "no" else 0,
+class SweepRequest(BaseModel):
+    base: PredictionRequest
+    tenure: SweepRange | None = None
+    monthly: SweepRange | None = None
+    contract_months: list[int] | None = Field(None, max_length=MAX_CHOICES)
+    internet_service: list[str] | None = Field(None, max_length=MAX_CHOICES)
+    payment_method: list[str] | None = Field(None, max_length=MAX_CHOICES)
+
+def encode_request(data: PredictionRequest) -> np.ndarray:
+    start = time.perf_counter()
+    row = encode_row(
+        data.tenure,
+        data.monthly,
+        data.techsupport,
+        data.paperless,
+        data.contract_months,
+        data.internet_service,
+        data.payment_method,
     )
+    metrics.ENCODE.observe(time.perf_counter() - start)
+    return row
 
-def convert_payment(method):
-    m = method.lower().strip()
-    return (
-        1 if m == "credit card (automatic)" else 0,
-        1 if m == "electronic check" else 0,
-        1 if m == "mailed check" else 0,
+def lookup_score(data: PredictionRequest) -> float:
+    table = (registry_scorer(None) or get_scorer()).lookup_table
+    start = time.perf_counter()
+    prob = table.predict(
+        data.tenure,
+        data.monthly,
+        data.techsupport,
+        data.paperless,
+        data.contract_months,
+        data.internet_service,
+        data.payment_method,
     )
+    metrics.SCORE.observe(time.perf_counter() - start)
+    return prob
+
+def score_row(row: np.ndarray, scorer=None) -> float:
+    if CACHE is not None:
+        return CACHE.get_or_compute(row, lambda r: make_prediction_row(r, scorer))
+    return make_prediction_row(row, scorer)
+
+async def score_encoded(row: np.ndarray, version: str | None) -> float:
+    if version is not None:
+        # The lookup tables, coalescer and cache only serve the default version
+        return await run_in_threadpool(make_prediction_row, row, registry_scorer(version))
+    if COALESCER is not None:
+        return await COALESCER.submit(row)
+    return await run_in_threadpool(score_row, row, registry_scorer(None))
+
+async def score_single(
+    data: PredictionRequest | Callable[[], np.ndarray], version: str | None
+) -> float:
+    """Score a request, or the single row a packed body decodes to."""
+    endpoint_started()
+    try:
+        if not isinstance(data, PredictionRequest):
+            rows = data()
+            if len(rows) != 1:
+                raise ValueError(f"Expected one row, got {len(rows)}")
+            prob = await score_encoded(rows[0], version)
+        elif LOOKUP and version is None:
+            # A few list lookups, cheaper than handing the row to a thread
+            prob = lookup_score(data)
+        else:
+            prob = await score_encoded(encode_request(data), version)
+    except UnknownModelVersion as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except CoalescerFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    endpoint_finished()
+    return prob
+
+def explain_rows(rows: np.ndarray, scorer) -> tuple[np.ndarray, np.ndarray, float]:
+    """Probabilities, per-feature logit contributions and the intercept."""
+    scorer = scorer or get_scorer()
+    contributions = scorer.contributions(rows)
+    return make_prediction_batch(rows, scorer), contributions, scorer.intercept
+
+def score_batch(
+    encode: Callable[[], np.ndarray], version: str | None, explain: bool = False
+):
+    """Score the matrix ``encode()`` returns; ``explain`` adds ``explain_rows``."""
+    endpoint_started()
+    try:
+        score = explain_rows if explain else make_prediction_batch
+        probs = score(encode(), registry_scorer(version))
+    except UnknownModelVersion as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/predict")
-def predict(data: PredictionRequest):
+    endpoint_finished()
+    return probs
 
-    c1, c2 = convert_contract(data.contract_months)
-    i_fiber, i_no = convert_internet(data.internet_service)
-    p_card, p_echeck, p_mail = convert_payment(data.payment_method)
+def request_formats(request: Request) -> tuple[str, str]:
+    """The request body's media type and the one to respond with."""
+    try:
+        kind = media_type(request.headers.get("content-type"))
+        return kind, negotiate(request.headers.get("accept"))
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except NotAcceptable as e:
+        raise HTTPException(status_code=406, detail=str(e))
 
+def parse_json(adapter: TypeAdapter, body: bytes):
+    # pydantic parses and validates the raw bytes in one pass
     try:
-        prob = make_prediction(
-            **{
-                "tenure": data.tenure,
-                "MonthlyCharges": data.monthly,
-                "TechSupport_yes": data.techsupport,
-                "Contract_one year": c1,
-                "Contract_two year": c2,
-                "PaperlessBilling_yes": data.paperless,
-                "InternetService_fiber optic": i_fiber,
-                "InternetService_no": i_no,
-                "PaymentMethod_credit card (automatic)": p_card,
-                "PaymentMethod_electronic check": p_echeck,
-                "PaymentMethod_mailed check": p_mail,
-            }
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in errors]
         )
-    except Exception as e:
+
+def validate_body(body: bytes, kind: str) -> ValidatedBatch:
+    """Check every row of a batch body, collecting errors instead of raising."""
+    if kind != JSON:
+        try:
+            return validate_features(decode_features(body, kind))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        rows = loads(body)
+    except ValueError as e:
+        error = {"type": "json_invalid", "msg": f"Invalid JSON: {e}"}
+        raise RequestValidationError([{**error, "loc": ("body",), "input": None}])
+    if not isinstance(rows, list):
+        error = {"type": "list_type", "msg": "Input should be a valid list"}
+        raise RequestValidationError([{**error, "loc": ("body",), "input": rows}])
+    return validate_records(rows)
+
+def packed_body(schema: dict) -> dict:
+    """OpenAPI request body for a JSON schema or either packed format."""
+    binary = {"schema": {"type": "string", "format": "binary"}}
+    content = {JSON: {"schema": schema}, BINARY: binary, ARROW: binary}
+    return {"requestBody": {"required": True, "content": content}}
+
+SINGLE_REQUEST = TypeAdapter(PredictionRequest)
+REQUEST_SCHEMA = {"$ref": "#/components/schemas/PredictionRequest"}
+
+def one_row(rows: np.ndarray) -> np.ndarray:
+    if len(rows) != 1:
+        raise ValueError(f"Expected one row, got {len(rows)}")
+    return rows
+
+@app.post("/predict", openapi_extra=packed_body(REQUEST_SCHEMA))
+async def predict_endpoint(
+    request: Request, x_model_version: ModelVersionHeader = None, explain: bool = False
+):
+
+    kind, accept = request_formats(request)
+    body = await request.body()
+    if kind == JSON:
+        data = parse_json(SINGLE_REQUEST, body)
+    else:
+        data = partial(decode_features, body, kind)
+    if explain:
+        # Scored directly; the cache, coalescer and lookup tables hold no terms
+        def encode() -> np.ndarray:
+            if isinstance(data, PredictionRequest):
+                return encode_request(data)[np.newaxis]
+            return one_row(data())
+
+        probs, contributions, intercept = await run_in_threadpool(
+            score_batch, encode, x_model_version, True
+        )
+        return Response(
+            encode_explanation(
+                probs[0], contributions[0], intercept, accept, "churn_probability"
+            ),
+            media_type=accept,
+        )
+    prob = await score_single(data, x_model_version)
+    return Response(
+        encode_probabilities(prob, accept, "churn_probability"), media_type=accept
+    )
+
+@app.post(
+    "/predict/batch",
+    openapi_extra=packed_body({"type": "array", "items": REQUEST_SCHEMA}),
+)
+async def predict_batch_endpoint(
+    request: Request, x_model_version: ModelVersionHeader = None, explain: bool = False
+):
+
+    kind, accept = request_formats(request)
+    body = await request.body()
+    # Bad rows come back as null (NaN when packed) instead of failing the batch
+    batch = await run_in_threadpool(validate_body, body, kind)
+    if explain:
+        probs, contributions, intercept = await run_in_threadpool(
+            score_batch, lambda: batch.features, x_model_version, True
+        )
+        return Response(
+            encode_explanation(
+                batch.expand(probs),
+                batch.expand(contributions),
+                intercept,
+                accept,
+                "churn_probabilities",
+                batch.report(),
+            ),
+            media_type=accept,
+        )
+    probs = await run_in_threadpool(
+        score_batch, lambda: batch.features, x_model_version
+    )
+    return Response(
+        encode_probabilities(
+            batch.expand(probs), accept, "churn_probabilities", batch.report()
+        ),
+        media_type=accept,
+    )
+
+@app.post("/predict/sweep")
+def predict_sweep(data: SweepRequest, x_model_version: ModelVersionHeader = None):
+
+    endpoint_started()
+    axes = {}
+    for dimension in SWEEP_DIMENSIONS:
+        values = getattr(data, dimension)
+        if isinstance(values, SweepRange):
+            values = np.linspace(values.start, values.stop, values.num).tolist()
+        if values is not None:
+            axes[dimension] = values
+    try:
+        scorer = registry_scorer(x_model_version) or get_scorer()
+        start = time.perf_counter()
+        probs = sweep(data.base.model_dump(), axes, scorer)
+        metrics.SCORE.observe(time.perf_counter() - start)
+    except UnknownModelVersion as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    return {"churn_probability": prob}
+    probs = probs.tolist()
+    endpoint_finished()
+    return {"dimensions": list(axes), "axes": axes, "churn_probabilities": probs}
+
+# Responses hold every ranked customer, so k is capped for the API only
+MAX_RANK_K = 100_000
+
+@app.post("/rank")
+def rank_upload(
+    file: UploadFile,
+    k: Annotated[int, Query(ge=1, le=MAX_RANK_K)] = 100,
+    x_model_version: ModelVersionHeader = None,
+):
+
+    # Imported here so pandas stays off the import path of the scoring routes
+    from ranking import rank_csv
+
+    endpoint_started()
+    try:
+        scorer = registry_scorer(x_model_version)
+        # The upload is spooled to disk and streamed through in chunks
+        ranking = rank_csv(file.file, k, scorer=scorer)
+    except UnknownModelVersion as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    endpoint_finished()
+    return {"rows": ranking.rows, "k": k, "customers": ranking.records()}
+
+@app.get("/cache/stats")
+def cache_stats():
+
+    if CACHE is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **CACHE.stats()}
+
+@app.get("/coalescer/stats")
+def coalescer_stats():
+
+    if COALESCER is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **COALESCER.stats()}
+
+@app.get("/models")
+def list_models():
+
+    if REGISTRY is None:
+        return {"enabled": False}
+
+    return {
+        "enabled": True,
+        "default": REGISTRY.default,
+        "versions": {
+            name: model.sha256 for name, model in sorted(REGISTRY.models().items())
+        },
+        "reloads": REGISTRY.reloads,
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,90 @@
+"""
+Serve the API from several worker processes sharing one copy of the model.
+
+The supervisor loads the model once, publishes its folded weights to shared
+memory (``shared_model``) and starts ``--workers`` uvicorn workers, one per
+core unless ``WEB_CONCURRENCY`` says otherwise. Each worker attaches to the
+published weights instead of loading the bundle itself. The supervisor also
+watches ``MODEL_PATH`` and publishes a new segment when the bundle changes.
+Run from the repository root:
+
+    python -m backend.serve --workers 4 --port 8000
+"""
+
+import argparse
+import os
+import signal
+import sys
+import tempfile
+import threading
+
+import uvicorn
+
+import prediction
+from prediction_logging import configure_logging, log_event
+from shared_model import SharedModelPublisher
+
+
+def watch_model(
+    publisher: SharedModelPublisher, interval: float, stop: threading.Event
+) -> None:
+    while not stop.wait(interval):
+        try:
+            if prediction.reload_model():
+                publisher.publish(prediction.get_scorer(), prediction.model_version())
+        except prediction.LOAD_ERRORS as e:
+            log_event("model_reload_failed", error=str(e))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=float(os.environ.get("MODEL_WATCH_INTERVAL", "2")),
+    )
+    args = parser.parse_args()
+
+    configure_logging()
+    with tempfile.TemporaryDirectory(prefix="telco-serve-") as run_dir:
+        publisher = SharedModelPublisher(os.path.join(run_dir, "model.json"))
+        publisher.publish(prediction.get_scorer(), prediction.model_version())
+        # Inherited by the workers, which attach in backend.main
+        os.environ["SHARED_MODEL_POINTER"] = str(publisher.pointer)
+        os.environ["MODEL_WATCH_INTERVAL"] = str(args.watch_interval)
+
+        stop = threading.Event()
+        watcher = threading.Thread(
+            target=watch_model,
+            args=(publisher, args.watch_interval, stop),
+            name="model-publisher",
+            daemon=True,
+        )
+        watcher.start()
+        # uvicorn re-raises SIGTERM once it has shut down; exit through the
+        # finally block so the segment is unlinked
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            uvicorn.run(
+                "backend.main:app",
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                log_level="warning",
+                access_log=False,
+            )
+        finally:
+            stop.set()
+            watcher.join()
+            publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Streaming batch scoring for files in the raw Telco CSV schema.
+
+The input is read in fixed-size chunks, each chunk is encoded and scored in
+one vectorized call, and ``customerID,churn_probability`` rows are appended
+to the output as soon as they are ready. Only a bounded number of chunks is
+ever in memory, however large the file is.
+
+With several workers the parent process only slices the file into blocks of
+raw lines; parsing, encoding, scoring and formatting all happen in the
+workers. This relies on the Telco export having no quoted newlines.
+"""
+
+import io
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+import prediction
+from encoding import TELCO_COLUMNS, encode_telco_columns
+from feature_store import FeatureStore
+from prediction import make_prediction_batch
+
+ID_COLUMN = "customerID"
+OUTPUT_COLUMNS = [ID_COLUMN, "churn_probability"]
+
+# Parsing the string columns as categoricals is faster and lets the encoder
+# look up each distinct value once per chunk
+_DTYPES = {
+    ID_COLUMN: str,
+    "tenure": np.float64,
+    "MonthlyCharges": np.float64,
+    "TechSupport": "category",
+    "Contract": "category",
+    "PaperlessBilling": "category",
+    "InternetService": "category",
+    "PaymentMethod": "category",
+}
+
+
+@dataclass
+class ScoreReport:
+    rows: int
+    chunks: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_chunks(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield the columns needed for scoring, ``chunksize`` rows at a time."""
+    yield from pd.read_csv(
+        path,
+        usecols=[ID_COLUMN, *TELCO_COLUMNS],
+        dtype=_DTYPES,
+        chunksize=chunksize,
+    )
+
+
+def read_blocks(path: str, chunksize: int) -> Iterator[str]:
+    """Yield the header line plus up to ``chunksize`` raw data lines at a time."""
+    with open(path, newline="") as f:
+        header = f.readline()
+        while lines := list(islice(f, chunksize)):
+            yield header + "".join(lines)
+
+
+def parse_block(block: str) -> pd.DataFrame:
+    return pd.read_csv(
+        io.StringIO(block), usecols=[ID_COLUMN, *TELCO_COLUMNS], dtype=_DTYPES
+    )
+
+
+def score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Encode and score one chunk of raw Telco rows."""
+    features = encode_telco_columns(*(chunk[column] for column in TELCO_COLUMNS))
+    return pd.DataFrame(
+        {
+            ID_COLUMN: chunk[ID_COLUMN].to_numpy(),
+            "churn_probability": make_prediction_batch(features),
+        }
+    )
+
+
+def score_to_csv(chunk: pd.DataFrame | str) -> tuple[int, str]:
+    """Score a chunk, or a raw CSV block, into ``customerID,churn_probability`` lines."""
+    # Formatting is as costly as scoring, so it happens in the worker too
+    if isinstance(chunk, str):
+        chunk = parse_block(chunk)
+    scored = score_chunk(chunk)
+    lines = [
+        f"{customer},{prob!r}\n"
+        for customer, prob in zip(
+            scored[ID_COLUMN].tolist(),
+            scored["churn_probability"].tolist(),
+            strict=True,
+        )
+    ]
+    return len(lines), "".join(lines)
+
+
+def _in_order(
+    tasks: Iterator[tuple], score: Callable[..., tuple], workers: int
+) -> Iterator[tuple]:
+    if workers <= 1:
+        for task in tasks:
+            yield score(*task)
+        return
+
+    # Keep at most two tasks per worker in flight so memory stays bounded
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[tuple]] = deque()
+        for task in tasks:
+            pending.append(pool.submit(score, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _score_in_order(
+    path: str, chunksize: int, workers: int
+) -> Iterator[tuple[int, str]]:
+    if workers <= 1:
+        # In-process, pandas' own chunked reader is the fastest parser
+        chunks = read_chunks(path, chunksize)
+    else:
+        # Workers parse raw line blocks themselves
+        chunks = read_blocks(path, chunksize)
+    return _in_order(((chunk,) for chunk in chunks), score_to_csv, workers)
+
+
+def _write_scores(output_path: str, results: Iterator[tuple[int, str]]) -> ScoreReport:
+    # ``results`` is lazy, so the timing covers reading and scoring as well
+    start = time.perf_counter()
+    rows = chunks = 0
+    with open(output_path, "w", newline="") as out:
+        out.write(",".join(OUTPUT_COLUMNS) + "\n")
+        for count, text in results:
+            out.write(text)
+            rows += count
+            chunks += 1
+    return ScoreReport(rows=rows, chunks=chunks, seconds=time.perf_counter() - start)
+
+
+def score_csv(
+    input_path: str,
+    output_path: str,
+    chunksize: int = 100_000,
+    workers: int = 1,
+) -> ScoreReport:
+    """Score a raw Telco CSV into ``customerID,churn_probability`` rows."""
+    return _write_scores(output_path, _score_in_order(input_path, chunksize, workers))
+
+
+def _score_store_range(store: FeatureStore, start: int, stop: int) -> tuple[int, str]:
+    if prediction.ENGINE == "float32":
+        # The store's int8 and float32 columns pack without widening
+        features = store.packed(slice(start, stop))
+    else:
+        features = store.select(rows=slice(start, stop))
+    probs = make_prediction_batch(features)
+    lines = [
+        f"{customer},{prob!r}\n"
+        for customer, prob in zip(
+            store.customer_ids(start, stop), probs.tolist(), strict=True
+        )
+    ]
+    return len(lines), "".join(lines)
+
+
+def score_store(
+    store_path: str,
+    output_path: str,
+    chunksize: int = 100_000,
+    workers: int = 1,
+) -> ScoreReport:
+    """Score a feature store built by ``feature_store.build_store``.
+
+    Nothing is parsed or encoded: each chunk is sliced straight out of the
+    memory-mapped columns, in the workers when there are several.
+    """
+    store = FeatureStore(store_path)
+    tasks = ((store, a, b) for a, b in store.chunks(chunksize))
+    return _write_scores(output_path, _in_order(tasks, _score_store_range, workers))
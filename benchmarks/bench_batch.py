@@ -0,0 +1,47 @@
+"""
+Compare per-row scoring against the vectorized batch path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch --rows 20000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.data import synthetic_features
+from prediction import FEATURE_ORDER, make_prediction, make_prediction_batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--per-row-limit", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rows = synthetic_features(args.rows)
+
+    # Per-row path: only a sample, it is orders of magnitude slower
+    sample = rows[: args.per_row_limit]
+    records = [dict(zip(FEATURE_ORDER, row, strict=True)) for row in sample]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for record in records:
+            make_prediction(**record)
+        per_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    make_prediction_batch(rows)
+    batch = time.perf_counter() - start
+
+    per_row_rate = len(sample) / per_row
+    batch_rate = len(rows) / batch
+    print(f"per-row : {per_row_rate:>14,.0f} rows/s ({len(sample):,} rows)")
+    print(f"batch   : {batch_rate:>14,.0f} rows/s ({len(rows):,} rows)")
+    print(f"speedup : {batch_rate / per_row_rate:>14,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
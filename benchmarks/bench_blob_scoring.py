@@ -0,0 +1,72 @@
+"""
+Throughput of the checkpointed blob scorer on one instance.
+
+A CSV drop (the Telco CSV repeated to ``--rows`` rows) and a JSONL drop of
+as many request lines are scored through ``blob_scoring.score_blob`` with a
+``LocalStore``, the filesystem stand-in for blob storage. Each drop is then
+scored again with half of its parts deleted, as a retry after a failure
+would, and once more when it is complete. Run from the repository root:
+
+    python -m benchmarks.bench_blob_scoring --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.bench_score_csv import write_large_csv
+from benchmarks.data import synthetic_requests
+from blob_scoring import SUCCESS, LocalStore, output_prefix, score_blob
+from encoding import REQUEST_FIELDS
+from wire_formats import dumps
+
+
+def write_jsonl(path: str, rows: int) -> None:
+    columns = {
+        field: values.tolist() for field, values in synthetic_requests(rows).items()
+    }
+    with open(path, "wb") as out:
+        out.writelines(
+            dumps(dict(zip(REQUEST_FIELDS, values, strict=True))) + b"\n"
+            for values in zip(*columns.values(), strict=True)
+        )
+
+
+def lose_half(store: LocalStore, prefix: str) -> None:
+    os.remove(store.root / prefix / SUCCESS)
+    for name in sorted(store.names(prefix))[::2]:
+        os.remove(store.root / name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalStore(tmp)
+        os.makedirs(os.path.join(tmp, "incoming"))
+        write_large_csv(os.path.join(tmp, "incoming", "drop.csv"), args.rows)
+        write_jsonl(os.path.join(tmp, "incoming", "drop.jsonl"), args.rows)
+
+        print(
+            f"{'drop':<8}{'run':<10}{'chunks':>8}{'skipped':>9}{'s':>8}{'rows/s':>12}"
+        )
+        for name in ("incoming/drop.csv", "incoming/drop.jsonl"):
+            size_mb = os.path.getsize(store.root / name) / 1e6
+            prefix = output_prefix(name)
+            for run in ("first", "retry", "complete"):
+                if run == "retry":
+                    lose_half(store, prefix)
+                report = score_blob(store, name, chunksize=args.chunksize)
+                kind = f"{name.rsplit('.', 1)[1]}"
+                print(
+                    f"{kind:<8}{run:<10}{report.chunks:>8}{report.skipped:>9}"
+                    f"{report.seconds:>8.2f}{report.rows_per_second:>12,.0f}"
+                )
+            print(f"{'':<8}({args.rows:,} rows, {size_mb:,.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Requests per second from the frontend client against a local uvicorn.
+
+Four ways of scoring the same ``--customers`` customers:
+
+- ``sequential``: a bare ``requests.post`` per customer, the frontend's old
+  behaviour, with a new TCP connection every time
+- ``pooled``: ``ChurnClient.predict`` one by one over keep-alive connections
+- ``concurrent``: ``AsyncChurnClient.predict_all``, ``--concurrency`` at once
+- ``bulk``: ``ChurnClient.predict_many``, ``--batch-size`` customers per
+  ``/predict/batch`` request
+
+Run from the repository root:
+
+    python -m benchmarks.bench_client --customers 2000
+"""
+
+import argparse
+import asyncio
+import time
+
+import requests
+
+from benchmarks.load_predict import PAYLOAD, free_port, start_server
+from frontend.client import AsyncChurnClient, ChurnClient
+
+
+def sequential(url: str, customers: list[dict]) -> None:
+    for customer in customers:
+        requests.post(url + "/predict", json=customer, timeout=10).raise_for_status()
+
+
+def pooled(url: str, customers: list[dict]) -> None:
+    with ChurnClient(url) as client:
+        for customer in customers:
+            client.predict(customer)
+
+
+def concurrent(url: str, customers: list[dict], concurrency: int) -> None:
+    async def run():
+        async with AsyncChurnClient(url, max_concurrency=concurrency) as client:
+            await client.predict_all(customers)
+
+    asyncio.run(run())
+
+
+def bulk(url: str, customers: list[dict], batch_size: int) -> None:
+    with ChurnClient(url, batch_size=batch_size) as client:
+        client.predict_many(customers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    customers = [
+        {**PAYLOAD, "tenure": i % 73, "monthly": 20 + i % 100}
+        for i in range(args.customers)
+    ]
+    modes = {
+        "sequential": lambda url: sequential(url, customers),
+        "pooled": lambda url: pooled(url, customers),
+        "concurrent": lambda url: concurrent(url, customers, args.concurrency),
+        "bulk": lambda url: bulk(url, customers, args.batch_size),
+    }
+
+    port = free_port()
+    server = start_server(port, {})
+    url = f"http://127.0.0.1:{port}"
+    try:
+        pooled(url, customers[:20])  # warm up the model
+        for mode, run in modes.items():
+            start = time.perf_counter()
+            run(url)
+            elapsed = time.perf_counter() - start
+            print(f"{mode:<11} {args.customers / elapsed:>10,.0f} customers/s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
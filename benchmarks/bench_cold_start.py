@@ -0,0 +1,73 @@
+"""
+Cold-start cost of importing prediction and serving the first request.
+
+Each mode runs in a fresh interpreter under ``python -X importtime`` and
+reports the wall time to the first prediction, the cumulative import time
+and whether sklearn ended up in the process. Run from the repository root:
+
+    python -m benchmarks.bench_cold_start --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+FIRST_REQUEST = """
+import sys
+import prediction
+prediction.make_prediction_batch([[10, 70.5, 1, 0, 1, 1, 1, 0, 0, 1, 0]])
+print("sklearn" in sys.modules)
+"""
+
+MODES = {
+    "folded .npz": {},
+    "joblib bundle": {"FOLDED_MODEL_PATH": os.devnull + ".missing"},
+    "sklearn engine": {"PREDICTION_ENGINE": "sklearn"},
+}
+
+
+def import_time_us(stderr: str) -> int:
+    """Sum the cumulative time of top-level imports from -X importtime."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total
+
+
+def run_once(env: dict[str, str]) -> tuple[float, int, bool]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", FIRST_REQUEST],
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - start
+    return wall, import_time_us(result.stderr), result.stdout.strip() == "True"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for mode, env in MODES.items():
+        runs = [run_once(env) for _ in range(args.runs)]
+        wall = statistics.median(run[0] for run in runs) * 1000
+        imports = statistics.median(run[1] for run in runs) / 1000
+        print(
+            f"{mode:<15} first request {wall:7.1f} ms"
+            f"   imports {imports:7.1f} ms   sklearn loaded: {runs[0][2]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
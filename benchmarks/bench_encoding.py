@@ -0,0 +1,100 @@
+"""
+Encoding throughput: the old convert_* + kwargs dict path against the shared
+lookup-table encoder, one row at a time and as a column block.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_encoding --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.data import synthetic_requests
+from encoding import N_FEATURES, encode_columns, encode_row
+from prediction import FEATURE_ORDER
+
+
+def legacy_convert_contract(months):
+    if months <= 1:
+        return 0, 0
+    elif months <= 12:
+        return 1, 0
+    else:
+        return 0, 1
+
+
+def legacy_convert_internet(service):
+    s = service.lower().strip()
+    return (
+        1 if s == "fiber optic" else 0,
+        1 if s == "no" else 0,
+    )
+
+
+def legacy_convert_payment(method):
+    m = method.lower().strip()
+    return (
+        1 if m == "credit card (automatic)" else 0,
+        1 if m == "electronic check" else 0,
+        1 if m == "mailed check" else 0,
+    )
+
+
+def legacy_encode(columns: dict[str, list]) -> list[np.ndarray]:
+    """The per-request code that used to live in backend/main.py, up to the
+    float64 row make_prediction builds from its kwargs."""
+    rows = []
+    for tenure, monthly, tech, paper, months, internet, payment in zip(
+        *columns.values(), strict=True
+    ):
+        c1, c2 = legacy_convert_contract(months)
+        i_fiber, i_no = legacy_convert_internet(internet)
+        p_card, p_echeck, p_mail = legacy_convert_payment(payment)
+        kwargs = {
+            "tenure": tenure,
+            "MonthlyCharges": monthly,
+            "TechSupport_yes": tech,
+            "Contract_one year": c1,
+            "Contract_two year": c2,
+            "PaperlessBilling_yes": paper,
+            "InternetService_fiber optic": i_fiber,
+            "InternetService_no": i_no,
+            "PaymentMethod_credit card (automatic)": p_card,
+            "PaymentMethod_electronic check": p_echeck,
+            "PaymentMethod_mailed check": p_mail,
+        }
+        rows.append(np.array([kwargs[feature] for feature in FEATURE_ORDER]))
+    return rows
+
+
+def per_row_encode(columns: dict[str, list]) -> None:
+    out = np.empty(N_FEATURES)
+    for values in zip(*columns.values(), strict=True):
+        encode_row(*values, out=out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    arrays = synthetic_requests(args.rows)
+    # Per-row callers see plain Python values, as pydantic hands them over
+    columns = {name: values.tolist() for name, values in arrays.items()}
+
+    for name, encode, data in (
+        ("convert_* + dict", legacy_encode, columns),
+        ("encode_row", per_row_encode, columns),
+        ("encode_columns", lambda data: encode_columns(**data), arrays),
+    ):
+        start = time.perf_counter()
+        encode(data)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<17} {elapsed:7.3f} s   {args.rows / elapsed:>13,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
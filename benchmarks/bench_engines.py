@@ -0,0 +1,48 @@
+"""
+Per-request latency of make_prediction for each scoring engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_engines --requests 5000
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+import prediction
+from benchmarks.data import synthetic_features
+
+
+def time_requests(records: list[dict[str, float]]) -> list[float]:
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for record in records:
+            start = time.perf_counter_ns()
+            prediction.make_prediction(**record)
+            timings.append((time.perf_counter_ns() - start) / 1_000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+
+    rows = synthetic_features(args.requests)
+    records = [dict(zip(prediction.FEATURE_ORDER, row, strict=True)) for row in rows]
+
+    for engine in prediction.ENGINES:
+        prediction.ENGINE = engine
+        timings = sorted(time_requests(records))
+        p99 = timings[int(len(timings) * 0.99)]
+        print(
+            f"{engine:<8} median {statistics.median(timings):8.1f} us"
+            f"   p99 {p99:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Overhead of explaining predictions against plain scoring.
+
+``--rows`` synthetic customers are scored with ``make_prediction_batch``,
+then scored and explained the way ``explain=true`` does it: one elementwise
+product on the folded model for every feature's logit contribution. The
+raw float64 response bodies are timed too, since an explained row carries
+12 values instead of 1. Run from the repository root:
+
+    python -m benchmarks.bench_explain --rows 1000000
+"""
+
+import argparse
+
+from backend.main import explain_rows
+from benchmarks.bench_float32 import best_seconds
+from benchmarks.data import synthetic_features
+from prediction import get_scorer, make_prediction_batch
+from wire_formats import BINARY, encode_explanation, encode_probabilities
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scorer = get_scorer()
+    rows = synthetic_features(args.rows)
+    probs = make_prediction_batch(rows, scorer)
+    explained = explain_rows(rows, scorer)
+
+    cases = {
+        "score": lambda: make_prediction_batch(rows, scorer),
+        "contributions only": lambda: scorer.contributions(rows),
+        "score + explain": lambda: explain_rows(rows, scorer),
+        "score body": lambda: encode_probabilities(probs, BINARY, ""),
+        "explained body": lambda: encode_explanation(*explained, BINARY, ""),
+    }
+    baseline = None
+    for name, func in cases.items():
+        seconds = best_seconds(func, args.repeat)
+        if name in ("score", "score body"):
+            baseline = seconds
+        print(
+            f"{name:<20}{seconds * 1000:9.1f} ms{args.rows / seconds / 1e6:9.1f} M rows/s"
+            f"{seconds / baseline:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Load time and peak RSS: the raw CSV path against the feature store.
+
+The Telco CSV is repeated until it reaches ``--rows`` rows and converted into
+a feature store once. Each task then runs in a fresh process, so its peak
+RSS is its own:
+
+- ``csv-train`` parses and encodes the CSV with ``training.preprocess``
+- ``store-train`` opens the store and selects the Model_2 feature columns
+- ``csv-score`` and ``store-score`` run the batch scorer on either input
+
+Run from the repository root:
+
+    python -m benchmarks.bench_feature_store --rows 2000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_score_csv import write_large_csv
+
+
+def run_task(task: str, csv_path: str, store_path: str) -> dict[str, float]:
+    import training
+    from batch_scoring import score_csv, score_store
+
+    start = time.perf_counter()
+    if task == "csv-train":
+        matrix = training.preprocess(csv_path)
+        matrix.select(training.FEATURE_SETS["Model_2_Contract"])
+    elif task == "store-train":
+        matrix = training.StoreMatrix.open(store_path)
+        matrix.select(training.FEATURE_SETS["Model_2_Contract"])
+    elif task == "csv-score":
+        score_csv(csv_path, os.devnull)
+    elif task == "store-score":
+        score_store(store_path, os.devnull)
+    return {"seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb()}
+
+
+def peak_rss_mb() -> float:
+    # VmHWM starts afresh at exec, unlike ru_maxrss which inherits the
+    # parent's high-water mark on Linux
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(task: str, csv_path: str, store_path: str) -> dict[str, float]:
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_feature_store",
+            "--task",
+            task,
+            "--csv",
+            csv_path,
+            "--store",
+            store_path,
+        ]
+    )
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--task")
+    parser.add_argument("--csv")
+    parser.add_argument("--store")
+    args = parser.parse_args()
+
+    if args.task:
+        print(json.dumps(run_task(args.task, args.csv, args.store)))
+        return
+
+    from feature_store import build_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "customers.csv")
+        store_path = os.path.join(tmp, "customers.store")
+        write_large_csv(csv_path, args.rows)
+        start = time.perf_counter()
+        build_store(csv_path, store_path)
+        build = time.perf_counter() - start
+
+        def size_mb(path: str) -> float:
+            if os.path.isfile(path):
+                return os.path.getsize(path) / 1e6
+            return sum(entry.stat().st_size for entry in os.scandir(path)) / 1e6
+
+        print(
+            f"{args.rows:,} rows: CSV {size_mb(csv_path):,.0f} MB, "
+            f"store {size_mb(store_path):,.0f} MB, built in {build:.2f} s"
+        )
+        baseline = measure("none", csv_path, store_path)["peak_rss_mb"]
+        print(f"interpreter baseline peak RSS {baseline:,.0f} MB")
+        for task in ("csv-train", "store-train", "csv-score", "store-score"):
+            result = measure(task, csv_path, store_path)
+            print(
+                f"{task:<12} {result['seconds']:7.2f} s"
+                f"   peak RSS {result['peak_rss_mb']:7,.0f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
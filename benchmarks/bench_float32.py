@@ -0,0 +1,59 @@
+"""
+Throughput and bytes per row of the float64, float32 and packed scorers.
+
+Each representation is built once from the same synthetic customers, then
+scored repeatedly; only the scoring is timed. The maximum absolute
+probability error against float64 is reported alongside. Run from the
+repository root:
+
+    python -m benchmarks.bench_float32 --rows 5000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import prediction
+from benchmarks.data import synthetic_features
+from prediction import PackedRows
+
+
+def best_seconds(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scorer = prediction.get_scorer()
+    float64 = synthetic_features(args.rows)
+    float32 = float64.astype(np.float32)
+    packed = PackedRows.pack(float64)
+    expected = scorer.predict_proba(float64)
+
+    variants = {
+        "float64": (float64.nbytes, lambda: scorer.predict_proba(float64)),
+        "float32": (float32.nbytes, lambda: scorer.float32.predict_proba(float32)),
+        "packed": (packed.nbytes, lambda: scorer.float32.predict_packed(packed)),
+    }
+    for name, (nbytes, score) in variants.items():
+        seconds = best_seconds(score, args.repeat)
+        error = np.abs(score() - expected).max()
+        print(
+            f"{name:<8} {nbytes / args.rows:5.0f} bytes/row"
+            f"   {args.rows / seconds / 1e6:7.1f} M rows/s"
+            f"   max abs error {error:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Incremental updates against full retrains on simulated daily batches.
+
+The notebook's training rows are shuffled; the first ``--history`` share
+fits the starting bundle and the rest arrive as ``--days`` labeled batches.
+After each batch the incremental bundle is compared on the notebook's test
+rows with a full retrain on every training row seen so far. Run from the
+repository root:
+
+    python -m benchmarks.bench_incremental --days 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import incremental
+import training
+from prediction import FEATURE_ORDER
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--history", type=float, default=0.5)
+    args = parser.parse_args()
+
+    matrix = training.preprocess(training.DATA_PATH)
+    train, test = training.split_indices(matrix.y)
+    train = np.random.default_rng(training.RANDOM_STATE).permutation(train)
+    cut = int(len(train) * args.history)
+    history, days = train[:cut], np.array_split(train[cut:], args.days)
+    held_out = training.FeatureMatrix(matrix.X[test], matrix.y[test])
+
+    def rows(indices: np.ndarray) -> training.FeatureMatrix:
+        return training.FeatureMatrix(matrix.X[indices], matrix.y[indices])
+
+    bundle = incremental.full_retrain(rows(history), FEATURE_ORDER)
+    bundle["batches"] = []
+    print(
+        f"{'day':>4}{'rows':>7}{'update ms':>11}{'retrain ms':>12}"
+        f"{'accuracy':>10}{'drift':>9}{'roc_auc':>9}{'drift':>9}"
+    )
+    seen = history
+    for day, batch in enumerate(days, 1):
+        start = time.perf_counter()
+        incremental.update_bundle(bundle, rows(batch))
+        update_ms = (time.perf_counter() - start) * 1000
+
+        seen = np.concatenate([seen, batch])
+        start = time.perf_counter()
+        full = incremental.full_retrain(rows(seen), FEATURE_ORDER)
+        retrain_ms = (time.perf_counter() - start) * 1000
+
+        scores = incremental.scores(bundle, held_out)
+        drift = incremental.drift(bundle, full, held_out)
+        print(
+            f"{day:>4}{len(batch):>7}{update_ms:>11.2f}{retrain_ms:>12.2f}"
+            f"{scores['accuracy']:>10.4f}{drift['accuracy']:>+9.4f}"
+            f"{scores['roc_auc']:>9.4f}{drift['roc_auc']:>+9.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
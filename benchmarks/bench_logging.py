@@ -0,0 +1,52 @@
+"""
+Per-prediction cost of logging: the old print() against queue-based,
+sampled structured logging. Output goes to /dev/null in every case.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging --requests 20000
+"""
+
+import argparse
+import contextlib
+import os
+import time
+
+import prediction
+import prediction_logging
+from benchmarks.data import synthetic_features
+
+
+def per_call_us(rows, with_print: bool = False) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        prob = prediction.make_prediction_row(row)
+        if with_print:
+            print(f"Churn probability: {prob:.4f}")
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rows = list(synthetic_features(args.requests))
+    prediction.get_scorer()
+
+    with open(os.devnull, "w") as devnull:
+        prediction_logging.configure_logging(sample_rate=0.0, stream=devnull)
+        baseline = per_call_us(rows)
+        with contextlib.redirect_stdout(devnull):
+            printed = per_call_us(rows, with_print=True)
+        print(f"no logging        {baseline:6.2f} us/prediction")
+        print(f"print()           {printed:6.2f} us/prediction")
+
+        for rate in (1.0, 0.1, 0.01):
+            prediction_logging.configure_logging(sample_rate=rate, stream=devnull)
+            print(f"sampled {rate:<9} {per_call_us(rows):6.2f} us/prediction")
+        prediction_logging.shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
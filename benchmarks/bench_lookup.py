@@ -0,0 +1,70 @@
+"""
+Per-request latency of the lookup tables against encode + folded scoring.
+
+Both paths score the same random raw requests one at a time, as ``/predict``
+does. The table build time and size are reported too. Run from the
+repository root:
+
+    python -m benchmarks.bench_lookup --requests 100000
+"""
+
+import argparse
+import random
+import time
+
+import prediction
+from encoding import encode_row
+from lookup_table import LookupTable
+
+CONTRACTS = [1, 12, 24]
+INTERNET = ["DSL", "Fiber optic", "No"]
+PAYMENTS = [
+    "Bank transfer (automatic)",
+    "Credit card (automatic)",
+    "Electronic check",
+    "Mailed check",
+]
+
+
+def random_requests(n: int, seed: int = 0) -> list[tuple]:
+    rng = random.Random(seed)
+    return [
+        (
+            rng.randint(0, 72),
+            rng.randint(1825, 11875) / 100,
+            rng.randint(0, 1),
+            rng.randint(0, 1),
+            rng.choice(CONTRACTS),
+            rng.choice(INTERNET),
+            rng.choice(PAYMENTS),
+        )
+        for _ in range(n)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    scorer = prediction.get_scorer()
+    start = time.perf_counter()
+    table = LookupTable.build(scorer)
+    build = time.perf_counter() - start
+    print(f"build    {build * 1e3:8.2f} ms   {table.nbytes / 1024:.0f} KiB")
+
+    requests = random_requests(args.requests)
+    paths = {
+        "encode": lambda r: prediction.make_prediction_row(encode_row(*r)),
+        "lookup": lambda r: table.predict(*r),
+    }
+    for name, score in paths.items():
+        start = time.perf_counter()
+        for request in requests:
+            score(request)
+        seconds = time.perf_counter() - start
+        print(f"{name:<8} {seconds / args.requests * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Overhead of the /metrics instrumentation.
+
+Times a single histogram observation, a counter increment, and the full set
+of clock reads and updates one /predict request makes, against an
+uninstrumented loop. Run from the repository root:
+
+    python -m benchmarks.bench_metrics --requests 100000
+"""
+
+import argparse
+import time
+
+import metrics
+
+
+def per_call_us(func, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def request_instrumentation() -> None:
+    # Mirrors TimedRoute plus the stage timers of one /predict call
+    latency = metrics.REQUEST_SECONDS.labels("/predict")
+    start = time.perf_counter()
+    endpoint = time.perf_counter()
+    metrics.VALIDATION.observe(endpoint - start)
+    encode = time.perf_counter()
+    metrics.ENCODE.observe(time.perf_counter() - encode)
+    score = time.perf_counter()
+    metrics.SCORE.observe(time.perf_counter() - score)
+    done = time.perf_counter()
+    end = time.perf_counter()
+    metrics.SERIALIZATION.observe(end - done)
+    latency.observe(end - start)
+    metrics.REQUESTS.labels("/predict", "200").inc()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.requests
+
+    baseline = per_call_us(lambda: None, n)
+    observe = per_call_us(lambda: metrics.SCORE.observe(2e-5), n) - baseline
+    inc = per_call_us(metrics.REQUESTS.labels("/predict", "200").inc, n) - baseline
+    request = per_call_us(request_instrumentation, n) - baseline
+
+    print(f"histogram observe   {observe:6.3f} us")
+    print(f"counter inc         {inc:6.3f} us")
+    print(f"per /predict        {request:6.3f} us")
+
+    start = time.perf_counter()
+    text = metrics.render()
+    print(
+        f"render              {(time.perf_counter() - start) * 1e3:6.3f} ms"
+        f" ({len(text):,} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Top-K ranking against scoring a whole population and sorting it in pandas.
+
+The Telco CSV is repeated until it reaches ``--rows`` rows. The baseline
+reads it whole, scores every row in one batch and sorts with pandas; the
+ranking streams it through ``ranking.rank_csv``. Both return the same
+probabilities. Peak memory is traced with ``tracemalloc``, which sees
+NumPy's and pandas' buffers, in the parent process only. Run from the
+repository root:
+
+    python -m benchmarks.bench_ranking --rows 2000000 --k 50000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import _DTYPES, ID_COLUMN
+from benchmarks.bench_score_csv import write_large_csv
+from encoding import TELCO_COLUMNS, encode_telco_columns
+from prediction import make_prediction_batch
+from ranking import rank_csv
+
+
+def sort_everything(path: str, k: int) -> np.ndarray:
+    df = pd.read_csv(path, usecols=[ID_COLUMN, *TELCO_COLUMNS], dtype=_DTYPES)
+    scored = pd.DataFrame(
+        {
+            ID_COLUMN: df[ID_COLUMN],
+            "churn_probability": make_prediction_batch(
+                encode_telco_columns(*(df[column] for column in TELCO_COLUMNS))
+            ),
+        }
+    )
+    top = scored.sort_values("churn_probability", ascending=False).head(k)
+    return top["churn_probability"].to_numpy()
+
+
+def traced(func: Callable[[], object]) -> tuple[object, float, float]:
+    """Result, seconds and peak traced MB of ``func``.
+
+    Tracing slows allocation down, so the time comes from a second, untraced
+    call.
+    """
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--k", type=int, default=50_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "customers.csv")
+        write_large_csv(source, args.rows)
+        size_mb = os.path.getsize(source) / 1e6
+        print(f"input: {args.rows:,} rows, {size_mb:,.0f} MB, k={args.k:,}")
+
+        expected, seconds, peak = traced(lambda: sort_everything(source, args.k))
+        print(f"{'score all + sort':<22}{seconds:7.2f} s{peak:9.0f} MB peak")
+        for workers in args.workers:
+            ranking, seconds, peak = traced(
+                lambda workers=workers: rank_csv(
+                    source, args.k, chunksize=args.chunksize, workers=workers
+                )
+            )
+            assert np.allclose(ranking.probabilities, expected, atol=1e-12)
+            print(
+                f"{f'rank_csv workers={workers}':<22}{seconds:7.2f} s{peak:9.0f} MB peak"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Throughput of the streaming CSV scorer for different worker counts.
+
+The Telco CSV is repeated until it reaches ``--rows`` rows, then scored with
+``batch_scoring.score_csv``. Run from the repository root:
+
+    python -m benchmarks.bench_score_csv --rows 2000000 --workers 1 2 4
+"""
+
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+
+from batch_scoring import score_csv
+
+DATA_PATH = "input/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def write_large_csv(path: str, rows: int) -> None:
+    base = pd.read_csv(DATA_PATH)
+    with open(path, "w", newline="") as out:
+        base.head(0).to_csv(out, index=False)
+        written = 0
+        while written < rows:
+            block = base.head(rows - written)
+            block.to_csv(out, header=False, index=False)
+            written += len(block)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "customers.csv")
+        write_large_csv(source, args.rows)
+        size_mb = os.path.getsize(source) / 1e6
+        print(f"input: {args.rows:,} rows, {size_mb:,.0f} MB")
+
+        for workers in args.workers:
+            report = score_csv(
+                source,
+                os.path.join(tmp, "scores.csv"),
+                chunksize=args.chunksize,
+                workers=workers,
+            )
+            print(
+                f"workers={workers:<3} {report.seconds:7.2f} s"
+                f"   {report.rows_per_second:>12,.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Hyperparameter search against a naive per-config cross-validation loop.
+
+The baseline does what a hand-written grid search over the notebook would:
+for every config it preprocesses the CSV again and runs sklearn's
+``cross_validate`` on a scaler + model pipeline. ``model_search.search``
+encodes once, shares the folds, scales each fold once and stops dominated
+configs early; it is timed at each ``--jobs`` count with and without early
+stopping. Speed-ups over one job are bounded by the cores reported. Run from
+the repository root:
+
+    python -m benchmarks.bench_search --jobs 1 2 4
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+import model_search
+import training
+
+
+def naive_search(configs: list[model_search.Config], n_folds: int) -> dict:
+    from sklearn.model_selection import StratifiedKFold, cross_validate
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    folds = StratifiedKFold(n_folds, shuffle=True, random_state=training.RANDOM_STATE)
+    means = {}
+    for config in configs:
+        matrix = training.preprocess(training.DATA_PATH)
+        scores = cross_validate(
+            make_pipeline(StandardScaler(), model_search._model(config)),
+            matrix.select(training.FEATURE_SETS[config.features]),
+            matrix.y,
+            cv=folds,
+            scoring="roc_auc",
+        )
+        means[config] = float(np.mean(scores["test_score"]))
+    return means
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folds", type=int, default=model_search.N_FOLDS)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    configs = model_search.grid()
+    print(f"{len(configs)} configs x {args.folds} folds, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    expected = naive_search(configs, args.folds)
+    baseline = time.perf_counter() - start
+    print(f"{'preprocess + cross_validate':<32}{baseline:7.2f} s")
+
+    matrix = training.preprocess(training.DATA_PATH)
+    for margin in (None, model_search.MARGIN):
+        single = None
+        for jobs in args.jobs:
+            result = model_search.search(
+                matrix, configs, n_folds=args.folds, n_jobs=jobs, margin=margin
+            )
+            best = result.best
+            assert abs(best.mean("roc_auc") - expected[best.config]) < 1e-9
+            single = single or result.seconds
+            label = f"search jobs={jobs}" + (" early" if margin else "")
+            print(
+                f"{label:<32}{result.seconds:7.2f} s  {result.fits:4d} fits"
+                f"  x{baseline / result.seconds:4.1f} vs baseline"
+                f"  x{single / result.seconds:4.1f} vs 1 job"
+            )
+    print(f"best: {best.config.name} roc_auc {best.mean('roc_auc'):.4f}")
+
+
+if __name__ == "__main__":
+    main()
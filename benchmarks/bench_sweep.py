@@ -0,0 +1,119 @@
+"""
+What-if sweeps of 1k to 1M cells: broadcast sweep against scoring per cell.
+
+Every grid varies all five sweep fields: tenure and MonthlyCharges over
+``k`` values each, times 3 contracts, 3 internet services and 4 payment
+methods. Three ways of scoring it are timed:
+
+- ``per-call``: ``encode_row`` and ``make_prediction_row`` for every cell,
+  what a client looping over ``/predict`` costs the server; above
+  ``--max-per-call`` cells it is extrapolated from that many
+- ``matrix``: ``encode_columns`` into an (n, 11) matrix, then one
+  ``make_prediction_batch``
+- ``sweep``: ``sweep.sweep``, broadcast-adding per-field logit terms
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sweep
+"""
+
+import argparse
+import time
+from itertools import islice, product
+
+import numpy as np
+
+import prediction
+from encoding import encode_columns, encode_row
+from sweep import sweep
+
+BASE = {
+    "tenure": 10,
+    "monthly": 70.5,
+    "techsupport": 1,
+    "paperless": 1,
+    "contract_months": 24,
+    "internet_service": "Fiber optic",
+    "payment_method": "Electronic check",
+}
+CATEGORIES = {
+    "contract_months": [1, 12, 24],
+    "internet_service": ["DSL", "Fiber optic", "No"],
+    "payment_method": [
+        "Bank transfer (automatic)",
+        "Credit card (automatic)",
+        "Electronic check",
+        "Mailed check",
+    ],
+}
+
+
+def grid_axes(cells: int) -> dict[str, list]:
+    k = max(1, int((cells / 36) ** 0.5))
+    return {
+        "tenure": np.linspace(0, 72, k).tolist(),
+        "monthly": np.linspace(18.25, 118.75, k).tolist(),
+        **CATEGORIES,
+    }
+
+
+def per_call(axes: dict[str, list], limit: int) -> tuple[float, int]:
+    fields = list(axes)
+    cells = list(islice(product(*axes.values()), limit))
+    start = time.perf_counter()
+    for cell in cells:
+        row = encode_row(**{**BASE, **dict(zip(fields, cell))})
+        prediction.make_prediction_row(row)
+    return time.perf_counter() - start, len(cells)
+
+
+def matrix(axes: dict[str, list]) -> None:
+    columns = list(zip(*product(*axes.values())))
+    n = len(columns[0])
+    features = encode_columns(
+        columns[0],
+        columns[1],
+        np.full(n, BASE["techsupport"]),
+        np.full(n, BASE["paperless"]),
+        columns[2],
+        columns[3],
+        columns[4],
+    )
+    prediction.make_prediction_batch(features)
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--cells", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--max-per-call", type=int, default=20_000)
+    args = parser.parse_args()
+
+    scorer = prediction.get_scorer()
+    print(
+        f"{'cells':>10}{'per-call s':>13}{'matrix s':>11}{'sweep s':>11}{'speedup':>10}"
+    )
+    for target in args.cells:
+        axes = grid_axes(target)
+        cells = int(np.prod([len(values) for values in axes.values()]))
+        seconds, scored = per_call(axes, args.max_per_call)
+        per_call_seconds = seconds * cells / scored
+        matrix_seconds = timed(matrix, axes)
+        sweep_seconds = min(timed(sweep, BASE, axes, scorer) for _ in range(3))
+        estimated = "*" if scored < cells else " "
+        print(
+            f"{cells:>10,}{per_call_seconds:>12.3f}{estimated}{matrix_seconds:>11.4f}"
+            f"{sweep_seconds:>11.4f}{per_call_seconds / sweep_seconds:>9,.0f}x"
+        )
+    print("* extrapolated")
+
+
+if __name__ == "__main__":
+    main()
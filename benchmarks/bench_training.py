@@ -0,0 +1,106 @@
+"""
+Training time: the notebook's sequential loop against training.py.
+
+The notebook loop re-preprocesses the CSV for each of the five feature sets,
+and once more for its confusion matrix. training.py encodes it once (or
+reads the cached matrix) and fits the candidates with joblib. Both produce
+the same scores. Run from the repository root:
+
+    python -m benchmarks.bench_training --jobs -1
+"""
+
+import argparse
+import time
+
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+import training
+
+
+def notebook_preprocess(df, feature_list):
+    # Verbatim from notebooks/telco_marimo.py
+    df_local = df.copy()
+    if "customerID" in df_local:
+        df_local = df_local.drop(columns=["customerID"])
+    df_local["TotalCharges"] = pd.to_numeric(df_local["TotalCharges"], errors="coerce")
+    df_local = df_local.dropna()
+    for col in df_local.select_dtypes(include="object"):
+        df_local[col] = df_local[col].str.lower().str.strip()
+    X_full = pd.get_dummies(
+        df_local.drop(columns=["Churn"]), drop_first=True, dtype=int
+    )
+    X_sel = X_full[feature_list]
+    y = df_local["Churn"].map({"yes": 1, "no": 0}).values
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X_sel)
+    return X_sel, X_scaled, y, scaler
+
+
+def notebook_loop(path: str) -> dict[str, float]:
+    df_raw = pd.read_csv(path)
+    scores = {}
+    for name, features in training.FEATURE_SETS.items():
+        _, X_scaled, y, _ = notebook_preprocess(df_raw, features)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X_scaled,
+            y,
+            test_size=training.TEST_SIZE,
+            stratify=y,
+            random_state=training.RANDOM_STATE,
+        )
+        model = LogisticRegression(
+            solver=training.SOLVER,
+            max_iter=training.MAX_ITER,
+            random_state=training.RANDOM_STATE,
+        )
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
+        y_proba = model.predict_proba(X_test)[:, 1]
+        scores[name] = {
+            "accuracy": accuracy_score(y_test, y_pred),
+            "f1": f1_score(y_test, y_pred),
+            "roc_auc": roc_auc_score(y_test, y_proba),
+        }
+    # The confusion-matrix cell preprocesses the final feature set again
+    notebook_preprocess(df_raw, training.FEATURE_SETS["Model_5_FinalModel"])
+    return scores
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data", default=training.DATA_PATH)
+    parser.add_argument("--jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    expected, notebook = timed(notebook_loop, args.data)
+
+    matrix, encode = timed(training.load_features, args.data, cache=False)
+    training.load_features(args.data)  # writes the cache
+    _, cached = timed(training.load_features, args.data)
+    serial, serial_fit = timed(training.train_candidates, matrix, n_jobs=1)
+    parallel, parallel_fit = timed(training.train_candidates, matrix, n_jobs=args.jobs)
+
+    for candidate in (*serial, *parallel):
+        for metric, value in expected[candidate.name].items():
+            assert abs(candidate.scores[metric] - value) < 1e-12, candidate.name
+
+    print(f"notebook loop            {notebook * 1e3:8.1f} ms")
+    print(f"encode once              {encode * 1e3:8.1f} ms")
+    print(f"load cached matrix       {cached * 1e3:8.1f} ms")
+    print(f"fit 5 candidates, 1 job  {serial_fit * 1e3:8.1f} ms")
+    print(f"fit 5 candidates, {args.jobs} jobs {parallel_fit * 1e3:8.1f} ms")
+    print(f"cached + 1 job           {(cached + serial_fit) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Per-row pydantic validation against column-wise validation of a batch.
+
+``--rows`` raw request dicts are generated with ``--error-rate`` of them
+broken in one field (out-of-range tenure, negative charges, a typo in a
+category, a string where a number belongs, ...). The per-row path validates
+each dict with pydantic, checks its ranges and categories in Python and
+encodes it with ``encode_row``, catching the error of each bad row; the
+column-wise path runs ``validate_records`` over the whole list. Both keep
+the good rows and report the bad ones; scoring is left out. Run from the repository root:
+
+    python -m benchmarks.bench_validation --rows 1000000 --error-rate 0.01
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pydantic import ValidationError
+
+from backend.main import SINGLE_REQUEST
+from benchmarks.data import synthetic_requests
+from encoding import INTERNET_CODES, PAYMENT_CODES, REQUEST_FIELDS, encode_row
+from validation import MAX_TENURE, validate_records
+
+BAD_VALUES = {
+    "tenure": [-1, 96, "ten", None],
+    "monthly": [-20.0, "n/a", None],
+    "techsupport": [2, -1],
+    "paperless": [3, "maybe"],
+    "contract_months": [1.5, "monthly", [12]],
+    "internet_service": ["Fibre", "cable", ""],
+    "payment_method": ["Cash", "Bank transfer", None],
+}
+
+
+def raw_records(rows: int, error_rate: float, seed: int = 0) -> list[dict]:
+    """Request dicts as parsed from JSON, ``error_rate`` of them invalid."""
+    columns = {
+        field: values.tolist()
+        for field, values in synthetic_requests(rows, seed).items()
+    }
+    records = [dict(zip(REQUEST_FIELDS, values)) for values in zip(*columns.values())]
+    rng = np.random.default_rng(seed + 1)
+    fields = list(BAD_VALUES)
+    for i in rng.choice(rows, int(rows * error_rate), replace=False).tolist():
+        field = fields[rng.integers(len(fields))]
+        records[i][field] = BAD_VALUES[field][rng.integers(len(BAD_VALUES[field]))]
+    return records
+
+
+def validate_per_row(records: list[dict]) -> tuple[list[np.ndarray], list[int]]:
+    good, bad = [], []
+    for i, record in enumerate(records):
+        try:
+            data = SINGLE_REQUEST.validate_python(record)
+        except ValidationError:
+            bad.append(i)
+            continue
+        if (
+            0 <= data.tenure <= MAX_TENURE
+            and data.monthly >= 0
+            and data.techsupport in (0, 1)
+            and data.paperless in (0, 1)
+            and data.internet_service.lower().strip() in INTERNET_CODES
+            and data.payment_method.lower().strip() in PAYMENT_CODES
+        ):
+            good.append(encode_row(**data.model_dump()))
+        else:
+            bad.append(i)
+    return good, bad
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--per-row-sample",
+        type=int,
+        default=100_000,
+        help="rows timed on the per-row path, which is slow",
+    )
+    args = parser.parse_args()
+
+    records = raw_records(args.rows, args.error_rate)
+
+    sample = records[: args.per_row_sample]
+    start = time.perf_counter()
+    good, bad = validate_per_row(sample)
+    per_row = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    batch = validate_records(records)
+    columnwise = (time.perf_counter() - start) / len(records)
+
+    # Both paths must agree on which rows are bad
+    head = validate_records(sample)
+    assert np.flatnonzero(~head.valid).tolist() == bad
+    assert np.array_equal(head.features, np.array(good))
+
+    invalid = int((~batch.valid).sum())
+    print(f"{args.rows:,} rows, {invalid:,} invalid ({invalid / args.rows:.2%})")
+    print(f"{'path':<28}{'ns/row':>10}{'s per 1M rows':>16}")
+    for name, seconds in (
+        (f"per-row pydantic ({len(sample):,})", per_row),
+        ("column-wise validate_records", columnwise),
+    ):
+        print(f"{name:<28}{seconds * 1e9:>10.0f}{seconds * 1e6:>16.2f}")
+    print(f"speedup: {per_row / columnwise:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Serialization cost per row of the JSON, raw float64 and Arrow formats.
+
+For each format, ``--rows`` customers are decoded from a request body into
+the (n, 11) feature matrix the scorer reads, and ``--rows`` probabilities
+are encoded into a response body. Requests are parsed and validated with
+``validate_body`` as in ``/predict/batch``; the packed formats carry
+encoded features. Scoring itself is left out. Run from the repository root:
+
+    python -m benchmarks.bench_wire_formats --rows 100000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+import wire_formats
+from backend.main import validate_body
+from benchmarks.bench_lookup import random_requests
+from benchmarks.data import synthetic_features
+from encoding import REQUEST_FIELDS
+from prediction import FEATURE_ORDER
+from wire_formats import ARROW, BINARY, JSON, encode_probabilities
+
+
+def request_bodies(rows: int) -> dict[str, bytes]:
+    customers = [
+        dict(zip(REQUEST_FIELDS, request)) for request in random_requests(rows)
+    ]
+    features = synthetic_features(rows)
+    bodies = {JSON: json.dumps(customers).encode(), BINARY: features.tobytes()}
+    if wire_formats.ARROW_AVAILABLE:
+        import pyarrow as pa
+
+        table = pa.table({f: features[:, i] for i, f in enumerate(FEATURE_ORDER)})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        bodies[ARROW] = sink.getvalue().to_pybytes()
+    return bodies
+
+
+def best_seconds(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    probs = np.random.default_rng(0).random(args.rows)
+    json_engine = "orjson" if wire_formats.orjson is not None else "json"
+    print(f"JSON responses rendered with {json_engine}")
+    print(
+        f"{'format':<38}{'decode ns/row':>14}{'encode ns/row':>14}{'bytes/row in/out':>20}"
+    )
+    for kind, body in request_bodies(args.rows).items():
+        decode_seconds = best_seconds(
+            lambda body=body, kind=kind: validate_body(body, kind), args.repeat
+        )
+        encode_seconds = best_seconds(
+            lambda kind=kind: encode_probabilities(probs, kind, "churn_probabilities"),
+            args.repeat,
+        )
+        response = encode_probabilities(probs, kind, "churn_probabilities")
+        print(
+            f"{kind:<38}{decode_seconds / args.rows * 1e9:>14.1f}"
+            f"{encode_seconds / args.rows * 1e9:>14.1f}"
+            f"{len(body) / args.rows:>11.0f} / {len(response) / args.rows:<6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
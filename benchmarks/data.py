@@ -0,0 +1,48 @@
+"""
+Synthetic customers shared by the benchmarks and tests.
+"""
+
+import numpy as np
+
+from prediction import FEATURE_ORDER
+
+
+def synthetic_features(n: int, seed: int = 0) -> np.ndarray:
+    """Random but plausible encoded customers in FEATURE_ORDER."""
+    rng = np.random.default_rng(seed)
+    rows = np.zeros((n, len(FEATURE_ORDER)))
+    rows[:, 0] = rng.integers(0, 73, n)
+    rows[:, 1] = rng.uniform(18.0, 120.0, n).round(2)
+    rows[:, 2] = rng.integers(0, 2, n)
+    rows[:, 5] = rng.integers(0, 2, n)
+    rows[np.arange(n), 3 + rng.integers(0, 2, n)] = rng.integers(0, 2, n)
+    rows[np.arange(n), 6 + rng.integers(0, 2, n)] = rng.integers(0, 2, n)
+    rows[np.arange(n), 8 + rng.integers(0, 3, n)] = rng.integers(0, 2, n)
+    return rows
+
+
+INTERNET_VALUES = np.array(["DSL", "Fiber optic", "No", " fiber OPTIC "], dtype=object)
+PAYMENT_VALUES = np.array(
+    [
+        "Bank transfer (automatic)",
+        "Credit card (automatic)",
+        "Electronic check",
+        "Mailed check",
+        "electronic check ",
+    ],
+    dtype=object,
+)
+
+
+def synthetic_requests(n: int, seed: int = 0) -> dict[str, np.ndarray]:
+    """Random raw request fields, column-wise, as the API receives them."""
+    rng = np.random.default_rng(seed)
+    return {
+        "tenure": rng.integers(0, 73, n).astype(np.float64),
+        "monthly": rng.uniform(18.0, 120.0, n).round(2),
+        "techsupport": rng.integers(0, 2, n),
+        "paperless": rng.integers(0, 2, n),
+        "contract_months": rng.choice([1, 12, 24, 6, 36], n),
+        "internet_service": rng.choice(INTERNET_VALUES, n),
+        "payment_method": rng.choice(PAYMENT_VALUES, n),
+    }
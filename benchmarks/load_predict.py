@@ -0,0 +1,121 @@
+"""
+Load test /predict with and without the micro-batching coalescer.
+
+Each mode starts its own ``uvicorn backend.main:app`` on a free local port,
+then ``--concurrency`` client threads each send ``--requests`` predictions
+over keep-alive sessions. Run from the repository root:
+
+    python -m benchmarks.load_predict --concurrency 32 --requests 200
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+PAYLOAD = {
+    "tenure": 10,
+    "monthly": 70.5,
+    "techsupport": 1,
+    "paperless": 1,
+    "contract_months": 24,
+    "internet_service": "Fiber optic",
+    "payment_method": "Electronic check",
+}
+
+MODES = {
+    "threadpool": {"PREDICT_COALESCE": "0"},
+    "coalesced": {"PREDICT_COALESCE": "1"},
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, env: dict[str, str]) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return server
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+def client(url: str, n: int) -> list[float]:
+    latencies = []
+    with requests.Session() as session:
+        for _ in range(n):
+            start = time.perf_counter()
+            session.post(url, json=PAYLOAD, timeout=10).raise_for_status()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_load(url: str, concurrency: int, n: int) -> tuple[np.ndarray, float]:
+    client(url, 20)  # warm up the model and connections
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(client, [url] * concurrency, [n] * concurrency))
+    elapsed = time.perf_counter() - start
+    return np.concatenate(results) * 1000, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--max-batch", default="64")
+    parser.add_argument("--max-wait-ms", default="2")
+    args = parser.parse_args()
+
+    for mode, env in MODES.items():
+        env = {
+            **env,
+            "COALESCE_MAX_BATCH": args.max_batch,
+            "COALESCE_MAX_WAIT_MS": args.max_wait_ms,
+        }
+        port = free_port()
+        server = start_server(port, env)
+        try:
+            latencies, elapsed = run_load(
+                f"http://127.0.0.1:{port}/predict", args.concurrency, args.requests
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(
+            f"{mode:<11} {len(latencies) / elapsed:>9,.0f} req/s"
+            f"   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Throughput and per-worker memory from 1 to N worker processes.
+
+For every worker count, two servers are load tested in turn:
+
+- ``shared``: ``python -m backend.serve``, whose workers attach to one copy
+  of the folded weights in shared memory
+- ``per-worker``: plain ``uvicorn --workers``, where every worker loads the
+  model itself (with ``PREDICTION_ENGINE=sklearn`` that means the joblib
+  bundle, pandas and sklearn)
+
+Clients run in ``--clients`` separate processes so the load generator is not
+held back by one GIL. Per-worker RSS and PSS are read from ``/proc`` after
+the run; PSS splits shared pages between the processes mapping them. Run
+from the repository root:
+
+    python -m benchmarks.load_workers --max-workers 4 --engine sklearn
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import requests
+
+from benchmarks.load_predict import client, free_port
+
+
+def server_command(mode: str, workers: int, port: int) -> list[str]:
+    if mode == "shared":
+        return [sys.executable, "-m", "backend.serve", "--workers", str(workers)]
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "backend.main:app",
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+
+
+def start_server(mode: str, workers: int, port: int, env: dict) -> subprocess.Popen:
+    command = [*server_command(mode, workers, port), "--port", str(port)]
+    server = subprocess.Popen(
+        command,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return server
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def worker_pids(server: subprocess.Popen) -> list[int]:
+    """uvicorn's worker processes, or the server itself with one worker."""
+    pids = []
+    for proc in Path("/proc").iterdir():
+        if not proc.name.isdigit():
+            continue
+        try:
+            ppid = int((proc / "stat").read_text().rsplit(")", 1)[1].split()[1])
+            cmdline = (proc / "cmdline").read_bytes()
+        except (OSError, IndexError):
+            continue
+        if ppid == server.pid and b"spawn_main" in cmdline:
+            pids.append(int(proc.name))
+    return pids or [server.pid]
+
+
+def memory_mb(pid: int) -> tuple[float, float]:
+    """(RSS, PSS) of one process in MB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0]) / 1024
+    return values["Rss"], values["Pss"]
+
+
+def run_load(url: str, clients: int, n: int) -> tuple[np.ndarray, float]:
+    with ProcessPoolExecutor(clients) as pool:
+        # Warm up every worker's model and the clients' imports
+        list(pool.map(client, [url] * clients * 2, [20] * clients * 2))
+        start = time.perf_counter()
+        results = list(pool.map(client, [url] * clients, [n] * clients))
+        elapsed = time.perf_counter() - start
+    return np.concatenate(results) * 1000, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--engine", default="sklearn")
+    parser.add_argument("--modes", nargs="+", default=["shared", "per-worker"])
+    args = parser.parse_args()
+
+    env = {"PREDICTION_ENGINE": args.engine}
+    print(
+        f"{'mode':<11}{'workers':>8}{'req/s':>10}{'p99 ms':>9}{'RSS MB':>16}{'PSS MB':>16}"
+    )
+    for workers in range(1, args.max_workers + 1):
+        for mode in args.modes:
+            port = free_port()
+            server = start_server(mode, workers, port, env)
+            try:
+                latencies, elapsed = run_load(
+                    f"http://127.0.0.1:{port}/predict", args.clients, args.requests
+                )
+                memory = [memory_mb(pid) for pid in worker_pids(server)]
+            finally:
+                server.terminate()
+                server.wait()
+            rss, pss = np.mean(memory, axis=0)
+            print(
+                f"{mode:<11}{workers:>8}{len(latencies) / elapsed:>10,.0f}"
+                f"{np.percentile(latencies, 99):>9.2f}"
+                f"{rss:>11.1f}/wkr{pss:>12.1f}/wkr"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Reproducible benchmark suite for the serving stack.
+
+Two parts, written together to one JSON results file:
+
+- ``micro``: microseconds per call of ``make_prediction``,
+  ``make_prediction_row``, ``make_prediction_batch`` (per row of 10,000), the
+  ``convert_*`` helpers, ``encode_row`` and loading the folded ``.npz`` and
+  the joblib bundle.
+- ``load``: ``--concurrency`` client threads send ``--requests`` predictions
+  each to ``backend.main:app`` served by uvicorn in this process
+  (``inprocess``) and in a subprocess (``uvicorn``), and call the
+  ``function_app.predict`` handler directly (``function``). Each target
+  records throughput, p50/p95/p99 latency in ms and the serving process' RSS.
+
+Every optional server feature (cache, coalescer, lookup tables, registry,
+logging) is switched off so runs compare like with like. With
+``--baseline`` each metric is checked against a stored results file and the
+run exits with status 1 when one is worse by more than ``--tolerance``.
+Run from the repository root:
+
+    python -m benchmarks.suite --output results.json --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+
+import numpy as np
+import requests
+
+import encoding
+import prediction
+from benchmarks.data import synthetic_features
+from benchmarks.load_predict import PAYLOAD, free_port, start_server
+from prediction_logging import configure_logging
+
+# Read by backend.main when it is imported; applied in main() before that
+SERVER_ENV = {
+    "PREDICT_COALESCE": "0",
+    "PREDICTION_CACHE_SIZE": "0",
+    "PREDICTION_LOOKUP": "0",
+    "PREDICTION_LOG_SAMPLE_RATE": "0",
+    "MODEL_REGISTRY_DIR": "",
+    "SHARED_MODEL_POINTER": "",
+}
+
+TARGETS = ("inprocess", "uvicorn", "function")
+
+# Metrics where a larger value is an improvement; every other one is a cost
+HIGHER_IS_BETTER = ("throughput",)
+# Metrics that do not scale with the speed of the machine
+UNSCALED = ("rss_mb",)
+
+
+def rss_mb(pid: int | None = None) -> float | None:
+    """Resident set size of a process in MB, None where /proc is missing."""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def per_call_us(func: Callable[[], object], number: int, repeat: int) -> float:
+    """Best of ``repeat`` timings of ``number`` calls, in microseconds per call."""
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Microseconds for a fixed mix of Python and NumPy work on this machine."""
+    x = np.random.default_rng(0).random(100_000)
+
+    def work() -> None:
+        sum(i * i for i in range(20_000))
+        np.sort(x)
+
+    return per_call_us(work, 5, repeat)
+
+
+def run_micro(number: int, repeat: int) -> dict[str, dict[str, float]]:
+    import joblib
+
+    features = dict(
+        zip(
+            prediction.FEATURE_ORDER,
+            encoding.encode_row(**PAYLOAD).tolist(),
+            strict=True,
+        )
+    )
+    row = encoding.encode_row(**PAYLOAD)
+    batch = synthetic_features(10_000)
+    cases = {
+        "make_prediction": (lambda: prediction.make_prediction(**features), number),
+        "make_prediction_row": (lambda: prediction.make_prediction_row(row), number),
+        "make_prediction_batch_per_row": (
+            lambda: prediction.make_prediction_batch(batch),
+            max(1, number // 1000),
+        ),
+        "convert_contract": (lambda: encoding.convert_contract(24), number),
+        "convert_internet": (lambda: encoding.convert_internet("Fiber optic"), number),
+        "convert_payment": (
+            lambda: encoding.convert_payment("Electronic check"),
+            number,
+        ),
+        "encode_row": (lambda: encoding.encode_row(**PAYLOAD), number),
+        "load_folded_model": (
+            lambda: prediction.FoldedModel.load(prediction.FOLDED_MODEL_PATH),
+            max(1, number // 200),
+        ),
+        "load_joblib_bundle": (
+            lambda: joblib.load(prediction.MODEL_PATH),
+            max(1, number // 1000),
+        ),
+    }
+    results = {}
+    for name, (func, calls) in cases.items():
+        us = per_call_us(func, calls, repeat)
+        if name == "make_prediction_batch_per_row":
+            us /= len(batch)
+        results[name] = {"us": us}
+    return results
+
+
+def measure(
+    connect: Callable[[], Callable[[], object]], concurrency: int, n: int
+) -> dict[str, float]:
+    """Latency and throughput of ``n`` calls from each of ``concurrency`` threads.
+
+    ``connect`` runs once per thread and returns the call to time, so each
+    thread can hold its own session.
+    """
+
+    def client(calls: int) -> list[float]:
+        call = connect()
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    client(20)  # warm up the model and connections
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(client, [n] * concurrency))
+    elapsed = time.perf_counter() - start
+    latencies = np.concatenate(results) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+    }
+
+
+def http_client(url: str) -> Callable[[], Callable[[], object]]:
+    def connect() -> Callable[[], object]:
+        session = requests.Session()
+        return lambda: session.post(url, json=PAYLOAD, timeout=10).raise_for_status()
+
+    return connect
+
+
+def load_inprocess(concurrency: int, n: int) -> dict[str, float]:
+    import uvicorn
+
+    port = free_port()
+    config = uvicorn.Config(
+        "backend.main:app", port=port, log_level="warning", access_log=False
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        result = measure(
+            http_client(f"http://127.0.0.1:{port}/predict"), concurrency, n
+        )
+        # Client threads share the process, so this is an upper bound
+        result["rss_mb"] = rss_mb()
+    finally:
+        server.should_exit = True
+        thread.join()
+    return result
+
+
+def load_uvicorn(concurrency: int, n: int) -> dict[str, float]:
+    port = free_port()
+    server = start_server(port, SERVER_ENV)
+    try:
+        result = measure(
+            http_client(f"http://127.0.0.1:{port}/predict"), concurrency, n
+        )
+        result["rss_mb"] = rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+    return result
+
+
+def load_function(concurrency: int, n: int) -> dict[str, float]:
+    import azure.functions as func
+
+    from function_app import predict
+
+    handler = predict.build().get_user_function()
+    request = func.HttpRequest(
+        "GET",
+        "/api/predict",
+        params={key: str(value) for key, value in PAYLOAD.items()},
+        body=b"",
+    )
+
+    def connect() -> Callable[[], object]:
+        return lambda: handler(request)
+
+    result = measure(connect, concurrency, n)
+    result["rss_mb"] = rss_mb()
+    return result
+
+
+LOADS = {
+    "inprocess": load_inprocess,
+    "uvicorn": load_uvicorn,
+    "function": load_function,
+}
+
+
+def metadata() -> dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "engine": prediction.ENGINE,
+        "calibration_us": calibrate(),
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    """``{"micro": {"encode_row": {"us": 1.0}}}`` as ``{"micro.encode_row.us": 1.0}``."""
+    flat = {}
+    for key, value in results.items():
+        if key == "meta":
+            continue
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, int | float) and key not in ("requests", "concurrency"):
+            flat[prefix + key] = float(value)
+    return flat
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """One line per metric more than ``tolerance`` worse than the baseline.
+
+    Timings are first scaled by the ratio of the two runs' calibration
+    workloads, so a machine that is uniformly slower, or busier, than the one
+    the baseline came from does not read as a regression.
+    """
+    current, reference = flatten(results), flatten(baseline)
+    try:
+        speed = results["meta"]["calibration_us"] / baseline["meta"]["calibration_us"]
+    except (KeyError, TypeError, ZeroDivisionError):
+        speed = 1.0
+    found = []
+    for name, before in reference.items():
+        after = current.get(name)
+        if after is None or not before:
+            continue
+        metric = name.rsplit(".", 1)[-1]
+        if metric in HIGHER_IS_BETTER:
+            change = (before / speed - after) / (before / speed)
+        elif metric in UNSCALED:
+            change = (after - before) / before
+        else:
+            change = (after - before * speed) / (before * speed)
+        if change > tolerance:
+            found.append(f"{name}: {before:,.3f} -> {after:,.3f} ({change:+.0%} worse)")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--parts", nargs="+", choices=("micro", "load"), default=["micro", "load"]
+    )
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--number", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=250)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    args = parser.parse_args()
+
+    os.environ.update(SERVER_ENV)
+    configure_logging(sample_rate=0.0)
+    results: dict = {"meta": metadata()}
+    if "micro" in args.parts:
+        results["micro"] = run_micro(args.number, args.repeat)
+        for name, values in results["micro"].items():
+            print(f"{name:<32}{values['us']:>12.3f} us")
+    if "load" in args.parts:
+        results["load"] = {}
+        for target in args.targets:
+            result = LOADS[target](args.concurrency, args.requests)
+            results["load"][target] = result
+            print(
+                f"{target:<10}{result['throughput']:>9,.0f} req/s"
+                f"   p50 {result['p50_ms']:6.2f}   p95 {result['p95_ms']:6.2f}"
+                f"   p99 {result['p99_ms']:6.2f} ms   RSS {result['rss_mb'] or 0:6.1f} MB"
+            )
+
+    path = args.save_baseline or args.output
+    with open(path, "w") as out:
+        json.dump(results, out, indent=2)
+        out.write("\n")
+    print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
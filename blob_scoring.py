@@ -0,0 +1,287 @@
+"""
+Checkpointed scoring of customer files dropped into blob storage.
+
+A drop is either a raw Telco CSV or a JSONL file of ``/predict`` request
+fields, one customer per line. It is read as a stream, ``chunksize`` lines at
+a time, and each chunk is scored in one vectorized call and written as its
+own part file under the output prefix:
+
+    scored/customers.csv/part-00000.csv
+    scored/customers.csv/part-00001.csv
+    scored/customers.csv/_SUCCESS
+
+Parts are uploaded whole and named after their chunk, so writing one twice
+is harmless. A retried invocation lists the parts already written and skips
+their chunks without parsing them; only the unfinished chunks are scored
+again. ``_SUCCESS`` holds the row counts and marks the drop done.
+
+CSV parts hold ``customerID,churn_probability`` rows, as ``score_csv``
+writes them. JSONL parts hold one object per input line with its ``row``
+number, ``customerID`` when the input has one, and ``churn_probability``;
+rows that fail ``validation`` get a null probability and their ``errors``.
+
+Blobs are read and written through a store: ``LocalStore`` keeps them in a
+directory, as a stand-in for local runs and tests, and ``BlobStore`` in an
+Azure Storage container, Azurite included. ``azure-storage-blob`` is only
+imported when a ``BlobStore`` is created.
+"""
+
+import io
+import json
+import os
+import posixpath
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO
+
+from prediction import make_prediction_batch
+from validation import validate_records
+from wire_formats import dumps, loads
+
+CSV = "csv"
+JSONL = "jsonl"
+EXTENSIONS = {".csv": CSV, ".jsonl": JSONL, ".ndjson": JSONL}
+
+CONTAINER = os.environ.get("SCORING_CONTAINER", "scoring")
+QUEUE = "scoring-jobs"
+INCOMING = "incoming/"
+SCORED = "scored/"
+SUCCESS = "_SUCCESS"
+
+DEFAULT_CHUNKSIZE = int(os.environ.get("SCORING_CHUNKSIZE", "100000"))
+
+
+class LocalStore:
+    """Blobs as files under ``root``; names use ``/`` as in a container."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def open(self, name: str) -> BinaryIO:
+        return open(self.root / name, "rb")
+
+    def exists(self, name: str) -> bool:
+        return (self.root / name).is_file()
+
+    def names(self, prefix: str) -> set[str]:
+        folder = self.root / prefix
+        if not folder.is_dir():
+            return set()
+        return {prefix + path.name for path in folder.iterdir() if path.is_file()}
+
+    def read(self, name: str) -> bytes:
+        return (self.root / name).read_bytes()
+
+    def write(self, name: str, data: bytes) -> None:
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Rename into place so a crash never leaves a partial part behind
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+class _ChunkStream(io.RawIOBase):
+    """A readable stream over an iterator of byte strings."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class BlobStore:
+    """Blobs in an Azure Storage container, downloaded in ranged chunks."""
+
+    def __init__(self, connection_string: str, container: str = CONTAINER):
+        from azure.storage.blob import BlobServiceClient
+
+        service = BlobServiceClient.from_connection_string(connection_string)
+        self.container = service.get_container_client(container)
+
+    def open(self, name: str) -> BinaryIO:
+        downloader = self.container.download_blob(name)
+        return io.BufferedReader(_ChunkStream(downloader.chunks()), 1 << 20)
+
+    def exists(self, name: str) -> bool:
+        return self.container.get_blob_client(name).exists()
+
+    def names(self, prefix: str) -> set[str]:
+        return {
+            blob.name for blob in self.container.list_blobs(name_starts_with=prefix)
+        }
+
+    def read(self, name: str) -> bytes:
+        return self.container.download_blob(name).readall()
+
+    def write(self, name: str, data: bytes) -> None:
+        self.container.upload_blob(name, data, overwrite=True)
+
+
+def store_from_env() -> LocalStore | BlobStore:
+    """``LocalStore`` at SCORING_STORE_DIR when set, else the function's storage."""
+    root = os.environ.get("SCORING_STORE_DIR")
+    if root:
+        return LocalStore(root)
+    return BlobStore(os.environ["AzureWebJobsStorage"], CONTAINER)
+
+
+@dataclass
+class RunReport:
+    rows: int
+    chunks: int
+    seconds: float
+    # Chunks whose parts an earlier invocation had already written
+    skipped: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def file_kind(name: str) -> str:
+    extension = posixpath.splitext(name)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f"Cannot score {name!r}, expected one of {sorted(EXTENSIONS)}")
+    return EXTENSIONS[extension]
+
+
+def output_prefix(name: str) -> str:
+    """Where the parts of ``incoming/<name>`` go: ``scored/<name>/``."""
+    return f"{SCORED}{name.removeprefix(INCOMING)}/"
+
+
+def part_name(prefix: str, index: int, kind: str) -> str:
+    return f"{prefix}part-{index:05d}.{kind}"
+
+
+def _parse_jsonl(lines: list[str]) -> list:
+    """One record per line; a line that is not one JSON value is None."""
+    try:
+        # One parse for the whole chunk
+        records = loads("[" + ",".join(lines) + "]")
+    except ValueError:
+        records = None
+    # A line such as '{...}, {...}' parses as two records; per line it fails
+    if records is not None and len(records) == len(lines):
+        return records
+    records = []
+    for line in lines:
+        try:
+            records.append(loads(line))
+        except ValueError:
+            records.append(None)  # reported as missing every field
+    return records
+
+
+def score_jsonl(lines: list[str], first_row: int) -> tuple[int, str]:
+    """Score a chunk of JSONL request lines into JSONL result lines.
+
+    Blank lines, such as a trailing newline, are skipped; rows keep the
+    number of their line in the drop.
+    """
+    numbers = [first_row + i for i, line in enumerate(lines) if line.strip()]
+    if len(numbers) < len(lines):
+        lines = [line for line in lines if line.strip()]
+    records = _parse_jsonl(lines)
+    batch = validate_records(records)
+    probs = batch.expand(make_prediction_batch(batch.features)).tolist()
+    errors = {entry["row"]: entry["errors"] for entry in batch.report()}
+    out = []
+    for i, record in enumerate(records):
+        if i in errors:
+            result = {"row": numbers[i]}
+            if isinstance(record, dict) and "customerID" in record:
+                result["customerID"] = record["customerID"]
+            result["churn_probability"] = None
+            result["errors"] = errors[i]
+            out.append(dumps(result).decode())
+        elif "customerID" in record:
+            customer = json.dumps(record["customerID"])
+            out.append(
+                f'{{"row": {numbers[i]}, "customerID": {customer}, '
+                f'"churn_probability": {probs[i]!r}}}'
+            )
+        else:
+            # Formatted by hand; one dumps call per row costs more than scoring
+            out.append(f'{{"row": {numbers[i]}, "churn_probability": {probs[i]!r}}}')
+    return len(out), "\n".join(out) + "\n" if out else ""
+
+
+def _chunks(lines: Iterator[str], chunksize: int) -> Iterator[list[str]]:
+    while chunk := list(islice(lines, chunksize)):
+        yield chunk
+
+
+def score_stream(
+    source: BinaryIO,
+    kind: str,
+    store,
+    prefix: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> RunReport:
+    """Score a CSV or JSONL stream into part files under ``prefix``.
+
+    Chunks whose part already exists are skipped, so calling this again after
+    a failure only scores what is missing. ``chunksize`` must not change
+    between retries of the same drop.
+    """
+    start = time.perf_counter()
+    if store.exists(prefix + SUCCESS):
+        done = json.loads(store.read(prefix + SUCCESS))
+        return RunReport(rows=0, chunks=0, seconds=0.0, skipped=done["chunks"])
+
+    written = store.names(prefix)
+    text = io.TextIOWrapper(source, encoding="utf-8", newline="")
+    header = text.readline() if kind == CSV else ""
+    rows = chunks = skipped = total = 0
+    for index, lines in enumerate(_chunks(text, chunksize)):
+        name = part_name(prefix, index, kind)
+        first_row, total = total, total + len(lines)
+        if name in written:
+            skipped += 1
+            continue
+        if kind == CSV:
+            # pandas is only imported for CSV drops, off the cold start path
+            from batch_scoring import OUTPUT_COLUMNS, score_to_csv
+
+            count, body = score_to_csv(header + "".join(lines))
+            body = ",".join(OUTPUT_COLUMNS) + "\n" + body
+        else:
+            count, body = score_jsonl(lines, first_row)
+        store.write(name, body.encode())
+        rows += count
+        chunks += 1
+
+    manifest = {"rows": total, "chunks": chunks + skipped, "chunksize": chunksize}
+    store.write(prefix + SUCCESS, json.dumps(manifest).encode())
+    return RunReport(
+        rows=rows, chunks=chunks, seconds=time.perf_counter() - start, skipped=skipped
+    )
+
+
+def score_blob(
+    store, name: str, prefix: str | None = None, chunksize: int = DEFAULT_CHUNKSIZE
+) -> RunReport:
+    """Stream blob ``name`` out of ``store`` and score it; see ``score_stream``."""
+    kind = file_kind(name)
+    with store.open(name) as source:
+        return score_stream(
+            source, kind, store, prefix or output_prefix(name), chunksize
+        )
@@ -0,0 +1,264 @@
+"""
+Command-line entry points for offline model tasks.
+
+Run from the repository root, e.g.:
+
+    python cli.py export-folded
+    python cli.py score-csv input/WA_Fn-UseC_-Telco-Customer-Churn.csv scores.csv
+    python cli.py top-k input/WA_Fn-UseC_-Telco-Customer-Churn.csv top.csv --k 50000
+    python cli.py build-store input/WA_Fn-UseC_-Telco-Customer-Churn.csv input/telco.store
+    python cli.py train --all
+    python cli.py search --jobs -1 --output models/telco_search_best.joblib
+    python cli.py update input/churn-2024-06-01.csv --publish models/telco_incremental.joblib
+"""
+
+import argparse
+import sys
+
+import prediction
+
+
+def export_folded(args: argparse.Namespace) -> None:
+    path = prediction.save_folded_model(args.output)
+    print(f"Folded model written to {path}")
+
+
+def score_csv(args: argparse.Namespace) -> None:
+    import os
+
+    from batch_scoring import score_csv, score_store
+
+    score = score_store if os.path.isdir(args.input) else score_csv
+    report = score(
+        args.input, args.output, chunksize=args.chunksize, workers=args.workers
+    )
+    print(
+        f"Scored {report.rows:,} rows in {report.chunks} chunks"
+        f" in {report.seconds:.2f} s ({report.rows_per_second:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+
+
+def top_k(args: argparse.Namespace) -> None:
+    import os
+
+    from ranking import rank_csv, rank_store
+
+    rank = rank_store if os.path.isdir(args.input) else rank_csv
+    ranking = rank(args.input, args.k, chunksize=args.chunksize, workers=args.workers)
+    with open(args.output, "w", newline="") as out:
+        out.write("customerID,churn_probability\n")
+        out.writelines(
+            f"{customer},{prob!r}\n"
+            for customer, prob in zip(
+                ranking.customer_ids.tolist(),
+                ranking.probabilities.tolist(),
+                strict=True,
+            )
+        )
+    print(
+        f"Top {len(ranking.customer_ids):,} of {ranking.rows:,} rows"
+        f" in {ranking.seconds:.2f} s ({ranking.rows_per_second:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+
+
+def build_store(args: argparse.Namespace) -> None:
+    from feature_store import build_store
+
+    store = build_store(args.input, args.output, chunksize=args.chunksize)
+    print(f"Feature store with {store.rows:,} rows written to {args.output}")
+
+
+def train(args: argparse.Namespace) -> None:
+    import training
+
+    matrix = training.open_matrix(args.data, cache=not args.no_cache)
+    candidates = training.train_candidates(matrix, n_jobs=args.jobs)
+    for candidate in candidates:
+        scores = "  ".join(f"{k} {v:.4f}" for k, v in candidate.scores.items())
+        print(f"{candidate.name:<26} {scores}  ({candidate.seconds:.2f} s)")
+
+    chosen = training.choose(candidates, args.metric)
+    for candidate in candidates if args.all else [chosen]:
+        path = args.output if candidate is chosen and args.output else None
+        path = training.save_bundle(
+            candidate, path or training.bundle_path(candidate.name, args.models_dir)
+        )
+        print(f"{candidate.name} written to {path}")
+    print(f"Chosen by {args.metric}: {chosen.name}")
+
+
+def search(args: argparse.Namespace) -> None:
+    import model_search
+    import training
+
+    matrix = training.open_matrix(args.data, cache=not args.no_cache)
+    result = model_search.search(
+        matrix,
+        n_folds=args.folds,
+        metric=args.metric,
+        n_jobs=args.jobs,
+        margin=None if args.no_early_stop else args.margin,
+    )
+    for entry in result.results[: args.top]:
+        scores = "  ".join(f"{k} {entry.mean(k):.4f}" for k in training.METRICS)
+        print(f"{entry.config.name:<48} {scores}  (+/- {entry.std(args.metric):.4f})")
+    print(
+        f"{len(result.results)} configs, {result.fits} fits in {result.seconds:.2f} s;"
+        f" {result.stopped} stopped early"
+    )
+
+    best = result.best.config
+    print(f"Best by {args.metric}: {best.name}")
+    if args.output:
+        path = training.save_bundle(model_search.fit_config(matrix, best), args.output)
+        print(f"{best.name} refitted on every row and written to {path}")
+
+
+def update(args: argparse.Namespace) -> None:
+    import incremental
+    import training
+
+    bundle, updates = incremental.update(
+        args.batches, args.checkpoint, base=args.base, publish=args.publish
+    )
+    for batch in updates:
+        if batch.skipped:
+            print(f"{batch.path}: already applied, skipped")
+        else:
+            print(f"{batch.path}: {batch.rows:,} rows in {batch.seconds * 1000:.1f} ms")
+    print(f"Checkpoint written to {args.checkpoint}")
+    if args.publish:
+        print(f"Published to {args.publish}")
+
+    if args.holdout:
+        holdout = training.preprocess(args.holdout)
+        scores = incremental.scores(bundle, holdout)
+        print("Holdout  " + "  ".join(f"{k} {v:.4f}" for k, v in scores.items()))
+        if args.compare:
+            features = list(bundle["scaler"].feature_names_in_)
+            full = incremental.full_retrain(
+                training.open_matrix(args.compare), features
+            )
+            drift = incremental.drift(bundle, full, holdout)
+            print(
+                "Drift vs full retrain  "
+                + "  ".join(f"{k} {v:+.4f}" for k, v in drift.items())
+            )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Telco churn model tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser(
+        "export-folded",
+        help="write the scaler-folded weights as a small .npz artifact",
+    )
+    export.add_argument("--output", default=prediction.FOLDED_MODEL_PATH)
+    export.set_defaults(func=export_folded)
+
+    score = commands.add_parser(
+        "score-csv",
+        help="stream a raw Telco CSV into customerID,churn_probability rows",
+    )
+    score.add_argument("input", help="a raw Telco CSV or a feature store directory")
+    score.add_argument("output")
+    score.add_argument("--chunksize", type=int, default=100_000)
+    score.add_argument("--workers", type=int, default=1)
+    score.set_defaults(func=score_csv)
+
+    rank = commands.add_parser(
+        "top-k",
+        help="write the k customers most likely to churn, highest first",
+    )
+    rank.add_argument("input", help="a raw Telco CSV or a feature store directory")
+    rank.add_argument("output")
+    rank.add_argument("--k", type=int, default=100)
+    rank.add_argument("--chunksize", type=int, default=100_000)
+    rank.add_argument("--workers", type=int, default=1)
+    rank.set_defaults(func=top_k)
+
+    store = commands.add_parser(
+        "build-store",
+        help="convert a raw Telco CSV into a memory-mapped feature store",
+    )
+    store.add_argument("input")
+    store.add_argument("output")
+    store.add_argument("--chunksize", type=int, default=500_000)
+    store.set_defaults(func=build_store)
+
+    fit = commands.add_parser(
+        "train",
+        help="fit the notebook's candidate models in parallel and save the best",
+    )
+    fit.add_argument(
+        "--data",
+        default="input/WA_Fn-UseC_-Telco-Customer-Churn.csv",
+        help="a raw Telco CSV or a feature store directory",
+    )
+    fit.add_argument("--jobs", type=int, default=-1)
+    fit.add_argument("--metric", default="roc_auc")
+    fit.add_argument("--models-dir", default="models")
+    fit.add_argument(
+        "--output", help="path for the chosen bundle, e.g. prediction.MODEL_PATH"
+    )
+    fit.add_argument(
+        "--all", action="store_true", help="also save every other candidate"
+    )
+    fit.add_argument("--no-cache", action="store_true")
+    fit.set_defaults(func=train)
+
+    cv = commands.add_parser(
+        "search",
+        help="cross-validate a C/penalty/class_weight grid over the feature sets",
+    )
+    cv.add_argument(
+        "--data",
+        default="input/WA_Fn-UseC_-Telco-Customer-Churn.csv",
+        help="a raw Telco CSV or a feature store directory",
+    )
+    cv.add_argument("--folds", type=int, default=5)
+    cv.add_argument("--jobs", type=int, default=-1)
+    cv.add_argument("--metric", default="roc_auc")
+    cv.add_argument(
+        "--margin",
+        type=float,
+        default=0.01,
+        help="stop configs whose mean score trails the best by more than this",
+    )
+    cv.add_argument("--no-early-stop", action="store_true")
+    cv.add_argument("--top", type=int, default=10, help="how many configs to print")
+    cv.add_argument("--output", help="refit the best config and save it here")
+    cv.add_argument("--no-cache", action="store_true")
+    cv.set_defaults(func=search)
+
+    learn = commands.add_parser(
+        "update",
+        help="fold new labeled Telco CSVs into the model without a full retrain",
+    )
+    learn.add_argument("batches", nargs="+", help="raw Telco CSVs, oldest first")
+    learn.add_argument(
+        "--checkpoint", default="models/incremental/telco_incremental.joblib"
+    )
+    learn.add_argument(
+        "--base",
+        default=prediction.MODEL_PATH,
+        help="bundle to start from when there is no checkpoint yet",
+    )
+    learn.add_argument("--publish", help="also write the updated bundle here")
+    learn.add_argument("--holdout", help="a labeled Telco CSV to score the update on")
+    learn.add_argument(
+        "--compare",
+        help="every row so far (CSV or feature store) for a full retrain to"
+        " compare against on --holdout",
+    )
+    learn.set_defaults(func=update)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
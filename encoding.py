@@ -0,0 +1,213 @@
+"""
+Feature encoding shared by the FastAPI backend and the Azure Function.
+
+Raw request fields are turned straight into float64 rows in FEATURE_ORDER
+using precomputed one-hot tables, either one customer at a time or as a
+column block for many customers at once.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from prediction import FEATURE_ORDER
+
+N_FEATURES = len(FEATURE_ORDER)
+
+# Column slices of each one-hot block inside a FEATURE_ORDER row
+CONTRACT_COLUMNS = slice(3, 5)
+INTERNET_COLUMNS = slice(6, 8)
+PAYMENT_COLUMNS = slice(8, 11)
+
+# Contract length in months: <= 1 month-to-month, <= 12 one year, else two year
+CONTRACT_MONTH_BOUNDS = np.array([1, 12])
+
+# Normalized category -> row of the one-hot table, code 0 is the baseline
+INTERNET_CODES = {"dsl": 0, "fiber optic": 1, "no": 2}
+PAYMENT_CODES = {
+    "bank transfer (automatic)": 0,
+    "credit card (automatic)": 1,
+    "electronic check": 2,
+    "mailed check": 3,
+}
+
+# Raw request fields, in encode_row and encode_columns argument order
+REQUEST_FIELDS = (
+    "tenure",
+    "monthly",
+    "techsupport",
+    "paperless",
+    "contract_months",
+    "internet_service",
+    "payment_method",
+)
+
+# Raw Telco CSV columns (WA_Fn-UseC_-Telco-Customer-Churn.csv) and their codes
+TELCO_COLUMNS = [
+    "tenure",
+    "MonthlyCharges",
+    "TechSupport",
+    "Contract",
+    "PaperlessBilling",
+    "InternetService",
+    "PaymentMethod",
+]
+TELCO_CONTRACT_CODES = {"month-to-month": 0, "one year": 1, "two year": 2}
+YES_NO_CODES = {"no": 0, "yes": 1}
+
+CONTRACT_ONEHOT = np.array([[0, 0], [1, 0], [0, 1]], dtype=np.float64)
+INTERNET_ONEHOT = np.array([[0, 0], [1, 0], [0, 1]], dtype=np.float64)
+PAYMENT_ONEHOT = np.array(
+    [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float64
+)
+
+# The same tables as int tuples for the one-customer path, where unpacking a
+# tuple is much cheaper than assigning NumPy slices
+_CONTRACT_ROWS = [tuple(row) for row in CONTRACT_ONEHOT.astype(int).tolist()]
+_INTERNET_ROWS = [tuple(row) for row in INTERNET_ONEHOT.astype(int).tolist()]
+_PAYMENT_ROWS = [tuple(row) for row in PAYMENT_ONEHOT.astype(int).tolist()]
+
+# Raw strings seen so far, so repeated values skip lower()/strip()
+_RAW_CODE_CACHE_SIZE = 1024
+_raw_internet: dict[str, int] = {}
+_raw_payment: dict[str, int] = {}
+_raw_contract: dict[str, int] = {}
+_raw_yes_no: dict[str, int] = {}
+
+
+def _code(value: str, codes: dict[str, int], seen: dict[str, int]) -> int:
+    try:
+        return seen[value]
+    except KeyError:
+        # Unknown categories fall back to the baseline, like the old if/else chains
+        code = codes.get(value.lower().strip(), 0)
+        if len(seen) < _RAW_CODE_CACHE_SIZE:
+            seen[value] = code
+        return code
+
+
+def contract_code(months: int) -> int:
+    return 0 if months <= 1 else 1 if months <= 12 else 2
+
+
+def internet_code(service: str) -> int:
+    return _code(service, INTERNET_CODES, _raw_internet)
+
+
+def payment_code(method: str) -> int:
+    return _code(method, PAYMENT_CODES, _raw_payment)
+
+
+def convert_contract(months: int) -> tuple[int, int]:
+    return _CONTRACT_ROWS[contract_code(months)]
+
+
+def convert_internet(service: str) -> tuple[int, int]:
+    return _INTERNET_ROWS[internet_code(service)]
+
+
+def convert_payment(method: str) -> tuple[int, int, int]:
+    return _PAYMENT_ROWS[payment_code(method)]
+
+
+def encode_row(
+    tenure: float,
+    monthly: float,
+    techsupport: int,
+    paperless: int,
+    contract_months: int,
+    internet_service: str,
+    payment_method: str,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Encode one customer into a float64 row in FEATURE_ORDER.
+
+    Pass a preallocated ``out`` array of length 11 to avoid allocating.
+    """
+    values = (
+        tenure,
+        monthly,
+        techsupport,
+        *_CONTRACT_ROWS[contract_code(contract_months)],
+        paperless,
+        *_INTERNET_ROWS[internet_code(internet_service)],
+        *_PAYMENT_ROWS[payment_code(payment_method)],
+    )
+    if out is None:
+        return np.array(values, dtype=np.float64)
+    out[:] = values
+    return out
+
+
+def encode_columns(
+    tenure: Sequence[float] | np.ndarray,
+    monthly: Sequence[float] | np.ndarray,
+    techsupport: Sequence[int] | np.ndarray,
+    paperless: Sequence[int] | np.ndarray,
+    contract_months: Sequence[int] | np.ndarray,
+    internet_service: Sequence[str] | np.ndarray,
+    payment_method: Sequence[str] | np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Encode many customers, given column-wise, into an (n, 11) float64 block."""
+    n = len(tenure)
+    if out is None:
+        out = np.empty((n, N_FEATURES), dtype=np.float64)
+
+    contract = np.searchsorted(CONTRACT_MONTH_BOUNDS, contract_months, side="left")
+    internet = np.fromiter(map(internet_code, internet_service), np.intp, n)
+    payment = np.fromiter(map(payment_code, payment_method), np.intp, n)
+
+    out[:, 0] = tenure
+    out[:, 1] = monthly
+    out[:, 2] = techsupport
+    out[:, CONTRACT_COLUMNS] = CONTRACT_ONEHOT[contract]
+    out[:, 5] = paperless
+    out[:, INTERNET_COLUMNS] = INTERNET_ONEHOT[internet]
+    out[:, PAYMENT_COLUMNS] = PAYMENT_ONEHOT[payment]
+    return out
+
+
+def encode_telco_columns(
+    tenure: Sequence[float] | np.ndarray,
+    monthly_charges: Sequence[float] | np.ndarray,
+    tech_support: Sequence[str] | np.ndarray,
+    contract: Sequence[str] | np.ndarray,
+    paperless_billing: Sequence[str] | np.ndarray,
+    internet_service: Sequence[str] | np.ndarray,
+    payment_method: Sequence[str] | np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Encode columns in the raw Telco CSV schema into an (n, 11) float64 block.
+
+    Categories are matched case-insensitively like the notebook's
+    preprocessing, so e.g. "No internet service" counts as no tech support.
+    The string columns may also be pandas categoricals, which is much faster
+    for large chunks.
+    """
+    n = len(tenure)
+    if out is None:
+        out = np.empty((n, N_FEATURES), dtype=np.float64)
+
+    def codes(values, table, seen):
+        if hasattr(values, "cat"):
+            # pandas categoricals: look up each category once, then index by
+            # code; missing values (code -1) hit the appended baseline
+            lookup = [_code(v, table, seen) for v in values.cat.categories]
+            return np.array([*lookup, 0], dtype=np.intp)[values.cat.codes]
+        return np.fromiter((_code(v, table, seen) for v in values), np.intp, n)
+
+    out[:, 0] = tenure
+    out[:, 1] = monthly_charges
+    out[:, 2] = codes(tech_support, YES_NO_CODES, _raw_yes_no)
+    out[:, CONTRACT_COLUMNS] = CONTRACT_ONEHOT[
+        codes(contract, TELCO_CONTRACT_CODES, _raw_contract)
+    ]
+    out[:, 5] = codes(paperless_billing, YES_NO_CODES, _raw_yes_no)
+    out[:, INTERNET_COLUMNS] = INTERNET_ONEHOT[
+        codes(internet_service, INTERNET_CODES, _raw_internet)
+    ]
+    out[:, PAYMENT_COLUMNS] = PAYMENT_ONEHOT[
+        codes(payment_method, PAYMENT_CODES, _raw_payment)
+    ]
+    return out
@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 import requests
 import streamlit as st
+from client import ChurnClient
 from matplotlib.ticker import PercentFormatter
 
 # -----------------------
@@ -12,7 +13,13 @@ st.set_page_config(
     layout="centered",
 )
 
-API_URL = "http://131.163.96.16:8000/predict"
+API_URL = "http://131.163.96.16:8000"
+
+
+# One pooled keep-alive client shared by every rerun and session
+@st.cache_resource
+def get_client() -> ChurnClient:
+    return ChurnClient(API_URL)
 
 # -----------------------
 # CUSTOM CSS
@@ -171,43 +178,59 @@ if st.button("🔮 Predict Churn Probability"):
             }
 
             try:
-                response = requests.post(API_URL, json=params, timeout=10)
-
-                if response.status_code == 200:
-                    prob = response.json()["churn_probability"]
-
-                    # added: risk interpretation based on probability threshold
-                    if prob > 0.2:
-                        st.warning(f"🚨 High churn risk: {prob:.2%}")
-                    else:
-                        st.success(f"✅ Low churn risk: {prob:.2%}")
-
-                    st.markdown(
-                        f"""
-                        <div class='result-card'>
-                            <div class='result-prob'>{prob:.2%}</div>
-                            <p>Predicted likelihood of churn, a figure above 20% is considered risky</p>
-                        </div>
-                        """,
-                        unsafe_allow_html=True,
-                    )
-
-                    # gauge-style bar chart
-                    fig, ax = plt.subplots(figsize=(6, 1.2))
-                    ax.barh([""], [prob], color="#D90429")
-                    ax.set_xlim(0, 1)
-                    ax.set_yticks([])
-                    ax.set_xlabel("Churn Probability")
-                    ax.xaxis.set_major_formatter(PercentFormatter(1.0))
-                    st.pyplot(fig)
-
-                elif response.status_code == 400:
+                prob = get_client().predict(params)
+
+                # added: risk interpretation based on probability threshold
+                if prob > 0.2:
+                    st.warning(f"🚨 High churn risk: {prob:.2%}")
+                else:
+                    st.success(f"✅ Low churn risk: {prob:.2%}")
+
+                st.markdown(
+                    f"""
+                    <div class='result-card'>
+                        <div class='result-prob'>{prob:.2%}</div>
+                        <p>Predicted likelihood of churn, a figure above 20% is considered risky</p>
+                    </div>
+                    """,
+                    unsafe_allow_html=True,
+                )
+
+                # gauge-style bar chart
+                fig, ax = plt.subplots(figsize=(6, 1.2))
+                ax.barh([""], [prob], color="#D90429")
+                ax.set_xlim(0, 1)
+                ax.set_yticks([])
+                ax.set_xlabel("Churn Probability")
+                ax.xaxis.set_major_formatter(PercentFormatter(1.0))
+                st.pyplot(fig)
+
+                # what-if chart: every tenure under each contract, one request
+                sweep = get_client().sweep(
+                    params,
+                    tenure={"start": 0, "stop": 72, "num": 73},
+                    contract_months=[1, 12, 24],
+                )
+                fig, ax = plt.subplots(figsize=(6, 3))
+                curves = zip(*sweep["churn_probabilities"])
+                for label, probs in zip(["Month-to-month", "One year", "Two year"], curves):
+                    ax.plot(sweep["axes"]["tenure"], probs, label=label)
+                ax.axvline(tenure, color="#6A6A6A", linestyle="--", linewidth=1)
+                ax.set_xlabel("Tenure (months)")
+                ax.set_ylabel("Churn Probability")
+                ax.yaxis.set_major_formatter(PercentFormatter(1.0))
+                ax.legend(title="Contract")
+                st.markdown("**What if?** Churn risk by tenure for each contract length")
+                st.pyplot(fig)
+
+            except requests.exceptions.HTTPError as e:
+                response = e.response
+                if response.status_code == 400:
                     st.error(f"❌ Invalid input: {response.text}")
                 elif response.status_code == 500:
                     st.error("🔧 Server error - please try again later")
                 else:
                     st.error(f"⚠️ Unexpected error (status {response.status_code}): {response.text}")
-
             except requests.exceptions.Timeout:
                 st.error("⏱️ Request timed out - the server took too long to respond")
             except requests.exceptions.ConnectionError:
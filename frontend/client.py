@@ -0,0 +1,155 @@
+"""
+HTTP client for the Telco churn API.
+
+``ChurnClient`` keeps one ``requests.Session`` with a pool of keep-alive
+connections, so repeated calls skip the TCP handshake. Failed connections
+and overload responses (429, 502, 503, 504) are retried with exponential
+backoff; scoring has no side effects, so retrying a POST is safe. A server
+that stays too slow raises ``requests.Timeout``, not ``ConnectionError``. Large
+customer lists are split into ``/predict/batch`` requests of ``batch_size``.
+
+``AsyncChurnClient`` fires many ``/predict`` calls concurrently from
+asyncio code. The project has no async HTTP dependency, so it runs the
+pooled client on a thread pool sized to ``max_concurrency``.
+"""
+
+import asyncio
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Self
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+from urllib3.util import Retry
+
+API_URL = os.environ.get("API_URL", "http://127.0.0.1:8000")
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+
+class ChurnClient:
+    """Pooled, retrying client for ``/predict`` and ``/predict/batch``."""
+
+    def __init__(
+        self,
+        base_url: str = API_URL,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff: float = 0.1,
+        pool_size: int = 10,
+        batch_size: int = 1000,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.batch_size = batch_size
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _post(self, path: str, payload) -> dict:
+        url = self.base_url + path
+        try:
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+        except requests.ConnectionError as e:
+            # Once retries run out urllib3 reports a read timeout as a failed
+            # connection; raise it as the requests.Timeout it is
+            reason = e.args[0] if e.args else None
+            if isinstance(reason, MaxRetryError) and isinstance(
+                reason.reason, ReadTimeoutError
+            ):
+                raise requests.ReadTimeout(
+                    f"{url} did not respond in time", request=e.request
+                ) from e
+            raise
+        # Raises requests.HTTPError carrying the response, after any retries
+        response.raise_for_status()
+        return response.json()
+
+    def predict(self, customer: Mapping) -> float:
+        """Churn probability for one customer's request fields."""
+        return self._post("/predict", dict(customer))["churn_probability"]
+
+    def predict_batch(self, customers: Sequence[Mapping]) -> list[float]:
+        """Churn probabilities for ``customers`` in a single request."""
+        payload = [dict(customer) for customer in customers]
+        return self._post("/predict/batch", payload)["churn_probabilities"]
+
+    def sweep(self, base: Mapping, **axes) -> dict:
+        """Score a grid of what-if variations of ``base`` in one request.
+
+        ``tenure`` and ``monthly`` take ``{"start", "stop", "num"}`` ranges,
+        the categorical fields lists of values; see ``/predict/sweep``.
+        """
+        return self._post("/predict/sweep", {"base": dict(base), **axes})
+
+    def chunks(self, customers: Iterable[Mapping]) -> list[list[Mapping]]:
+        customers = list(customers)
+        return [
+            customers[start : start + self.batch_size]
+            for start in range(0, len(customers), self.batch_size)
+        ]
+
+    def predict_many(self, customers: Iterable[Mapping]) -> list[float]:
+        """Churn probabilities for many customers, ``batch_size`` per request."""
+        probs = []
+        for chunk in self.chunks(customers):
+            probs.extend(self.predict_batch(chunk))
+        return probs
+
+
+class AsyncChurnClient:
+    """Concurrent ``/predict`` calls for asyncio code."""
+
+    def __init__(self, base_url: str = API_URL, max_concurrency: int = 32, **kwargs):
+        self.client = ChurnClient(base_url, pool_size=max_concurrency, **kwargs)
+        self._pool = ThreadPoolExecutor(max_concurrency, thread_name_prefix="churn")
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown()
+        self.client.close()
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    async def predict(self, customer: Mapping) -> float:
+        return await self._run(self.client.predict, customer)
+
+    async def predict_all(self, customers: Sequence[Mapping]) -> list[float]:
+        """One ``/predict`` call per customer, up to ``max_concurrency`` at once."""
+        return list(await asyncio.gather(*map(self.predict, customers)))
+
+    async def predict_many(self, customers: Iterable[Mapping]) -> list[float]:
+        """Like ``ChurnClient.predict_many``, sending the batches concurrently."""
+        chunks = self.client.chunks(customers)
+        results = await asyncio.gather(
+            *(self._run(self.client.predict_batch, chunk) for chunk in chunks)
+        )
+        return [prob for probs in results for prob in probs]
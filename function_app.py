@@ -1,41 +1,44 @@
-import logging
-
 import azure.functions as func
 
-from prediction import make_prediction
+from blob_scoring import (
+    CONTAINER,
+    INCOMING,
+    QUEUE,
+    file_kind,
+    output_prefix,
+    score_blob,
+    score_stream,
+    store_from_env,
+)
+from encoding import encode_row
+from prediction import make_prediction_batch, make_prediction_row, warm_up
+from prediction_logging import configure_logging, log_event, sampled
+from validation import validate_features, validate_records
+from wire_formats import (
+    JSON,
+    NotAcceptable,
+    UnsupportedMediaType,
+    decode_features,
+    encode_probabilities,
+    loads,
+    media_type,
+    negotiate,
+)
 
 app = func.FunctionApp()
 
-# ------------- HELPERS ----------------------
-
-def convert_contract(months: int):
-    if months <= 1:
-        return 0, 0
-    elif months <= 12:
-        return 1, 0
-    else:
-        return 0, 1
-
-def convert_internet(service: str):
-    service = service.lower().strip()
-    return (
-        1 if service == "fiber optic" else 0,
-        1 if service == "no" else 0,
-    )
+# Sampled JSON logs, passed on to the host's logger and so to App Insights
+configure_logging(propagate=True)
 
-def convert_payment(method: str):
-    method = method.lower().strip()
-    return (
-        1 if method == "credit card (automatic)" else 0,
-        1 if method == "electronic check" else 0,
-        1 if method == "mailed check" else 0,
-    )
+# Load the model in the background so the cold start is not blocked on it
+warm_up()
 
 # ------------- ROUTE ------------------------
 
 @app.route(route="predict", auth_level=func.AuthLevel.FUNCTION)
 def predict(req: func.HttpRequest) -> func.HttpResponse:
-    logging.info("Processing prediction request...")
+    if sampled():
+        log_event("request", route="predict", params=dict(req.params))
 
     try:
         tenure = float(req.params.get("tenure"))
@@ -49,26 +52,73 @@ def predict(req: func.HttpRequest) -> func.HttpResponse:
     except Exception:
         return func.HttpResponse("Missing or invalid parameters", status_code=400)
 
-    # --- One-hot encoders ---
-    c_one, c_two = convert_contract(contract_months)
-    i_fiber, i_no = convert_internet(internet_service)
-    p_card, p_echeck, p_mail = convert_payment(payment_method)
-
-    # --- Predict ---
-    prob = make_prediction(
-        **{
-            "tenure": tenure,
-            "MonthlyCharges": monthly,
-            "TechSupport_yes": techsupport,
-            "Contract_one year": c_one,
-            "Contract_two year": c_two,
-            "PaperlessBilling_yes": paperless,
-            "InternetService_fiber optic": i_fiber,
-            "InternetService_no": i_no,
-            "PaymentMethod_credit card (automatic)": p_card,
-            "PaymentMethod_electronic check": p_echeck,
-            "PaymentMethod_mailed check": p_mail,
-        }
+    # --- Encode and predict ---
+    row = encode_row(
+        tenure,
+        monthly,
+        techsupport,
+        paperless,
+        contract_months,
+        internet_service,
+        payment_method,
     )
+    prob = make_prediction_row(row)
 
     return func.HttpResponse(str(prob), status_code=200)
+
+@app.route(route="predict/batch", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
+def predict_batch(req: func.HttpRequest) -> func.HttpResponse:
+    # JSON rows with the /predict fields, or packed features; see wire_formats
+    try:
+        kind = media_type(req.headers.get("content-type"))
+        accept = negotiate(req.headers.get("accept"))
+    except UnsupportedMediaType as e:
+        return func.HttpResponse(str(e), status_code=415)
+    except NotAcceptable as e:
+        return func.HttpResponse(str(e), status_code=406)
+
+    try:
+        if kind == JSON:
+            rows = loads(req.get_body())
+            if not isinstance(rows, list):
+                raise ValueError("Expected a list of rows")
+            batch = validate_records(rows)
+        else:
+            batch = validate_features(decode_features(req.get_body(), kind))
+    except ValueError:
+        return func.HttpResponse("Missing or invalid rows", status_code=400)
+
+    # Bad rows are reported alongside the scored ones, null or NaN in place
+    probs = batch.expand(make_prediction_batch(batch.features))
+    body = encode_probabilities(probs, accept, "churn_probabilities", batch.report())
+    return func.HttpResponse(body, status_code=200, mimetype=accept)
+
+# ------------- BLOB AND QUEUE SCORING ------------------------
+
+def log_run(name: str, report) -> None:
+    log_event(
+        "blob_scored",
+        blob=name,
+        rows=report.rows,
+        chunks=report.chunks,
+        skipped=report.skipped,
+        seconds=round(report.seconds, 3),
+        rows_per_second=round(report.rows_per_second),
+    )
+
+@app.blob_trigger(
+    arg_name="blob", path=f"{CONTAINER}/{INCOMING}{{name}}", connection="AzureWebJobsStorage"
+)
+def score_dropped_blob(blob: func.InputStream) -> None:
+    # Failures propagate so the host retries; finished chunks are skipped then
+    name = blob.name.removeprefix(f"{CONTAINER}/")
+    report = score_stream(blob, file_kind(name), store_from_env(), output_prefix(name))
+    log_run(name, report)
+
+@app.queue_trigger(arg_name="msg", queue_name=QUEUE, connection="AzureWebJobsStorage")
+def score_queued_blob(msg: func.QueueMessage) -> None:
+    # {"blob": "incoming/customers.csv", "output": "scored/customers.csv/"},
+    # "output" optional; the blob is streamed from storage in ranged reads
+    job = msg.get_json()
+    report = score_blob(store_from_env(), job["blob"], job.get("output"))
+    log_run(job["blob"], report)
@@ -0,0 +1,162 @@
+"""
+Incremental updates of the churn model from new labeled batches.
+
+A full retrain refits the scaler and the logistic regression on every row
+seen so far. Here a bundle is updated from each new batch alone:
+
+- the StandardScaler's running mean and variance continue from its
+  ``n_samples_seen_`` with ``partial_fit``
+- the logistic weights are re-expressed for the moved scaler, so that step
+  alone changes no prediction, and then take one SGD pass of log loss over
+  the batch with ``SGDClassifier.partial_fit``
+
+The first update starts the SGD model from the deployed logistic
+regression's weights. A small constant step keeps a converged model close to
+what a full retrain would give instead of restarting the step schedule.
+
+After every batch the bundle is written to a checkpoint, together with the
+SHA-256 of each batch file it has seen, so a rerun after a failure skips
+the batches already applied. ``update`` can then publish the result as a
+normal bundle, e.g. into the model registry's directory.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+import training
+from prediction import MODEL_PATH, _file_sha256
+
+CHECKPOINT_PATH = "models/incremental/telco_incremental.joblib"
+
+# L2 penalty of LogisticRegression's C=1 over the notebook's 5,625 training rows
+ALPHA = 1 / 5_625
+ETA0 = 0.001
+
+
+@dataclass(frozen=True)
+class BatchUpdate:
+    path: str
+    rows: int
+    seconds: float
+    # The checkpoint had already applied this batch
+    skipped: bool = False
+
+
+def new_model():
+    from sklearn.linear_model import SGDClassifier
+
+    return SGDClassifier(
+        loss="log_loss",
+        alpha=ALPHA,
+        learning_rate="constant",
+        eta0=ETA0,
+        random_state=training.RANDOM_STATE,
+    )
+
+
+def load_checkpoint(path: str = CHECKPOINT_PATH, base: str = MODEL_PATH) -> dict:
+    """The checkpoint at ``path``, or a fresh copy of the ``base`` bundle."""
+    import joblib
+
+    if os.path.exists(path):
+        bundle = joblib.load(path)
+        # A plain training bundle has applied no batches yet
+        bundle.setdefault("batches", [])
+        return bundle
+    bundle = joblib.load(base)
+    return {"model": bundle["model"], "scaler": bundle["scaler"], "batches": []}
+
+
+def _rescale(model, mean: np.ndarray, scale: np.ndarray, scaler) -> None:
+    """Move ``model``'s weights from the old scaling to ``scaler``'s."""
+    coef = model.coef_ / scale
+    model.intercept_ = model.intercept_ + coef @ (scaler.mean_ - mean)
+    model.coef_ = coef * scaler.scale_
+
+
+def update_bundle(bundle: dict, matrix: training.FeatureMatrix) -> None:
+    """Fold one labeled batch into ``bundle``'s scaler and model, in place."""
+    scaler = bundle["scaler"]
+    frame = matrix.select(list(scaler.feature_names_in_))
+    mean, scale = scaler.mean_.copy(), scaler.scale_.copy()
+    scaler.partial_fit(frame)
+
+    model = bundle["model"]
+    if not hasattr(model, "partial_fit"):
+        start = model
+        model = bundle["model"] = new_model()
+        # partial_fit keeps weights that are already set instead of zeroing them
+        model.coef_ = start.coef_.copy()
+        model.intercept_ = start.intercept_.copy()
+    _rescale(model, mean, scale, scaler)
+    model.partial_fit(scaler.transform(frame), matrix.y, classes=[0, 1])
+
+
+def checkpoint(bundle: dict, path: str, **extra) -> str:
+    features = list(bundle["scaler"].feature_names_in_)
+    candidate = training.Candidate(
+        "incremental", features, bundle["model"], bundle["scaler"], {}, 0.0
+    )
+    return training.save_bundle(candidate, path, **extra)
+
+
+def update(
+    paths: list[str],
+    checkpoint_path: str = CHECKPOINT_PATH,
+    base: str = MODEL_PATH,
+    publish: str | None = None,
+) -> tuple[dict, list[BatchUpdate]]:
+    """Apply each raw Telco CSV in ``paths`` to the checkpoint, in order.
+
+    Returns the updated bundle and one ``BatchUpdate`` per path, timing the
+    scaler and model update without the checkpoint write.
+    """
+    bundle = load_checkpoint(checkpoint_path, base)
+    updates = []
+    for path in paths:
+        source = _file_sha256(path)
+        if source in bundle["batches"]:
+            updates.append(BatchUpdate(path, 0, 0.0, skipped=True))
+            continue
+        matrix = training.preprocess(path)
+        start = time.perf_counter()
+        update_bundle(bundle, matrix)
+        seconds = time.perf_counter() - start
+        bundle["batches"].append(source)
+        checkpoint(bundle, checkpoint_path, batches=bundle["batches"])
+        updates.append(BatchUpdate(path, len(matrix.y), seconds))
+    if publish:
+        checkpoint(bundle, publish)
+    return bundle, updates
+
+
+def full_retrain(matrix: training.FeatureMatrix, features: list[str]) -> dict:
+    """The scaler and logistic regression fitted on every row, for comparison."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    X = scaler.fit_transform(matrix.select(features))
+    model = LogisticRegression(
+        solver=training.SOLVER,
+        max_iter=training.MAX_ITER,
+        random_state=training.RANDOM_STATE,
+    )
+    return {"model": model.fit(X, matrix.y), "scaler": scaler}
+
+
+def scores(bundle: dict, matrix: training.FeatureMatrix) -> dict[str, float]:
+    scaler = bundle["scaler"]
+    X = scaler.transform(matrix.select(list(scaler.feature_names_in_)))
+    return training.evaluate(bundle["model"], X, matrix.y)
+
+
+def drift(
+    bundle: dict, reference: dict, matrix: training.FeatureMatrix
+) -> dict[str, float]:
+    """Each metric on ``matrix`` minus the ``reference`` bundle's; below 0 is worse."""
+    ours, theirs = scores(bundle, matrix), scores(reference, matrix)
+    return {metric: ours[metric] - theirs[metric] for metric in training.METRICS}
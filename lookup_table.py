@@ -0,0 +1,157 @@
+"""
+Probability lookup tables for single requests.
+
+The logit of the folded model is a sum of independent terms, so it can be
+precomputed piece by piece when the model loads:
+
+- one entry per categorical combination, techsupport x contract x
+  paperless x internet x payment = 2 x 3 x 2 x 3 x 4 = 144, with the bias
+  folded in
+- one entry per integer tenure from 0 to 72
+- one entry per MonthlyCharges value in cents, up to ``MAX_MONTHLY_CENTS``
+
+A request then costs three lookups, two additions and one sigmoid, with no
+row to encode and no NumPy call. The tables take about 160 KB and build in
+about a millisecond.
+
+Every entry is computed from the same float64 inputs a request carries;
+only the order in which the terms are rounded and summed differs from the
+dot product. That keeps every probability within ``1e-12`` of
+``MODEL.predict_proba``. Inputs off the grid, such as a fractional tenure,
+compute that term directly, and non-binary flags go through the folded
+model, so they are just as exact.
+"""
+
+import math
+from dataclasses import dataclass
+from itertools import product
+
+import numpy as np
+
+from encoding import (
+    CONTRACT_ONEHOT,
+    INTERNET_ONEHOT,
+    PAYMENT_ONEHOT,
+    contract_code,
+    encode_row,
+    internet_code,
+    payment_code,
+)
+from prediction import FoldedModel
+
+MAX_TENURE = 72
+MAX_MONTHLY_CENTS = 20_000
+
+# techsupport, contract, paperless, internet, payment
+CATEGORICAL_SHAPE = (2, 3, 2, 3, 4)
+
+
+@dataclass(frozen=True)
+class LookupTable:
+    # Plain lists: indexing them is several times faster than NumPy scalars
+    categorical: list[float]
+    tenure: list[float]
+    monthly: list[float]
+    tenure_weight: float
+    monthly_weight: float
+    scorer: FoldedModel
+
+    @classmethod
+    def build(cls, scorer: FoldedModel) -> "LookupTable":
+        """Tabulate the logit terms of a folded model."""
+        weights, bias = scorer.weights, scorer.bias
+        # The nine binary columns of every combination, in FEATURE_ORDER
+        binary = np.array(
+            [
+                [
+                    support,
+                    *CONTRACT_ONEHOT[contract],
+                    paperless,
+                    *INTERNET_ONEHOT[internet],
+                    *PAYMENT_ONEHOT[payment],
+                ]
+                for support, contract, paperless, internet, payment in product(
+                    *map(range, CATEGORICAL_SHAPE)
+                )
+            ]
+        )
+        categorical = (binary @ weights[2:] + bias).tolist()
+
+        tenure_weight, monthly_weight = float(weights[0]), float(weights[1])
+        cents = np.arange(MAX_MONTHLY_CENTS + 1)
+        return cls(
+            categorical=categorical,
+            tenure=[t * tenure_weight for t in map(float, range(MAX_TENURE + 1))],
+            monthly=(cents / 100 * monthly_weight).tolist(),
+            tenure_weight=tenure_weight,
+            monthly_weight=monthly_weight,
+            scorer=scorer,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the table values, as float64."""
+        return 8 * (len(self.categorical) + len(self.tenure) + len(self.monthly))
+
+    def logit(
+        self,
+        tenure: float,
+        monthly: float,
+        techsupport: int,
+        paperless: int,
+        contract: int,
+        internet: int,
+        payment: int,
+    ) -> float:
+        """Logit for one customer given category codes, see ``predict``."""
+        index = (((techsupport * 3 + contract) * 2 + paperless) * 3 + internet) * 4
+        z = self.categorical[index + payment]
+
+        # Range checks come first so NaN and infinity never reach int()
+        if 0 <= tenure <= MAX_TENURE and (t := int(tenure)) == tenure:
+            z += self.tenure[t]
+        else:
+            z += tenure * self.tenure_weight
+
+        if 0 <= monthly <= MAX_MONTHLY_CENTS / 100 and (
+            (cents := round(monthly * 100)) / 100 == monthly
+        ):
+            z += self.monthly[cents]
+        else:
+            z += monthly * self.monthly_weight
+        return z
+
+    def predict(
+        self,
+        tenure: float,
+        monthly: float,
+        techsupport: int,
+        paperless: int,
+        contract_months: int,
+        internet_service: str,
+        payment_method: str,
+    ) -> float:
+        """Churn probability from raw request fields, like ``encode_row``."""
+        if techsupport not in (0, 1) or paperless not in (0, 1):
+            # Off the categorical grid; score the encoded row instead
+            row = encode_row(
+                tenure,
+                monthly,
+                techsupport,
+                paperless,
+                contract_months,
+                internet_service,
+                payment_method,
+            )
+            return float(self.scorer.predict_proba(row))
+        z = self.logit(
+            tenure,
+            monthly,
+            int(techsupport),
+            int(paperless),
+            contract_code(contract_months),
+            internet_code(internet_service),
+            payment_code(payment_method),
+        )
+        # Same clipping as the NumPy sigmoid
+        return 1.0 / (1.0 + math.exp(-min(max(z, -500.0), 500.0)))
@@ -0,0 +1,222 @@
+"""
+Minimal Prometheus-style metrics for the prediction service.
+
+Counters and fixed-bucket histograms are plain Python objects guarded by a
+lock, cheap enough (well under a microsecond per update) to leave on in
+production. ``render()`` produces the Prometheus text exposition format.
+Values owned by other components, such as cache statistics, are pulled in
+at scrape time through registered collectors.
+"""
+
+import copy
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+
+# Latency buckets in seconds, from 1 microsecond to 1 second
+LATENCY_BUCKETS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    1e-2,
+    2.5e-2,
+    5e-2,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+Sample = tuple[str, dict[str, str], float]
+
+_REGISTRY: list["_Metric"] = []
+_COLLECTORS: list[Callable[[], Iterable[tuple[str, str, Iterable[Sample]]]]] = []
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return "{" + inner + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], _Metric] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def labels(self, *values: str):
+        """Return the child metric for one combination of label values."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _new_child(self) -> "_Metric":
+        child = copy.copy(self)
+        child.labelnames = ()
+        child._children = {}
+        child._init_values()
+        return child
+
+    def _init_values(self) -> None:
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Sample]:
+        if not self.labelnames:
+            yield from self._samples()
+            return
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values, strict=True))
+            for name, extra, value in child._samples():
+                yield name, {**labels, **extra}, value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._init_values()
+
+    def _init_values(self) -> None:
+        self._value = 0.0
+        self._value_lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._value_lock:
+            self._value += amount
+
+    def _samples(self) -> Iterable[Sample]:
+        yield self.name + "_total", {}, self._value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._init_values()
+
+    def _init_values(self) -> None:
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def _samples(self) -> Iterable[Sample]:
+        yield self.name, {}, self._value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.bounds = tuple(buckets)
+        super().__init__(name, documentation, labelnames)
+        self._init_values()
+
+    def _init_values(self) -> None:
+        # One slot per bucket plus +Inf; cumulated only when rendering
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+        self._value_lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._value_lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def _samples(self) -> Iterable[Sample]:
+        with self._value_lock:
+            counts, total = list(self._counts), self._sum
+        cumulative = 0
+        for bound, count in zip((*self.bounds, float("inf")), counts, strict=True):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            yield self.name + "_bucket", {"le": le}, cumulative
+        yield self.name + "_count", {}, cumulative
+        yield self.name + "_sum", {}, total
+
+
+def register_collector(
+    collector: Callable[[], Iterable[tuple[str, str, Iterable[Sample]]]],
+) -> None:
+    """Add a callable yielding ``(name, kind, samples)`` at every scrape."""
+    _COLLECTORS.append(collector)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    families = [
+        (metric.name, metric.kind, metric.documentation, metric.samples())
+        for metric in _REGISTRY
+    ]
+    for collector in _COLLECTORS:
+        for name, kind, samples in collector():
+            families.append((name, kind, "", samples))
+
+    for name, kind, documentation, samples in families:
+        if documentation:
+            lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample_name, labels, value in samples:
+            lines.append(f"{sample_name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+REQUESTS = Counter(
+    "telco_requests", "HTTP requests handled, by route and status", ("route", "status")
+)
+ERRORS = Counter(
+    "telco_errors",
+    "HTTP requests that failed, by route and status",
+    ("route", "status"),
+)
+REQUEST_SECONDS = Histogram(
+    "telco_request_seconds", "End-to-end handler latency, by route", ("route",)
+)
+STAGE_SECONDS = Histogram(
+    "telco_stage_seconds", "Latency of each step of a prediction", ("stage",)
+)
+MODEL_LOAD_SECONDS = Gauge(
+    "telco_model_load_seconds", "Time taken by the last model load"
+)
+
+# Pre-resolved children so the hot path skips the label lookup
+VALIDATION = STAGE_SECONDS.labels("validation")
+ENCODE = STAGE_SECONDS.labels("encode")
+SCALE = STAGE_SECONDS.labels("scale")
+PREDICT_PROBA = STAGE_SECONDS.labels("predict_proba")
+SCORE = STAGE_SECONDS.labels("score")
+SERIALIZATION = STAGE_SECONDS.labels("serialization")
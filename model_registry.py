@@ -0,0 +1,145 @@
+"""
+Registry of versioned model bundles with hot reload.
+
+Every ``*.joblib`` bundle in a directory is served as a version named after
+its file, e.g. ``models/telco_model_2_contract.joblib`` is version
+``telco_model_2_contract``. A background thread polls the directory and
+loads new or changed bundles off the request path; the set of models is then
+replaced in a single assignment. Requests read that mapping without locking,
+and an in-flight request keeps scoring with the model it already looked up.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import metrics
+from prediction import LOAD_ERRORS, MODEL_PATH, FoldedModel, _file_sha256
+from prediction_logging import log_event
+
+
+class UnknownModelVersion(LookupError):
+    """Raised when a request asks for a version the registry does not hold."""
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    name: str
+    path: str
+    sha256: str
+    scorer: FoldedModel
+    # (mtime_ns, size) of the bundle when it was loaded
+    stamp: tuple[int, int]
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_version(path: Path) -> ModelVersion:
+    """Load one bundle, using its folded ``.npz`` export when it is fresh."""
+    stamp = _stamp(path)
+    sha256 = _file_sha256(str(path))
+    folded = path.with_suffix(".npz")
+    scorer = None
+    if folded.exists():
+        scorer, source = FoldedModel.load(str(folded))
+        if source != sha256:
+            scorer = None
+    if scorer is None:
+        import joblib
+
+        bundle = joblib.load(path)
+        scorer = FoldedModel.from_bundle(bundle["model"], bundle["scaler"])
+    return ModelVersion(path.stem, str(path), sha256, scorer, stamp)
+
+
+class ModelRegistry:
+    """Hold every model bundle in a directory and keep them up to date."""
+
+    def __init__(self, directory: str = "models", default: str | None = None):
+        self.directory = Path(directory)
+        self.default = default or Path(MODEL_PATH).stem
+        self.reloads = 0
+        self._models: dict[str, ModelVersion] = {}
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    @classmethod
+    def from_env(cls) -> "ModelRegistry | None":
+        """Build from MODEL_REGISTRY_DIR, None when it is unset."""
+        directory = os.environ.get("MODEL_REGISTRY_DIR")
+        if not directory:
+            return None
+        return cls(directory, default=os.environ.get("MODEL_DEFAULT_VERSION"))
+
+    def models(self) -> dict[str, ModelVersion]:
+        """A snapshot of the served versions by name."""
+        return dict(self._models)
+
+    def get(self, name: str | None = None) -> ModelVersion:
+        """Return the named version, or the default one."""
+        models = self._models
+        model = models.get(name or self.default)
+        if model is None:
+            raise UnknownModelVersion(
+                f"Unknown model version {name or self.default!r}, "
+                f"available: {sorted(models)}"
+            )
+        return model
+
+    def refresh(self) -> bool:
+        """Load added or changed bundles and drop deleted ones.
+
+        Returns True when the set of served models changed. A bundle that
+        fails to load keeps its previous version in service.
+        """
+        with self._refresh_lock:
+            current = self._models
+            models = {}
+            for path in sorted(self.directory.glob("*.joblib")):
+                loaded = current.get(path.stem)
+                try:
+                    if loaded is None or loaded.stamp != _stamp(path):
+                        start = time.perf_counter()
+                        loaded = load_version(path)
+                        metrics.MODEL_LOAD_SECONDS.set(time.perf_counter() - start)
+                        log_event("model_loaded", version=loaded.name)
+                except LOAD_ERRORS as e:
+                    log_event("model_load_failed", path=str(path), error=str(e))
+                if loaded is not None:
+                    models[path.stem] = loaded
+
+            changed = models.keys() != current.keys() or any(
+                model is not current.get(name) for name, model in models.items()
+            )
+            if changed:
+                # Readers see either the old mapping or the new one, never a mix
+                self._models = models
+                self.reloads += 1
+            return changed
+
+    def start(self, interval: float = 2.0) -> threading.Thread:
+        """Load the directory now, then poll it every ``interval`` seconds."""
+        self.refresh()
+        if self._watcher is None:
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="model-watcher", daemon=True
+            )
+            self._watcher.start()
+        return self._watcher
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.refresh()
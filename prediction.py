@@ -1,9 +1,25 @@
 """
 Prediction module for Telco churn model.
+
+Heavy dependencies (joblib, pandas, sklearn) are only imported when the
+sklearn engine or the joblib bundle is actually needed, so importing this
+module stays cheap on serverless cold starts.
 """
 
-import joblib
-import pandas as pd
+import hashlib
+import os
+import pickle
+import threading
+import time
+import zipfile
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+
+import metrics
+from prediction_logging import log_event, sampled
 
 # IMPORTANT: Feature order must match the trained model
 FEATURE_ORDER = [
@@ -20,28 +36,430 @@ FEATURE_ORDER = [
     "PaymentMethod_mailed check",
 ]
 
-BUNDLE = joblib.load("models/telco_logistic_regression.joblib")
-MODEL, SCALER = BUNDLE["model"], BUNDLE["scaler"]
+ENGINES = ("numpy", "float32", "sklearn")
+
+# The nine 0/1 one-hot columns that follow tenure and MonthlyCharges
+BINARY_FEATURES = FEATURE_ORDER[2:]
+_BITS = (1 << np.arange(len(BINARY_FEATURES))).astype(np.uint16)
+
+MODEL_PATH = os.environ.get("MODEL_PATH", "models/telco_logistic_regression.joblib")
+# Precompiled folded weights; loading them needs neither joblib nor sklearn
+FOLDED_MODEL_PATH = os.environ.get(
+    "FOLDED_MODEL_PATH", os.path.splitext(MODEL_PATH)[0] + ".npz"
+)
+
+# What loading a missing, half-written or corrupt bundle or .npz raises;
+# anything else is a bug and is left to propagate
+LOAD_ERRORS = (
+    OSError,
+    EOFError,
+    ValueError,
+    LookupError,
+    pickle.UnpicklingError,
+    zipfile.BadZipFile,
+)
+
+
+def _sigmoid(z):
+    # Clipping keeps np.exp from overflowing on absurd inputs
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -500.0, 500.0)))
+
+
+def _sigmoid32(z):
+    # float32 overflows far earlier; every input past +-80 rounds to 0 or 1
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -80.0, 80.0)))
+
+
+@dataclass(frozen=True)
+class PackedRows:
+    """Encoded rows in 10 bytes each instead of 88.
+
+    tenure and MonthlyCharges are kept as float32, and the nine binary
+    one-hot features become the bits of a single uint16.
+    """
+
+    numeric: np.ndarray
+    flags: np.ndarray
+
+    @classmethod
+    def pack(cls, matrix: np.ndarray) -> "PackedRows":
+        """Pack an (n, 11) matrix in ``FEATURE_ORDER``."""
+        matrix = np.asarray(matrix)
+        binary = matrix[:, 2:]
+        if ((binary != 0) & (binary != 1)).any():
+            raise ValueError("One-hot features must be 0 or 1 to be packed")
+        flags = binary.astype(np.uint16) @ _BITS
+        return cls(np.ascontiguousarray(matrix[:, :2], dtype=np.float32), flags)
+
+    @classmethod
+    def from_columns(
+        cls, numeric: np.ndarray, binary: Sequence[np.ndarray]
+    ) -> "PackedRows":
+        """Pack tenure/MonthlyCharges and the nine binary columns, in order."""
+        flags = np.zeros(len(numeric), dtype=np.uint16)
+        for column, bit in zip(binary, _BITS, strict=True):
+            flags |= column.astype(np.uint16) * bit
+        return cls(np.asarray(numeric, dtype=np.float32), flags)
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    @property
+    def nbytes(self) -> int:
+        return self.numeric.nbytes + self.flags.nbytes
+
+
+@dataclass(frozen=True)
+class FoldedModel:
+    """Logistic regression with the StandardScaler folded into its weights.
+
+    ``coef @ ((x - mean) / scale) + intercept`` is rewritten once as
+    ``weights @ x + bias``, so scoring is a single dot product and a sigmoid.
+    Models trained on a subset of ``FEATURE_ORDER`` get a zero weight for
+    the features they do not use, so every model scores the same rows.
+
+    ``mean`` keeps the scaler's means for ``contributions``; it is None for
+    weights exported before it was saved.
+    """
+
+    weights: np.ndarray
+    bias: float
+    mean: np.ndarray | None = None
+
+    @classmethod
+    def from_bundle(cls, model, scaler) -> "FoldedModel":
+        folded = model.coef_[0] / scaler.scale_
+        bias = float(model.intercept_[0] - folded @ scaler.mean_)
+        features = getattr(scaler, "feature_names_in_", FEATURE_ORDER)
+        unknown = set(features) - set(FEATURE_ORDER)
+        if unknown:
+            raise ValueError(f"Model uses unknown features: {sorted(unknown)}")
+        columns = [FEATURE_ORDER.index(feature) for feature in features]
+        weights = np.zeros(len(FEATURE_ORDER))
+        weights[columns] = folded
+        mean = np.zeros(len(FEATURE_ORDER))
+        mean[columns] = scaler.mean_
+        return cls(weights=weights, bias=bias, mean=mean)
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        """Churn probability for a feature vector or an (n, 11) matrix."""
+        return _sigmoid(x @ self.weights + self.bias)
+
+    @property
+    def intercept(self) -> float:
+        """The logit of a customer at the training means, before scaling."""
+        return self.bias + float(self.weights @ self._mean())
+
+    def contributions(self, x: np.ndarray) -> np.ndarray:
+        """Each feature's term of the logit, ``coef * (x - mean) / scale``.
+
+        One elementwise product over a feature vector or an (n, 11) matrix.
+        A row's terms plus ``intercept`` add up to its logit.
+        """
+        terms = x - self._mean()
+        terms *= self.weights  # in place; the matrix is the cost here
+        return terms
+
+    def _mean(self) -> np.ndarray:
+        if self.mean is None:
+            raise ValueError(
+                "These folded weights were exported without feature means;"
+                " export them again to explain predictions"
+            )
+        return self.mean
+
+    @cached_property
+    def float32(self) -> "Float32Model":
+        return Float32Model.from_folded(self)
+
+    @cached_property
+    def lookup_table(self):
+        """The model's ``lookup_table.LookupTable``, built on first use."""
+        from lookup_table import LookupTable
+
+        return LookupTable.build(self)
+
+    def save(self, path: str, source_sha256: str = "") -> None:
+        extra = {} if self.mean is None else {"mean": self.mean}
+        np.savez(
+            path,
+            weights=self.weights,
+            bias=np.float64(self.bias),
+            source_sha256=np.str_(source_sha256),
+            **extra,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> tuple["FoldedModel", str]:
+        """Load folded weights and the hash of the bundle they came from."""
+        with np.load(path) as data:
+            mean = data["mean"] if "mean" in data.files else None
+            scorer = cls(weights=data["weights"], bias=float(data["bias"]), mean=mean)
+            return scorer, str(data["source_sha256"])
+
+
+@dataclass(frozen=True)
+class Float32Model:
+    """A FoldedModel in single precision, for bandwidth-bound bulk scoring.
+
+    ``binary_logits`` holds the summed weights of every combination of the
+    binary features, indexed by ``PackedRows.flags``, so packed rows are
+    scored with two multiplies and one lookup.
+    """
+
+    weights: np.ndarray
+    bias: np.float32
+    binary_logits: np.ndarray
+
+    @classmethod
+    def from_folded(cls, folded: FoldedModel) -> "Float32Model":
+        combinations = np.arange(1 << len(BINARY_FEATURES))[:, np.newaxis]
+        bits = (combinations & _BITS) != 0
+        return cls(
+            weights=folded.weights.astype(np.float32),
+            bias=np.float32(folded.bias),
+            # Summed in float64, then rounded once
+            binary_logits=(bits @ folded.weights[2:]).astype(np.float32),
+        )
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        """Churn probability for float32 rows in ``FEATURE_ORDER``."""
+        return _sigmoid32(np.asarray(x, dtype=np.float32) @ self.weights + self.bias)
+
+    def predict_packed(self, rows: PackedRows) -> np.ndarray:
+        z = rows.numeric @ self.weights[:2]
+        z += self.binary_logits[rows.flags]
+        z += self.bias
+        return _sigmoid32(z)
+
+
+# "numpy" scores with the folded model, "float32" with its single-precision
+# copy, "sklearn" goes through SCALER and MODEL
+ENGINE = os.environ.get("PREDICTION_ENGINE", "numpy")
+if ENGINE not in ENGINES:
+    raise ValueError(f"Unknown PREDICTION_ENGINE {ENGINE!r}, expected one of {ENGINES}")
+
+_LOCK = threading.RLock()
+_BUNDLE: dict | None = None
+_SCORER: FoldedModel | None = None
+_MODEL_VERSION = ""
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_bundle() -> dict:
+    """Return the joblib bundle, unpickling it on first use."""
+    global _BUNDLE
+    if _BUNDLE is None:
+        with _LOCK:
+            if _BUNDLE is None:
+                import joblib
+
+                _BUNDLE = joblib.load(MODEL_PATH)
+    return _BUNDLE
+
+
+def get_scorer() -> FoldedModel:
+    """Return the folded scorer, loading it on first use.
+
+    A fresh ``FOLDED_MODEL_PATH`` artifact is preferred because it loads
+    without sklearn; it is ignored when it was exported from a different
+    bundle than the one at ``MODEL_PATH``.
+    """
+    global _SCORER
+    if _SCORER is None:
+        with _LOCK:
+            if _SCORER is None:
+                _SCORER = _load_scorer()
+    return _SCORER
+
+
+def _load_scorer() -> FoldedModel:
+    start = time.perf_counter()
+    try:
+        return _read_scorer()
+    finally:
+        metrics.MODEL_LOAD_SECONDS.set(time.perf_counter() - start)
+
+
+def _read_scorer() -> FoldedModel:
+    global _MODEL_VERSION
+    version = _file_sha256(MODEL_PATH) if os.path.exists(MODEL_PATH) else ""
+    if os.path.exists(FOLDED_MODEL_PATH):
+        scorer, source = FoldedModel.load(FOLDED_MODEL_PATH)
+        if not version or version == source:
+            _MODEL_VERSION = source
+            return scorer
+    bundle = load_bundle()
+    _MODEL_VERSION = version
+    return FoldedModel.from_bundle(bundle["model"], bundle["scaler"])
+
+
+def model_version() -> str:
+    """Hash of the model bundle currently being served."""
+    get_scorer()
+    return _MODEL_VERSION
+
+
+def reload_model() -> bool:
+    """Reload the model if the bundle at MODEL_PATH changed since it was loaded.
+
+    Returns True when a new model was loaded.
+    """
+    global _BUNDLE, _SCORER
+    with _LOCK:
+        if _SCORER is not None and _file_sha256(MODEL_PATH) == _MODEL_VERSION:
+            return False
+        _BUNDLE = None
+        _SCORER = _load_scorer()
+        return True
+
+
+def save_folded_model(path: str = FOLDED_MODEL_PATH) -> str:
+    """Export the folded weights of the bundle at MODEL_PATH to ``path``."""
+    bundle = load_bundle()
+    scorer = FoldedModel.from_bundle(bundle["model"], bundle["scaler"])
+    scorer.save(path, source_sha256=_file_sha256(MODEL_PATH))
+    return path
+
+
+def warm_up(background: bool = True) -> threading.Thread | None:
+    """Load whatever the configured engine needs ahead of the first request."""
+
+    def _load() -> None:
+        if ENGINE == "sklearn":
+            import pandas  # noqa: F401
+
+            load_bundle()
+        get_scorer()
+
+    if not background:
+        _load()
+        return None
+    thread = threading.Thread(target=_load, name="model-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name: str):
+    # Keep BUNDLE/MODEL/SCALER/SCORER importable without loading them eagerly
+    if name == "BUNDLE":
+        return load_bundle()
+    if name in ("MODEL", "SCALER"):
+        return load_bundle()[name.lower()]
+    if name == "SCORER":
+        return get_scorer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _sklearn_proba(matrix: np.ndarray) -> np.ndarray:
+    import pandas as pd
+
+    bundle = load_bundle()
+    df = pd.DataFrame(matrix, columns=FEATURE_ORDER)
+
+    # Scale features and predict probability of the positive class
+    start = time.perf_counter()
+    scaled = bundle["scaler"].transform(df)
+    scaled_at = time.perf_counter()
+    probs = bundle["model"].predict_proba(scaled)[:, 1]
+    metrics.SCALE.observe(scaled_at - start)
+    metrics.PREDICT_PROBA.observe(time.perf_counter() - scaled_at)
+    return probs
+
+
+def _fast_proba(x: np.ndarray | PackedRows, scorer: FoldedModel | None) -> np.ndarray:
+    scorer = scorer or get_scorer()
+    start = time.perf_counter()
+    if isinstance(x, PackedRows):
+        probs = scorer.float32.predict_packed(x)
+    elif ENGINE == "float32":
+        probs = scorer.float32.predict_proba(x)
+    else:
+        probs = scorer.predict_proba(x)
+    metrics.SCORE.observe(time.perf_counter() - start)
+    return probs
 
 
 def make_prediction(**kwargs: float) -> float:
     """Make a churn prediction given the input features."""
 
     try:
-        # Ensure all features exist
-        _ = [kwargs[feature] for feature in FEATURE_ORDER]
+        row = np.array([kwargs[feature] for feature in FEATURE_ORDER], dtype=np.float64)
     except KeyError as e:
         raise ValueError(f"Missing feature: {e.args[0]}") from e
 
-    # Build DataFrame from a typed dict instead of a list
-    row = {feature: kwargs[feature] for feature in FEATURE_ORDER}
-    df = pd.DataFrame([row])
+    return make_prediction_row(row)
+
+
+def make_prediction_row(row: np.ndarray, scorer: FoldedModel | None = None) -> float:
+    """Make a churn prediction for one float64 row already in FEATURE_ORDER.
 
-    # Scale features
-    scaled = SCALER.transform(df)
+    Passing a ``scorer``, e.g. a model from the registry, scores with it
+    instead of the default model.
+    """
 
-    # Predict probability
-    prob = float(MODEL.predict_proba(scaled)[0, 1])
+    if ENGINE == "sklearn" and scorer is None:
+        prob = float(_sklearn_proba(row[np.newaxis])[0])
+    else:
+        prob = float(_fast_proba(row, scorer))
 
-    print(f"Churn probability: {prob:.4f}")
+    if sampled():
+        log_event(
+            "prediction",
+            engine=ENGINE,
+            churn_probability=prob,
+            features=dict(zip(FEATURE_ORDER, row.tolist(), strict=True)),
+        )
     return prob
+
+
+def make_prediction_batch(
+    rows: np.ndarray | PackedRows | Sequence[Mapping[str, float]],
+    scorer: FoldedModel | None = None,
+) -> np.ndarray:
+    """Make churn predictions for many customers in one vectorized call.
+
+    ``rows`` is either a 2-D array whose columns follow ``FEATURE_ORDER`` or a
+    list of records keyed by the ``FEATURE_ORDER`` names. Returns a 1-D array
+    with one churn probability per row. ``scorer`` works as in
+    ``make_prediction_row``. ``PackedRows`` are always scored in float32.
+    """
+
+    if len(rows) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    if isinstance(rows, PackedRows):
+        matrix = rows
+    elif isinstance(rows[0], Mapping):
+        try:
+            matrix = np.array(
+                [[row[feature] for feature in FEATURE_ORDER] for row in rows],
+                dtype=np.float64,
+            )
+        except KeyError as e:
+            raise ValueError(f"Missing feature: {e.args[0]}") from e
+    else:
+        dtype = np.float32 if ENGINE == "float32" else np.float64
+        matrix = np.asarray(rows, dtype=dtype)
+        if matrix.ndim != 2 or matrix.shape[1] != len(FEATURE_ORDER):
+            raise ValueError(
+                f"Expected an (n, {len(FEATURE_ORDER)}) array, got {matrix.shape}"
+            )
+
+    if ENGINE == "sklearn" and scorer is None and not isinstance(matrix, PackedRows):
+        probs = _sklearn_proba(matrix)
+    else:
+        probs = _fast_proba(matrix, scorer)
+
+    if sampled():
+        log_event(
+            "batch_prediction",
+            engine=ENGINE,
+            rows=len(probs),
+            mean_churn_probability=float(probs.mean()),
+        )
+    return probs
@@ -0,0 +1,102 @@
+"""
+Opt-in in-process cache of churn predictions.
+
+Repeated customers (the Streamlit sliders, CRM re-queries) map to the same
+encoded feature row, so their probability is served from a bounded LRU
+instead of being recomputed. The cache empties itself whenever a different
+model version is loaded.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+import numpy as np
+
+import prediction
+
+
+class PredictionCache:
+    """Thread-safe LRU of churn probabilities keyed on quantized encoded rows."""
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        decimals: int = 6,
+        version: Callable[[], str] = prediction.model_version,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self._version = version
+        self._current_version = ""
+        self._entries: OrderedDict[tuple[float, ...], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(
+        cls, version: Callable[[], str] = prediction.model_version
+    ) -> "PredictionCache | None":
+        """Build the cache from PREDICTION_CACHE_SIZE, None when it is unset or 0."""
+        maxsize = int(os.environ.get("PREDICTION_CACHE_SIZE", "0"))
+        if maxsize <= 0:
+            return None
+        decimals = int(os.environ.get("PREDICTION_CACHE_DECIMALS", "6"))
+        return cls(maxsize=maxsize, decimals=decimals, version=version)
+
+    def key(self, row: np.ndarray) -> tuple[float, ...]:
+        return tuple(np.round(row, self.decimals).tolist())
+
+    def get_or_compute(
+        self, row: np.ndarray, compute: Callable[[np.ndarray], float]
+    ) -> float:
+        """Return the cached probability for ``row`` or compute and store it."""
+        key = self.key(row)
+        version = self._version()
+
+        with self._lock:
+            if version != self._current_version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._current_version = version
+            prob = self._entries.get(key)
+            if prob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return prob
+            self.misses += 1
+
+        # Score outside the lock so a slow model call never serializes requests
+        prob = compute(row)
+
+        with self._lock:
+            if version == self._current_version:
+                self._entries[key] = prob
+                self._entries.move_to_end(key)
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return prob
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int | str]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "model_version": self._current_version,
+            }
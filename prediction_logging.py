@@ -0,0 +1,154 @@
+"""
+Structured, sampled logging for the prediction hot path.
+
+Scoring threads only decide whether a prediction is sampled and, if so, drop
+a LogRecord on an in-memory queue. A QueueListener thread formats the
+records as JSON lines and does the actual I/O, so a slow stdout or log
+collector never blocks a request. When the queue is full, records are
+dropped and counted instead of waiting.
+
+Under the Azure Functions host, records instead propagate to the root
+logger, whose host handler forwards them to Application Insights.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO
+
+LOGGER_NAME = "telco.prediction"
+
+logger = logging.getLogger(LOGGER_NAME)
+
+_sample_rate = float(os.environ.get("PREDICTION_LOG_SAMPLE_RATE", "0.01"))
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the record's ``fields`` merged in."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["traceback"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread, not here
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonMessageFilter(logging.Filter):
+    """Replace a record's message with its JSON line, for handlers we don't own."""
+
+    formatter = JsonFormatter()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = self.formatter.format(record)
+        record.args = ()
+        return True
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Block rather than fail when stopping with a full queue; the
+        # listener thread is still draining it
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(
+    sample_rate: float | None = None,
+    stream: IO[str] | None = None,
+    max_queue: int = 10_000,
+    propagate: bool = False,
+) -> QueueListener | None:
+    """Route prediction logs through a background queue listener.
+
+    With ``propagate``, records go to the root logger's handlers instead, as
+    JSON lines, and no listener is started. Calling it again replaces the
+    previous configuration.
+    """
+    global _listener, _sample_rate
+    shutdown_logging()
+    if sample_rate is not None:
+        _sample_rate = sample_rate
+    logger.setLevel(logging.INFO)
+    logger.propagate = propagate
+    if propagate:
+        logger.addFilter(JsonMessageFilter())
+        return None
+
+    log_queue: queue.Queue = queue.Queue(maxsize=max_queue)
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter())
+    _listener = _Listener(log_queue, output)
+    _listener.start()
+
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and detach the queue handler."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in list(logger.handlers):
+        if isinstance(handler, DroppingQueueHandler):
+            logger.removeHandler(handler)
+    for log_filter in list(logger.filters):
+        if isinstance(log_filter, JsonMessageFilter):
+            logger.removeFilter(log_filter)
+
+
+atexit.register(shutdown_logging)
+
+
+def dropped_records() -> int:
+    return sum(
+        handler.dropped
+        for handler in logger.handlers
+        if isinstance(handler, DroppingQueueHandler)
+    )
+
+
+def sampled() -> bool:
+    """Whether the current prediction should be logged."""
+    return _sample_rate >= 1.0 or random.random() < _sample_rate
+
+
+def log_event(event: str, **fields) -> None:
+    """Log one structured record.
+
+    Hot paths should check ``sampled()`` first so unsampled calls skip
+    building the fields altogether.
+    """
+    if logger.isEnabledFor(logging.INFO):
+        fields["sample_rate"] = _sample_rate
+        logger.info(event, extra={"fields": fields})
@@ -0,0 +1,150 @@
+"""
+Top-K ranking of the customers most likely to churn.
+
+A population is streamed through the batch scorer a chunk at a time, as in
+``batch_scoring``, and each chunk keeps only its ``k`` highest scores, found
+with ``np.argpartition`` in linear time rather than by sorting. With several
+workers each one returns just those partial results. The parent merges them
+into a running top ``k`` as they arrive, so memory grows with ``k`` and the
+chunk size, never with the number of rows.
+
+Ties at the cut-off are broken arbitrarily; the final ``k`` are returned
+sorted by descending probability. Rows that score NaN come last.
+"""
+
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import BinaryIO
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import ID_COLUMN, _in_order, parse_block, read_blocks, read_chunks
+from encoding import TELCO_COLUMNS, encode_telco_columns
+from feature_store import FeatureStore
+from prediction import FoldedModel, make_prediction_batch
+
+DEFAULT_K = 100
+
+
+@dataclass(frozen=True)
+class Ranking:
+    """The ``k`` highest-risk customers, highest first, out of ``rows``."""
+
+    customer_ids: np.ndarray
+    probabilities: np.ndarray
+    rows: int
+    chunks: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def records(self) -> list[dict]:
+        return [
+            {ID_COLUMN: customer, "churn_probability": prob}
+            for customer, prob in zip(
+                self.customer_ids.tolist(), self.probabilities.tolist(), strict=True
+            )
+        ]
+
+
+def top_k(ids: np.ndarray, probs: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """The ``k`` highest probabilities and their ids, in no particular order.
+
+    NaN probabilities, from rows with a blank tenure or charge, rank below
+    every real score; ``np.argpartition`` alone would put them on top.
+    """
+    if len(probs) <= k:
+        return ids, probs
+    scores = np.where(np.isnan(probs), -np.inf, probs)
+    keep = np.argpartition(scores, len(probs) - k)[len(probs) - k :]
+    return ids[keep], probs[keep]
+
+
+def merge(
+    partials: Iterable[tuple[int, np.ndarray, np.ndarray]], k: int
+) -> tuple[int, int, np.ndarray, np.ndarray]:
+    """Fold ``(rows, ids, probs)`` partial results into one running top ``k``.
+
+    Returns the row and chunk counts and the top ``k``, sorted highest first.
+    """
+    rows = chunks = 0
+    best_ids, best_probs = np.empty(0, dtype=object), np.empty(0)
+    for count, ids, probs in partials:
+        best_ids, best_probs = top_k(
+            np.concatenate([best_ids, ids]), np.concatenate([best_probs, probs]), k
+        )
+        rows += count
+        chunks += 1
+    order = np.argsort(-best_probs, kind="stable")
+    return rows, chunks, best_ids[order], best_probs[order]
+
+
+def _check_k(k: int) -> None:
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+
+
+def _rank_chunk(
+    chunk: pd.DataFrame | str, k: int, scorer: FoldedModel | None = None
+) -> tuple[int, np.ndarray, np.ndarray]:
+    """Score a chunk, or a raw CSV block, and keep its top ``k``."""
+    if isinstance(chunk, str):
+        chunk = parse_block(chunk)
+    features = encode_telco_columns(*(chunk[column] for column in TELCO_COLUMNS))
+    probs = make_prediction_batch(features, scorer)
+    ids, probs = top_k(chunk[ID_COLUMN].to_numpy(dtype=object), probs, k)
+    return len(chunk), ids, probs
+
+
+def _rank_store_range(
+    store: FeatureStore, start: int, stop: int, k: int, scorer: FoldedModel | None
+) -> tuple[int, np.ndarray, np.ndarray]:
+    probs = make_prediction_batch(store.select(rows=slice(start, stop)), scorer)
+    ids = np.array(store.customer_ids(start, stop), dtype=object)
+    return stop - start, *top_k(ids, probs, k)
+
+
+def _ranking(partials: Iterator[tuple[int, np.ndarray, np.ndarray]], k: int) -> Ranking:
+    # ``partials`` is lazy, so the timing covers reading and scoring as well
+    start = time.perf_counter()
+    rows, chunks, ids, probs = merge(partials, k)
+    return Ranking(ids, probs, rows, chunks, time.perf_counter() - start)
+
+
+def rank_csv(
+    source: str | BinaryIO,
+    k: int = DEFAULT_K,
+    chunksize: int = 100_000,
+    workers: int = 1,
+    scorer: FoldedModel | None = None,
+) -> Ranking:
+    """The ``k`` customers of a raw Telco CSV most likely to churn.
+
+    ``source`` is a path or, with one worker, an open binary file such as
+    an upload.
+    """
+    _check_k(k)
+    if workers <= 1:
+        chunks = read_chunks(source, chunksize)
+    else:
+        chunks = read_blocks(source, chunksize)
+    tasks = ((chunk, k, scorer) for chunk in chunks)
+    return _ranking(_in_order(tasks, _rank_chunk, workers), k)
+
+
+def rank_store(
+    store_path: str,
+    k: int = DEFAULT_K,
+    chunksize: int = 100_000,
+    workers: int = 1,
+    scorer: FoldedModel | None = None,
+) -> Ranking:
+    """The ``k`` customers of a feature store most likely to churn."""
+    _check_k(k)
+    store = FeatureStore(store_path)
+    tasks = ((store, a, b, k, scorer) for a, b in store.chunks(chunksize))
+    return _ranking(_in_order(tasks, _rank_store_range, workers), k)
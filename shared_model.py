@@ -0,0 +1,194 @@
+"""
+Folded model weights in shared memory, for multi-process serving.
+
+A supervisor loads the model once and publishes its folded weights, feature
+means and bias into a ``multiprocessing.shared_memory`` segment. A small
+pointer file names the current segment and the bundle hash it came from.
+Worker processes map the segment and score with NumPy views over it, so they
+neither copy the weights nor import joblib, pandas or sklearn.
+
+A reload writes a new segment, then swaps the pointer file with
+``os.replace``. Workers polling the pointer see either the old segment or the
+new one, never a half-written model. The old segment is unlinked straight
+away; workers still holding it keep a valid mapping until they let it go.
+"""
+
+import json
+import os
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from prediction import FEATURE_ORDER, FoldedModel
+from prediction_logging import log_event
+
+# Weights and feature means in FEATURE_ORDER, then the bias; NaN means stand
+# for a scorer without them
+_N = len(FEATURE_ORDER)
+_VALUES = 2 * _N + 1
+
+
+class _Segment(shared_memory.SharedMemory):
+    def __del__(self):
+        # Scorers may outlive the segment object; their views keep the
+        # mapping alive and it is unmapped once the last one goes
+        with suppress(BufferError):
+            self.close()
+
+
+def _view(shm: shared_memory.SharedMemory) -> np.ndarray:
+    # frombuffer holds an export on the mapping, so closing the segment
+    # raises BufferError instead of unmapping memory a scorer still reads
+    return np.frombuffer(shm.buf, dtype=np.float64, count=_VALUES)
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    # os.replace gives the pointer a new inode even within one mtime tick
+    stat = path.stat()
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class SharedModelPublisher:
+    """Owns the segments and the pointer file; used by the supervisor."""
+
+    def __init__(self, pointer: str):
+        self.pointer = Path(pointer)
+        self.generation = 0
+        self._segment: shared_memory.SharedMemory | None = None
+
+    def publish(self, scorer: FoldedModel, sha256: str) -> str:
+        """Copy ``scorer`` into a new segment and point workers at it."""
+        self.generation += 1
+        name = f"telco_{os.getpid()}_{self.generation}"
+        shm = shared_memory.SharedMemory(name, create=True, size=_VALUES * 8)
+        values = _view(shm)
+        values[:_N] = scorer.weights
+        values[_N:-1] = np.nan if scorer.mean is None else scorer.mean
+        values[-1] = scorer.bias
+        del values
+
+        tmp = self.pointer.with_name(self.pointer.name + ".tmp")
+        tmp.write_text(json.dumps({"segment": shm.name, "sha256": sha256}))
+        os.replace(tmp, self.pointer)
+
+        previous, self._segment = self._segment, shm
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+        log_event("shared_model_published", segment=shm.name, version=sha256)
+        return shm.name
+
+    def close(self) -> None:
+        """Unlink the current segment and remove the pointer."""
+        self.pointer.unlink(missing_ok=True)
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+
+@dataclass(frozen=True)
+class SharedVersion:
+    segment: str
+    sha256: str
+    scorer: FoldedModel
+    stamp: tuple[int, int]
+
+
+class SharedModel:
+    """A worker's zero-copy view of the published model."""
+
+    def __init__(self, pointer: str):
+        self.pointer = Path(pointer)
+        self.reloads = 0
+        self._current: SharedVersion | None = None
+        self._attached: dict[str, _Segment] = {}
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+        self.refresh()
+
+    @classmethod
+    def from_env(cls) -> "SharedModel | None":
+        """Attach to SHARED_MODEL_POINTER, None when it is unset."""
+        pointer = os.environ.get("SHARED_MODEL_POINTER")
+        if not pointer:
+            return None
+        return cls(pointer)
+
+    @property
+    def scorer(self) -> FoldedModel:
+        return self._current.scorer
+
+    @property
+    def sha256(self) -> str:
+        return self._current.sha256
+
+    def refresh(self) -> bool:
+        """Attach to a newly published segment; True when the model changed."""
+        while True:
+            stamp = _stamp(self.pointer)
+            if self._current is not None and self._current.stamp == stamp:
+                return False
+            published = json.loads(self.pointer.read_text())
+            try:
+                # Workers started by multiprocessing share the supervisor's
+                # resource tracker, so attaching never unlinks on exit
+                shm = _Segment(published["segment"])
+            except FileNotFoundError:
+                # Replaced and unlinked since we read the pointer; read it again
+                continue
+            break
+
+        values = _view(shm)
+        mean = values[_N:-1]
+        scorer = FoldedModel(
+            weights=values[:_N],
+            bias=float(values[-1]),
+            mean=None if np.isnan(mean).any() else mean,
+        )
+        self._current = SharedVersion(
+            published["segment"], published["sha256"], scorer, stamp
+        )
+        self._attached[shm.name] = shm
+        self.reloads += 1
+        self._release()
+        return True
+
+    def _release(self) -> None:
+        # A segment can only be closed once no scorer still views it
+        for name, shm in list(self._attached.items()):
+            if name == self._current.segment:
+                continue
+            try:
+                shm.close()
+            except BufferError:
+                continue
+            del self._attached[name]
+
+    def start(self, interval: float = 2.0) -> threading.Thread:
+        """Poll the pointer every ``interval`` seconds."""
+        if self._watcher is None:
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="shared-model", daemon=True
+            )
+            self._watcher.start()
+        return self._watcher
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except (OSError, ValueError, KeyError) as e:
+                # A missing or half-written pointer; the next poll retries
+                log_event("shared_model_refresh_failed", error=str(e))
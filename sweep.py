@@ -0,0 +1,94 @@
+"""
+What-if sensitivity sweeps over one base customer.
+
+A sweep varies some of the request fields over lists of values and scores
+every combination. The folded logit is a sum of one term per field, so the
+grid is never materialized as an (n, 11) matrix: each varied field's values
+are encoded and multiplied by their weights once, giving a short vector of
+logit terms, and the vectors are broadcast-added into a grid with one axis
+per field. Scoring a million cells then costs a million additions and one
+sigmoid, and agrees with scoring the full matrix to within ``1e-12``.
+"""
+
+import math
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from encoding import (
+    CONTRACT_COLUMNS,
+    CONTRACT_MONTH_BOUNDS,
+    CONTRACT_ONEHOT,
+    INTERNET_COLUMNS,
+    INTERNET_ONEHOT,
+    PAYMENT_COLUMNS,
+    PAYMENT_ONEHOT,
+    encode_row,
+    internet_code,
+    payment_code,
+)
+from prediction import FoldedModel, _sigmoid
+
+# Fields a sweep may vary, in the order of the grid's axes
+SWEEP_DIMENSIONS = (
+    "tenure",
+    "monthly",
+    "contract_months",
+    "internet_service",
+    "payment_method",
+)
+
+MAX_CELLS = 1_000_000
+# Values per categorical axis; each field has only a handful of categories
+MAX_CHOICES = 100
+
+
+def axis_logits(dimension: str, values: Sequence, weights: np.ndarray) -> np.ndarray:
+    """Each value's contribution to the logit when ``dimension`` takes it."""
+    if dimension == "tenure":
+        return np.asarray(values, dtype=np.float64) * weights[0]
+    if dimension == "monthly":
+        return np.asarray(values, dtype=np.float64) * weights[1]
+    if dimension == "contract_months":
+        codes = np.searchsorted(CONTRACT_MONTH_BOUNDS, values, side="left")
+        return CONTRACT_ONEHOT[codes] @ weights[CONTRACT_COLUMNS]
+    if dimension == "internet_service":
+        codes = [internet_code(value) for value in values]
+        return INTERNET_ONEHOT[codes] @ weights[INTERNET_COLUMNS]
+    if dimension == "payment_method":
+        codes = [payment_code(value) for value in values]
+        return PAYMENT_ONEHOT[codes] @ weights[PAYMENT_COLUMNS]
+    raise ValueError(f"Cannot sweep {dimension!r}, expected one of {SWEEP_DIMENSIONS}")
+
+
+def sweep(
+    base: Mapping, axes: Mapping[str, Sequence], scorer: FoldedModel
+) -> np.ndarray:
+    """Churn probability for every combination of the ``axes`` values.
+
+    ``base`` holds the ``encode_row`` fields of the customer; the fields in
+    ``axes`` replace them. The result has one axis per swept field, in
+    ``SWEEP_DIMENSIONS`` order, e.g. shape (73, 3) for tenure x contract.
+    """
+    unknown = set(axes) - set(SWEEP_DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Cannot sweep {sorted(unknown)}, expected {SWEEP_DIMENSIONS}")
+    dimensions = [dimension for dimension in SWEEP_DIMENSIONS if dimension in axes]
+    shape = tuple(len(axes[dimension]) for dimension in dimensions)
+    cells = math.prod(shape)
+    if cells > MAX_CELLS:
+        raise ValueError(f"Sweep of {cells:,} cells exceeds the {MAX_CELLS:,} limit")
+
+    weights = scorer.weights
+    z = encode_row(**base) @ weights + scorer.bias
+    terms = []
+    for i, dimension in enumerate(dimensions):
+        # Swap the base customer's own term for the swept values
+        logits = axis_logits(dimension, axes[dimension], weights)
+        logits = logits - axis_logits(dimension, [base[dimension]], weights)[0]
+        terms.append(logits.reshape([-1 if j == i else 1 for j in range(len(shape))]))
+
+    grid = np.full(shape, z)
+    for term in terms:
+        grid += term
+    return _sigmoid(grid)
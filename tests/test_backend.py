@@ -0,0 +1,32 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app, cache_stats
+
+
+def make_request(**overrides):
+    fields = {
+        "tenure": 10,
+        "monthly": 70.5,
+        "techsupport": 1,
+        "paperless": 1,
+        "contract_months": 24,
+        "internet_service": "Fiber optic",
+        "payment_method": "Electronic check",
+    }
+    fields.update(overrides)
+    return fields
+
+
+def test_predict_batch_matches_predict():
+    client = TestClient(app)
+    rows = [make_request(), make_request(tenure=60, contract_months=1)]
+
+    result = client.post("/predict/batch", json=rows).json()
+
+    assert len(result["churn_probabilities"]) == 2
+    single = client.post("/predict", json=rows[0]).json()["churn_probability"]
+    assert abs(result["churn_probabilities"][0] - single) < 1e-12
+
+
+def test_cache_stats_reports_disabled_by_default():
+    assert cache_stats() == {"enabled": False}
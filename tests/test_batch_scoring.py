@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+import prediction
+from batch_scoring import score_csv
+
+DATA_PATH = "input/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+def notebook_probabilities() -> np.ndarray:
+    """Score the CSV through the notebook's get_dummies preprocessing."""
+    df = pd.read_csv(DATA_PATH).drop(columns=["customerID", "Churn"])
+    for col in df.select_dtypes(include="object"):
+        df[col] = df[col].str.lower().str.strip()
+    features = pd.get_dummies(df, drop_first=True, dtype=int)[prediction.FEATURE_ORDER]
+    scaled = prediction.SCALER.transform(features)
+    return prediction.MODEL.predict_proba(scaled)[:, 1]
+
+
+def test_score_csv_matches_notebook_preprocessing(tmp_path):
+    output = tmp_path / "scores.csv"
+
+    report = score_csv(DATA_PATH, str(output), chunksize=1_000)
+
+    scores = pd.read_csv(output)
+    assert report.rows == len(scores) == 7043
+    assert report.chunks == 8
+    assert list(scores["customerID"]) == list(pd.read_csv(DATA_PATH)["customerID"])
+    assert np.allclose(scores["churn_probability"], notebook_probabilities())
+
+
+def test_score_csv_workers_keep_row_order(tmp_path):
+    serial, parallel = tmp_path / "serial.csv", tmp_path / "parallel.csv"
+
+    score_csv(DATA_PATH, str(serial), chunksize=500)
+    score_csv(DATA_PATH, str(parallel), chunksize=500, workers=2)
+
+    assert serial.read_text() == parallel.read_text()
@@ -0,0 +1,50 @@
+import time
+
+from benchmarks.suite import flatten, measure, regressions
+
+BASELINE = {
+    "meta": {"calibration_us": 100.0},
+    "micro": {"encode_row": {"us": 2.0}},
+    "load": {"uvicorn": {"throughput": 500.0, "p99_ms": 20.0, "rss_mb": 60.0}},
+}
+
+
+def results(calibration: float, us: float, throughput: float, p99: float, rss: float):
+    return {
+        "meta": {"calibration_us": calibration},
+        "micro": {"encode_row": {"us": us}},
+        "load": {"uvicorn": {"throughput": throughput, "p99_ms": p99, "rss_mb": rss}},
+    }
+
+
+def test_flatten_skips_meta_and_counts():
+    flat = flatten({**BASELINE, "load": {"uvicorn": {"requests": 10, "p50_ms": 1}}})
+
+    assert flat == {"micro.encode_row.us": 2.0, "load.uvicorn.p50_ms": 1.0}
+
+
+def test_regressions_in_both_directions():
+    same = results(100.0, 2.2, 450.0, 21.0, 61.0)
+    worse = results(100.0, 3.0, 300.0, 20.0, 90.0)
+
+    assert regressions(same, BASELINE, 0.25) == []
+    assert [line.split(":")[0] for line in regressions(worse, BASELINE, 0.25)] == [
+        "micro.encode_row.us",
+        "load.uvicorn.throughput",
+        "load.uvicorn.rss_mb",
+    ]
+
+
+def test_regressions_allow_for_a_slower_machine():
+    # Twice as slow everywhere, memory unchanged
+    slower = results(200.0, 4.0, 250.0, 40.0, 60.0)
+
+    assert regressions(slower, BASELINE, 0.25) == []
+
+
+def test_measure_reports_percentiles():
+    result = measure(lambda: lambda: time.sleep(0.001), concurrency=2, n=10)
+
+    assert result["requests"] == 20
+    assert 1.0 <= result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+    assert result["throughput"] > 0
@@ -0,0 +1,103 @@
+import json
+import shutil
+
+import azure.functions as func
+import pandas as pd
+import pytest
+
+from batch_scoring import score_csv
+from blob_scoring import LocalStore, score_blob, score_jsonl, store_from_env
+from tests.test_wire_formats import CUSTOMER
+
+DATA_PATH = "input/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+@pytest.fixture
+def store(tmp_path) -> LocalStore:
+    (tmp_path / "incoming").mkdir()
+    shutil.copy(DATA_PATH, tmp_path / "incoming" / "telco.csv")
+    return LocalStore(tmp_path)
+
+
+def read_parts(store: LocalStore, prefix: str) -> pd.DataFrame:
+    parts = sorted(name for name in store.names(prefix) if "part-" in name)
+    return pd.concat(
+        (pd.read_csv(store.root / name) for name in parts), ignore_index=True
+    )
+
+
+def test_parts_match_score_csv(store, tmp_path):
+    report = score_blob(store, "incoming/telco.csv", chunksize=1000)
+    score_csv(DATA_PATH, str(tmp_path / "expected.csv"))
+
+    assert (report.rows, report.chunks, report.skipped) == (7043, 8, 0)
+    assert read_parts(store, "scored/telco.csv/").equals(
+        pd.read_csv(tmp_path / "expected.csv")
+    )
+    manifest = json.loads(store.read("scored/telco.csv/_SUCCESS"))
+    assert manifest == {"rows": 7043, "chunks": 8, "chunksize": 1000}
+
+
+def test_retry_only_scores_missing_chunks(store):
+    score_blob(store, "incoming/telco.csv", chunksize=1000)
+    first = read_parts(store, "scored/telco.csv/")
+    # As if the invocation had died before writing part 3 and the marker
+    (store.root / "scored/telco.csv/part-00003.csv").unlink()
+    (store.root / "scored/telco.csv/_SUCCESS").unlink()
+
+    retry = score_blob(store, "incoming/telco.csv", chunksize=1000)
+    done = score_blob(store, "incoming/telco.csv", chunksize=1000)
+
+    assert (retry.rows, retry.chunks, retry.skipped) == (1000, 1, 7)
+    assert read_parts(store, "scored/telco.csv/").equals(first)
+    assert (done.chunks, done.skipped) == (0, 8)
+
+
+def test_jsonl_reports_bad_lines(store):
+    lines = [
+        json.dumps({**CUSTOMER, "customerID": "0001"}),
+        "{not json",
+        "",
+        json.dumps({**CUSTOMER, "payment_method": "Cash"}),
+    ]
+    # Blank lines, here one in the middle and one at the end, are skipped
+    store.write("incoming/drop.jsonl", ("\n".join(lines) + "\n\n").encode())
+
+    score_blob(store, "incoming/drop.jsonl", chunksize=2)
+
+    results = [
+        json.loads(line)
+        for name in ("part-00000.jsonl", "part-00001.jsonl")
+        for line in store.read(f"scored/drop.jsonl/{name}").decode().splitlines()
+    ]
+    assert [result["row"] for result in results] == [0, 1, 3]
+    assert results[0]["customerID"] == "0001"
+    assert 0 < results[0]["churn_probability"] < 1
+    assert results[1]["churn_probability"] is None
+    assert list(results[2]["errors"]) == ["payment_method"]
+    assert score_jsonl(["\n", "  \n"], 0) == (0, "")
+
+
+def test_jsonl_line_with_two_objects_is_one_bad_row():
+    line = json.dumps(CUSTOMER)
+
+    count, body = score_jsonl([f"{line}, {line}\n", line + "\n"], 10)
+
+    results = [json.loads(row) for row in body.splitlines()]
+    assert count == 2
+    assert [result["row"] for result in results] == [10, 11]
+    assert results[0]["churn_probability"] is None
+    assert 0 < results[1]["churn_probability"] < 1
+
+
+def test_queue_trigger_scores_through_the_store(store, monkeypatch):
+    from function_app import score_queued_blob
+
+    monkeypatch.setenv("SCORING_STORE_DIR", str(store.root))
+    handler = score_queued_blob.build().get_user_function()
+    message = func.QueueMessage(body=json.dumps({"blob": "incoming/telco.csv"}))
+
+    handler(message)
+
+    assert store_from_env().exists("scored/telco.csv/_SUCCESS")
+    assert len(read_parts(store, "scored/telco.csv/")) == 7043
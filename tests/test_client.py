@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+import pytest
+import requests
+
+from frontend.client import AsyncChurnClient, ChurnClient
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """Scores tenure / 100 and fails the first ``failures`` requests."""
+
+    failures = 0
+    delay = 0.0
+    batch_sizes: ClassVar[list[int]] = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(StubAPI.delay)
+        if StubAPI.failures > 0:
+            StubAPI.failures -= 1
+            self.reply(503, {"detail": "busy"})
+        elif self.path == "/predict":
+            self.reply(200, {"churn_probability": body["tenure"] / 100})
+        elif self.path == "/predict/batch":
+            StubAPI.batch_sizes.append(len(body))
+            probs = [row["tenure"] / 100 for row in body]
+            self.reply(200, {"churn_probabilities": probs})
+        else:
+            self.reply(404, {"detail": "Not Found"})
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_url():
+    StubAPI.failures = 0
+    StubAPI.delay = 0.0
+    StubAPI.batch_sizes = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def customers(n):
+    return [{"tenure": tenure} for tenure in range(n)]
+
+
+def test_predict_many_chunks_into_batches(api_url):
+    with ChurnClient(api_url, batch_size=3) as client:
+        assert client.predict({"tenure": 42}) == 0.42
+        assert client.predict_many(customers(7)) == [t / 100 for t in range(7)]
+
+    assert StubAPI.batch_sizes == [3, 3, 1]
+
+
+def test_retries_overloaded_responses_then_raises(api_url):
+    StubAPI.failures = 2
+    with ChurnClient(api_url, retries=2, backoff=0) as client:
+        assert client.predict({"tenure": 5}) == 0.05
+
+    StubAPI.failures = 3
+    with (
+        ChurnClient(api_url, retries=2, backoff=0) as client,
+        pytest.raises(requests.HTTPError) as error,
+    ):
+        client.predict({"tenure": 5})
+    assert error.value.response.status_code == 503
+
+
+def test_slow_server_raises_timeout(api_url):
+    StubAPI.delay = 0.5
+
+    client = ChurnClient(api_url, timeout=(1.0, 0.05), retries=1, backoff=0)
+    with client, pytest.raises(requests.Timeout, match="did not respond in time"):
+        client.predict({"tenure": 5})
+
+
+def test_async_client_keeps_order(api_url):
+    async def run():
+        async with AsyncChurnClient(api_url, max_concurrency=4, batch_size=4) as client:
+            single = await client.predict_all(customers(20))
+            bulk = await client.predict_many(customers(10))
+        return single, bulk
+
+    single, bulk = asyncio.run(run())
+
+    assert single == [t / 100 for t in range(20)]
+    assert bulk == [t / 100 for t in range(10)]
+    assert sorted(StubAPI.batch_sizes) == [2, 4, 4]
@@ -0,0 +1,80 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.coalescer import CoalescerFull, MicroBatcher
+from benchmarks.data import synthetic_features
+from prediction import make_prediction_batch
+
+
+def test_concurrent_requests_are_scored_in_batches():
+    rows = synthetic_features(50)
+    batcher = MicroBatcher(max_batch=16, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(*(batcher.submit(row) for row in rows))
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+
+    np.testing.assert_allclose(results, make_prediction_batch(rows), atol=1e-12)
+    assert batcher.rows == 50
+    assert batcher.batches == 4
+
+
+def test_full_queue_is_rejected():
+    batcher = MicroBatcher(max_batch=8, max_wait_ms=50, max_queue=2)
+
+    async def run():
+        first = [asyncio.ensure_future(batcher.submit(np.zeros(11))) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(CoalescerFull):
+            await batcher.submit(np.zeros(11))
+        await asyncio.gather(*first)
+        await batcher.stop()
+
+    asyncio.run(run())
+
+
+def test_scoring_errors_reach_every_caller():
+    def broken(matrix):
+        raise ValueError("bad batch")
+
+    batcher = MicroBatcher(score_batch=broken, max_batch=4, max_wait_ms=1)
+
+    async def run():
+        results = await asyncio.gather(
+            batcher.submit(np.zeros(11)),
+            batcher.submit(np.zeros(11)),
+            return_exceptions=True,
+        )
+        await batcher.stop()
+        return results
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(run()))
+
+
+def test_batching_survives_a_scoring_bug():
+    calls = []
+
+    def flaky(matrix):
+        calls.append(len(matrix))
+        if len(calls) == 1:
+            raise TypeError("a bug")
+        return make_prediction_batch(matrix)
+
+    batcher = MicroBatcher(score_batch=flaky, max_batch=4, max_wait_ms=1)
+
+    async def run():
+        first = await asyncio.gather(
+            batcher.submit(np.zeros(11)), return_exceptions=True
+        )
+        second = await batcher.submit(np.zeros(11))
+        await batcher.stop()
+        return first[0], second
+
+    error, prob = asyncio.run(run())
+    assert isinstance(error, TypeError)
+    assert prob == make_prediction_batch(np.zeros((1, 11)))[0]
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from benchmarks.data import synthetic_requests
+from encoding import (
+    convert_contract,
+    convert_internet,
+    convert_payment,
+    encode_columns,
+    encode_row,
+)
+
+
+@pytest.mark.parametrize(
+    ("months", "expected"), [(0, (0, 0)), (1, (0, 0)), (12, (1, 0)), (24, (0, 1))]
+)
+def test_convert_contract(months, expected):
+    assert convert_contract(months) == expected
+
+
+def test_convert_categories_normalize_and_default_to_baseline():
+    assert convert_internet(" Fiber Optic ") == (1, 0)
+    assert convert_internet("DSL") == (0, 0)
+    assert convert_payment("Mailed check") == (0, 0, 1)
+    assert convert_payment("Bank transfer (automatic)") == (0, 0, 0)
+    assert convert_payment("typo") == (0, 0, 0)
+
+
+def test_encode_columns_matches_encode_row():
+    columns = synthetic_requests(200)
+
+    block = encode_columns(**columns)
+    rows = np.array([encode_row(*values) for values in zip(*columns.values())])
+
+    np.testing.assert_array_equal(block, rows)
@@ -0,0 +1,85 @@
+import json
+
+import joblib
+import numpy as np
+import pytest
+
+from backend.main import predict_batch_endpoint, predict_endpoint
+from benchmarks.data import synthetic_features
+from encoding import encode_row
+from prediction import FEATURE_ORDER, MODEL_PATH, FoldedModel, get_scorer
+from tests.test_wire_formats import CUSTOMER, call
+from wire_formats import BINARY
+
+
+def logit(p):
+    return np.log(p / (1 - p))
+
+
+def test_contributions_match_the_scaled_model():
+    bundle = joblib.load(MODEL_PATH)
+    scaler, coef = bundle["scaler"], bundle["model"].coef_[0]
+    rows = synthetic_features(1000)
+
+    scorer = get_scorer()
+    contributions = scorer.contributions(rows)
+
+    expected = (rows - scaler.mean_) / scaler.scale_ * coef
+    assert np.allclose(contributions, expected, atol=1e-12)
+    assert scorer.intercept == pytest.approx(bundle["model"].intercept_[0])
+    assert np.allclose(
+        contributions.sum(axis=1) + scorer.intercept,
+        logit(scorer.predict_proba(rows)),
+        atol=1e-9,
+    )
+
+
+def test_weights_without_means_cannot_explain(tmp_path):
+    scorer = get_scorer()
+    old = FoldedModel(weights=scorer.weights, bias=scorer.bias)
+    old.save(str(tmp_path / "old.npz"))
+
+    loaded, _ = FoldedModel.load(str(tmp_path / "old.npz"))
+
+    assert loaded.mean is None
+    with pytest.raises(ValueError, match="export them again"):
+        loaded.contributions(synthetic_features(1))
+
+
+def test_single_endpoint_explains_by_feature():
+    plain = json.loads(call(predict_endpoint, json.dumps(CUSTOMER).encode()))
+    body = json.loads(
+        call(predict_endpoint, json.dumps(CUSTOMER).encode(), explain=True)
+    )
+
+    contributions = body["contributions"]
+    assert list(contributions) == FEATURE_ORDER
+    assert body["churn_probability"] == pytest.approx(plain["churn_probability"])
+    assert sum(contributions.values()) + body["intercept"] == pytest.approx(
+        logit(body["churn_probability"])
+    )
+    row = encode_row(**CUSTOMER)
+    assert np.allclose(list(contributions.values()), get_scorer().contributions(row))
+
+
+def test_batch_explanations_in_json_and_binary():
+    rows = [CUSTOMER, {**CUSTOMER, "tenure": -1}, {**CUSTOMER, "tenure": 60}]
+    body = json.loads(
+        call(predict_batch_endpoint, json.dumps(rows).encode(), explain=True)
+    )
+
+    assert body["features"] == FEATURE_ORDER
+    assert body["churn_probabilities"][1] is None
+    assert body["contributions"][1] is None
+    assert [error["row"] for error in body["errors"]] == [1]
+    assert body["contributions"][0] == pytest.approx(
+        get_scorer().contributions(encode_row(**CUSTOMER)).tolist()
+    )
+
+    features = synthetic_features(50)
+    packed = call(
+        predict_batch_endpoint, features.tobytes(), BINARY, BINARY, explain=True
+    )
+    out = np.frombuffer(packed, "<f8").reshape(50, 1 + len(FEATURE_ORDER))
+    assert np.allclose(out[:, 0], get_scorer().predict_proba(features))
+    assert np.allclose(out[:, 1:], get_scorer().contributions(features))
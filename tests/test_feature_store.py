@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+import training
+from batch_scoring import score_csv, score_store
+from feature_store import FeatureStore, build_store
+from prediction import FEATURE_ORDER
+
+
+def test_store_round_trips_the_csv(tmp_path):
+    store = build_store(training.DATA_PATH, str(tmp_path / "telco"), chunksize=1000)
+
+    raw = pd.read_csv(training.DATA_PATH)
+    assert store.rows == len(raw)
+    assert store.customer_ids() == raw["customerID"].tolist()
+    assert store.customer_ids(1000, 1002) == raw["customerID"][1000:1002].tolist()
+    assert store.column("Contract_one year").dtype == np.int8
+
+    matrix = training.preprocess(training.DATA_PATH)
+    opened = training.StoreMatrix.open(str(tmp_path / "telco"))
+    assert np.array_equal(opened.y, matrix.y)
+    # Only float32 rounding separates the store from the CSV path
+    selected = opened.select(FEATURE_ORDER).to_numpy()
+    assert np.allclose(selected, matrix.X, rtol=1e-6, atol=0)
+
+
+def test_score_store_matches_score_csv(tmp_path):
+    raw = pd.read_csv(training.DATA_PATH).drop(columns=["TotalCharges", "Churn"])
+    raw.to_csv(tmp_path / "export.csv", index=False)
+    build_store(str(tmp_path / "export.csv"), str(tmp_path / "export"))
+    assert FeatureStore(str(tmp_path / "export")).columns == FEATURE_ORDER
+
+    score_csv(str(tmp_path / "export.csv"), str(tmp_path / "from_csv.csv"))
+    report = score_store(
+        str(tmp_path / "export"), str(tmp_path / "from_store.csv"), chunksize=3000
+    )
+
+    assert (report.rows, report.chunks) == (len(raw), 3)
+    expected = pd.read_csv(tmp_path / "from_csv.csv")
+    scored = pd.read_csv(tmp_path / "from_store.csv")
+    assert scored["customerID"].equals(expected["customerID"])
+    assert np.allclose(
+        scored["churn_probability"], expected["churn_probability"], atol=1e-7
+    )
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import prediction
+from encoding import TELCO_COLUMNS, encode_telco_columns
+from prediction import PackedRows
+
+DATA_PATH = "input/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+# Guardrail for reduced-precision scoring over the whole Telco CSV
+MAX_ABS_ERROR = 1e-6
+
+
+def telco_features() -> np.ndarray:
+    df = pd.read_csv(DATA_PATH)
+    return encode_telco_columns(*(df[column] for column in TELCO_COLUMNS))
+
+
+def test_float32_error_on_full_csv_within_guardrail():
+    features = telco_features()
+    scorer = prediction.get_scorer()
+    expected = scorer.predict_proba(features)
+
+    single = scorer.float32.predict_proba(features.astype(np.float32))
+    packed = scorer.float32.predict_packed(PackedRows.pack(features))
+
+    assert single.dtype == packed.dtype == np.float32
+    assert np.abs(single - expected).max() < MAX_ABS_ERROR
+    assert np.abs(packed - expected).max() < MAX_ABS_ERROR
+
+
+def test_float32_engine_and_packed_rows(monkeypatch):
+    features = telco_features()[:100]
+    expected = prediction.make_prediction_batch(features)
+    packed = PackedRows.pack(features)
+    assert packed.nbytes == 10 * len(features)
+
+    monkeypatch.setattr(prediction, "ENGINE", "float32")
+    probs = prediction.make_prediction_batch(features)
+    row = prediction.make_prediction_row(features[0])
+
+    assert np.abs(probs - expected).max() < MAX_ABS_ERROR
+    assert abs(row - expected[0]) < MAX_ABS_ERROR
+    packed_probs = prediction.make_prediction_batch(packed)
+    assert np.abs(packed_probs - expected).max() < MAX_ABS_ERROR
+
+
+def test_pack_rejects_non_binary_features():
+    features = telco_features()[:2]
+    features[1, 4] = 0.5
+    with pytest.raises(ValueError):
+        PackedRows.pack(features)
@@ -0,0 +1,104 @@
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import incremental
+import training
+from model_registry import ModelRegistry
+from prediction import FEATURE_ORDER, MODEL_PATH, make_prediction_batch
+
+
+@pytest.fixture
+def batches(tmp_path) -> list[str]:
+    df = pd.read_csv(training.DATA_PATH).tail(600)
+    paths = []
+    for day, rows in enumerate((df.iloc[:300], df.iloc[300:])):
+        path = tmp_path / f"churn-day{day}.csv"
+        rows.to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def test_moving_the_scaler_keeps_predictions():
+    bundle = joblib.load(MODEL_PATH)
+    matrix = training.preprocess(training.DATA_PATH)
+    frame = matrix.select(FEATURE_ORDER)
+    before = bundle["model"].predict_proba(bundle["scaler"].transform(frame))
+
+    scaler = bundle["scaler"]
+    mean, scale = scaler.mean_.copy(), scaler.scale_.copy()
+    scaler.partial_fit(frame.iloc[:500] * 1.5)
+    incremental._rescale(bundle["model"], mean, scale, scaler)
+
+    after = bundle["model"].predict_proba(scaler.transform(frame))
+    assert not np.allclose(scaler.mean_, mean)
+    assert np.allclose(after, before, atol=1e-12)
+
+
+def test_update_starts_from_the_deployed_weights(tmp_path, batches):
+    base = joblib.load(MODEL_PATH)
+    published = tmp_path / "registry" / "telco_incremental.joblib"
+
+    bundle, updates = incremental.update(
+        batches[:1], str(tmp_path / "checkpoint.joblib"), publish=str(published)
+    )
+
+    # Rows with a blank TotalCharges are dropped, as in training
+    assert [update.rows for update in updates] == [299]
+    assert bundle["scaler"].n_samples_seen_ == base["scaler"].n_samples_seen_ + 299
+    assert np.abs(bundle["model"].coef_ - base["model"].coef_).max() < 0.05
+
+    registry = ModelRegistry(str(published.parent), default="telco_incremental")
+    registry.refresh()
+    matrix = training.preprocess(batches[0])
+    expected = bundle["model"].predict_proba(
+        bundle["scaler"].transform(matrix.select(FEATURE_ORDER))
+    )[:, 1]
+    probs = make_prediction_batch(matrix.X, registry.get().scorer)
+    assert np.allclose(probs, expected, atol=1e-12)
+
+
+def test_rerun_skips_applied_batches(tmp_path, batches):
+    checkpoint = str(tmp_path / "checkpoint.joblib")
+    _, first = incremental.update(batches[:1], checkpoint)
+
+    bundle, updates = incremental.update(batches, checkpoint)
+
+    assert [update.skipped for update in updates] == [True, False]
+    rows = first[0].rows + updates[1].rows
+    assert len(bundle["batches"]) == 2
+    assert joblib.load(checkpoint)["scaler"].n_samples_seen_ == (
+        joblib.load(MODEL_PATH)["scaler"].n_samples_seen_ + rows
+    )
+
+
+def test_plain_bundle_works_as_a_checkpoint(tmp_path, batches):
+    checkpoint = tmp_path / "telco_logistic_regression.joblib"
+    shutil.copyfile(MODEL_PATH, checkpoint)
+
+    bundle, updates = incremental.update(batches[:1], str(checkpoint))
+
+    assert [update.skipped for update in updates] == [False]
+    assert bundle["batches"] == joblib.load(checkpoint)["batches"]
+    assert len(bundle["batches"]) == 1
+
+
+def test_drift_against_a_full_retrain_is_small():
+    matrix = training.preprocess(training.DATA_PATH)
+    train, test = training.split_indices(matrix.y)
+
+    def rows(indices):
+        return training.FeatureMatrix(matrix.X[indices], matrix.y[indices])
+
+    history, *days = np.array_split(train, 6)
+    bundle = incremental.full_retrain(rows(history), FEATURE_ORDER)
+    for day in days:
+        incremental.update_bundle(bundle, rows(day))
+    full = incremental.full_retrain(rows(train), FEATURE_ORDER)
+
+    drift = incremental.drift(bundle, full, rows(test))
+    assert abs(drift["accuracy"]) < 0.01
+    assert abs(drift["roc_auc"]) < 0.005
@@ -0,0 +1,88 @@
+import time
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import backend.main
+import prediction
+from encoding import encode_row
+from lookup_table import MAX_MONTHLY_CENTS, MAX_TENURE, LookupTable
+
+CONTRACTS = [1, 12, 24]
+INTERNET = ["DSL", "Fiber optic", "No"]
+PAYMENTS = [
+    "Bank transfer (automatic)",
+    "Credit card (automatic)",
+    "Electronic check",
+    "Mailed check",
+]
+
+
+def sklearn_proba(rows):
+    df = pd.DataFrame(rows, columns=prediction.FEATURE_ORDER)
+    return prediction.MODEL.predict_proba(prediction.SCALER.transform(df))[:, 1]
+
+
+def test_table_matches_predict_proba_on_the_whole_categorical_grid():
+    table = prediction.get_scorer().lookup_table
+    requests = [
+        (tenure, monthly, *combination)
+        for combination in product([0, 1], [0, 1], CONTRACTS, INTERNET, PAYMENTS)
+        for tenure in range(MAX_TENURE + 1)
+        for monthly in (0.0, 18.25, 70.35, 118.75, MAX_MONTHLY_CENTS / 100)
+    ]
+    assert len(requests) == 144 * 73 * 5
+
+    probs = np.array([table.predict(*request) for request in requests])
+
+    expected = sklearn_proba([encode_row(*request) for request in requests])
+    assert np.abs(probs - expected).max() < 1e-12
+
+
+def test_off_grid_inputs_stay_exact():
+    table = prediction.get_scorer().lookup_table
+    requests = [
+        (10.5, 70.35, 1, 0, 1, "DSL", "Mailed check"),
+        (10, 70.355, 0, 1, 24, "No", "Electronic check"),
+        (100, 250.0, 1, 1, 12, "Fiber optic", "Credit card (automatic)"),
+        (-1, -5.0, 0, 0, 1, "unknown", "unknown"),
+        (10, 70.35, 2, 3, 24, "DSL", "Mailed check"),
+    ]
+
+    probs = np.array([table.predict(*request) for request in requests])
+
+    expected = sklearn_proba([encode_row(*request) for request in requests])
+    assert np.abs(probs - expected).max() < 1e-12
+
+
+def test_table_size_and_build_time():
+    scorer = prediction.get_scorer()
+
+    start = time.perf_counter()
+    table = LookupTable.build(scorer)
+    seconds = time.perf_counter() - start
+
+    assert table.nbytes == 8 * (144 + 73 + MAX_MONTHLY_CENTS + 1) < 200_000
+    assert seconds < 0.1
+    assert scorer.lookup_table is scorer.lookup_table
+
+
+def test_backend_lookup_mode(monkeypatch):
+    client = TestClient(backend.main.app)
+    request = {
+        "tenure": 10,
+        "monthly": 70.5,
+        "techsupport": 1,
+        "paperless": 1,
+        "contract_months": 24,
+        "internet_service": "Fiber optic",
+        "payment_method": "Electronic check",
+    }
+    expected = client.post("/predict", json=request).json()["churn_probability"]
+
+    monkeypatch.setattr(backend.main, "LOOKUP", True)
+    prob = client.post("/predict", json=request).json()["churn_probability"]
+
+    assert abs(prob - expected) < 1e-12
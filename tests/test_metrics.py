@@ -0,0 +1,64 @@
+from fastapi.testclient import TestClient
+
+import metrics
+from backend.main import app, metrics_endpoint
+
+
+def sample(text, line_start):
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_latency", "Test", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+
+    text = metrics.render()
+
+    assert sample(text, 'test_latency_bucket{le="0.1"}') == 1
+    assert sample(text, 'test_latency_bucket{le="1.0"}') == 3
+    assert sample(text, 'test_latency_bucket{le="+Inf"}') == 4
+    assert sample(text, "test_latency_count") == 4
+    assert sample(text, "test_latency_sum") == 6.05
+
+
+def test_labelled_counter_and_collectors():
+    counter = metrics.Counter("test_events", "Test", ("kind",))
+    counter.labels("a").inc()
+    counter.labels("a").inc(2)
+    counter.labels("b").inc()
+    metrics.register_collector(
+        lambda: [("test_external", "gauge", [("test_external", {}, 7)])]
+    )
+
+    text = metrics.render()
+
+    assert "# TYPE test_events counter" in text
+    assert sample(text, 'test_events_total{kind="a"}') == 3
+    assert sample(text, 'test_events_total{kind="b"}') == 1
+    assert sample(text, "test_external") == 7
+
+
+def test_metrics_endpoint_reports_prediction_stages():
+    request = {
+        "tenure": 10,
+        "monthly": 70.5,
+        "techsupport": 1,
+        "paperless": 1,
+        "contract_months": 24,
+        "internet_service": "Fiber optic",
+        "payment_method": "Electronic check",
+    }
+    encoded = 'telco_stage_seconds_count{stage="encode"}'
+    before = sample(metrics.render(), encoded)
+
+    TestClient(app).post("/predict", json=request)
+    response = metrics_endpoint()
+
+    assert response.media_type.startswith("text/plain")
+    text = response.body.decode()
+    assert sample(text, encoded) == before + 1
+    assert sample(text, "telco_model_load_seconds") > 0
@@ -0,0 +1,79 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+import model_registry
+from benchmarks.data import synthetic_features
+from model_registry import ModelRegistry, UnknownModelVersion
+from prediction import FEATURE_ORDER, make_prediction_batch
+
+BASELINE = ["tenure", "MonthlyCharges", "TechSupport_yes"]
+
+
+def write_bundle(path, features, seed=0):
+    X = pd.DataFrame(synthetic_features(500, seed), columns=FEATURE_ORDER)[features]
+    y = (X["tenure"] < 20).to_numpy(dtype=int)
+    scaler = StandardScaler()
+    model = LogisticRegression().fit(scaler.fit_transform(X), y)
+    joblib.dump({"model": model, "scaler": scaler}, path)
+    return model, scaler
+
+
+def test_registry_serves_feature_subset_models(tmp_path):
+    model, scaler = write_bundle(tmp_path / "baseline.joblib", BASELINE)
+    write_bundle(tmp_path / "full.joblib", FEATURE_ORDER)
+    registry = ModelRegistry(str(tmp_path), default="full")
+
+    assert registry.refresh()
+
+    rows = synthetic_features(50, seed=1)
+    expected = model.predict_proba(
+        scaler.transform(pd.DataFrame(rows, columns=FEATURE_ORDER)[BASELINE])
+    )[:, 1]
+    probs = make_prediction_batch(rows, registry.get("baseline").scorer)
+    assert np.allclose(probs, expected, atol=1e-12)
+    assert registry.get().name == "full"
+    with pytest.raises(UnknownModelVersion):
+        registry.get("missing")
+
+
+def test_refresh_swaps_changed_bundles_and_keeps_broken_ones(tmp_path):
+    path = tmp_path / "model.joblib"
+    write_bundle(path, FEATURE_ORDER, seed=0)
+    registry = ModelRegistry(str(tmp_path), default="model")
+    registry.refresh()
+    old = registry.get()
+
+    assert not registry.refresh()  # unchanged files are not reloaded
+
+    write_bundle(path, FEATURE_ORDER, seed=1)
+    assert registry.refresh()
+    new = registry.get()
+    assert new.sha256 != old.sha256
+    # A request that already looked up the old model can still use it
+    assert not np.array_equal(new.scorer.weights, old.scorer.weights)
+
+    path.write_bytes(b"not a bundle")
+    registry.refresh()
+    assert registry.get() is new
+    path.write_bytes(b"")  # a bundle caught mid-write
+    registry.refresh()
+    assert registry.get() is new
+
+    path.unlink()
+    assert registry.refresh()
+    assert registry.models() == {}
+
+
+def test_refresh_does_not_hide_bugs(tmp_path, monkeypatch):
+    write_bundle(tmp_path / "model.joblib", FEATURE_ORDER)
+
+    def broken(path):
+        raise TypeError("a bug, not a bad bundle")
+
+    monkeypatch.setattr(model_registry, "load_version", broken)
+    with pytest.raises(TypeError):
+        ModelRegistry(str(tmp_path), default="model").refresh()
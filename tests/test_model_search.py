@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+import model_search
+import training
+from model_registry import ModelRegistry
+from prediction import FEATURE_ORDER, make_prediction_batch
+
+CONFIGS = model_search.grid(c_values=(0.01, 1.0), class_weights=(None,))
+
+
+@pytest.fixture(scope="module")
+def matrix() -> training.FeatureMatrix:
+    return training.preprocess(training.DATA_PATH)
+
+
+def test_fold_scores_match_sklearn():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 500)
+    # Rounding leaves ties for the rank statistic to average
+    logits = np.round(rng.normal(size=500) + y, 1)
+
+    scores = model_search.fold_scores(y, logits)
+
+    predicted = logits > 0
+    assert scores["accuracy"] == pytest.approx(accuracy_score(y, predicted))
+    assert scores["f1"] == pytest.approx(f1_score(y, predicted))
+    assert scores["roc_auc"] == pytest.approx(roc_auc_score(y, logits))
+
+
+def test_scaling_every_feature_once_equals_scaling_each_set(matrix):
+    features = training.FEATURE_SETS["Model_3_PaperlessBilling"]
+    columns = [FEATURE_ORDER.index(feature) for feature in features]
+
+    everything = StandardScaler().fit_transform(matrix.select(FEATURE_ORDER))
+    alone = StandardScaler().fit_transform(matrix.select(features))
+
+    assert np.allclose(everything[:, columns], alone, atol=1e-12)
+
+
+def test_early_stopping_keeps_the_best_config(matrix):
+    full = model_search.search(matrix, CONFIGS, n_folds=3, margin=None)
+    early = model_search.search(matrix, CONFIGS, n_folds=3, margin=0.01)
+    parallel = model_search.search(matrix, CONFIGS, n_folds=3, n_jobs=2)
+
+    assert full.stopped == 0 and full.fits == 3 * len(CONFIGS)
+    assert 0 < early.stopped and early.fits < full.fits
+    assert early.best.config == full.best.config == parallel.best.config
+    for result in (early, parallel):
+        assert result.best.scores == full.best.scores
+    with pytest.raises(ValueError):
+        model_search.search(matrix, CONFIGS, metric="precision")
+
+
+def test_refitted_best_config_is_servable(tmp_path, matrix):
+    config = model_search.Config("Model_5_FinalModel", 0.1, "l1", "balanced")
+    candidate = model_search.fit_config(matrix, config)
+    path = training.save_bundle(candidate, str(tmp_path / f"{config.name}.joblib"))
+
+    registry = ModelRegistry(str(tmp_path), default=config.name)
+    registry.refresh()
+
+    expected = candidate.model.predict_proba(
+        candidate.scaler.transform(matrix.select(candidate.features))
+    )[:, 1]
+    probs = make_prediction_batch(matrix.X, registry.get().scorer)
+    assert path.endswith(".joblib")
+    assert np.allclose(probs, expected, atol=1e-12)
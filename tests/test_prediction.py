@@ -1,4 +1,9 @@
+import numpy as np
+import pandas as pd
+import pytest
+
 import prediction
+from benchmarks.data import synthetic_features
 
 
 def test_make_prediction_simple():
@@ -18,3 +23,74 @@ def test_make_prediction_simple():
 
     result = prediction.make_prediction(**args)
     assert isinstance(result, float)
+
+
+def test_make_prediction_batch_matches_single():
+    row = {
+        "tenure": 10,
+        "MonthlyCharges": 70.5,
+        "TechSupport_yes": 1,
+        "Contract_one year": 0,
+        "Contract_two year": 1,
+        "PaperlessBilling_yes": 1,
+        "InternetService_fiber optic": 1,
+        "InternetService_no": 0,
+        "PaymentMethod_credit card (automatic)": 0,
+        "PaymentMethod_electronic check": 1,
+        "PaymentMethod_mailed check": 0,
+    }
+    matrix = [[row[feature] for feature in prediction.FEATURE_ORDER]] * 3
+
+    from_records = prediction.make_prediction_batch([row, row])
+    from_matrix = prediction.make_prediction_batch(matrix)
+
+    assert from_records.shape == (2,)
+    assert from_matrix.shape == (3,)
+    assert abs(from_matrix[0] - prediction.make_prediction(**row)) < 1e-12
+    assert abs(from_records[0] - from_matrix[0]) < 1e-12
+
+
+def test_make_prediction_batch_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        prediction.make_prediction_batch([[1.0, 2.0]])
+
+
+def test_folded_model_matches_predict_proba():
+    rows = synthetic_features(5_000)
+
+    expected = prediction.MODEL.predict_proba(
+        prediction.SCALER.transform(
+            pd.DataFrame(rows, columns=prediction.FEATURE_ORDER)
+        )
+    )[:, 1]
+
+    assert np.max(np.abs(prediction.SCORER.predict_proba(rows) - expected)) < 1e-12
+
+
+def test_engines_agree(monkeypatch):
+    rows = synthetic_features(100)
+
+    monkeypatch.setattr(prediction, "ENGINE", "sklearn")
+    sklearn_probs = prediction.make_prediction_batch(rows)
+    monkeypatch.setattr(prediction, "ENGINE", "numpy")
+    numpy_probs = prediction.make_prediction_batch(rows)
+
+    assert np.allclose(sklearn_probs, numpy_probs, rtol=0, atol=1e-12)
+
+
+def test_committed_folded_artifact_is_fresh():
+    _, source = prediction.FoldedModel.load(prediction.FOLDED_MODEL_PATH)
+
+    assert source == prediction._file_sha256(prediction.MODEL_PATH)
+
+
+def test_stale_folded_artifact_is_ignored(tmp_path, monkeypatch):
+    path = str(tmp_path / "stale.npz")
+    prediction.FoldedModel(weights=np.zeros(11), bias=0.0).save(path, "other")
+    monkeypatch.setattr(prediction, "FOLDED_MODEL_PATH", path)
+    monkeypatch.setattr(prediction, "_SCORER", None)
+
+    scorer = prediction.get_scorer()
+
+    assert scorer.bias != 0.0
+    assert np.allclose(scorer.weights, prediction.SCORER.weights)
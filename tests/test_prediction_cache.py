@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from prediction_cache import PredictionCache
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, row):
+        self.calls += 1
+        return float(row.sum())
+
+
+def test_cache_hits_and_lru_eviction():
+    cache = PredictionCache(maxsize=2, version=lambda: "v1")
+    compute = Counter()
+    a, b, c = np.zeros(11), np.ones(11), np.full(11, 2.0)
+
+    cache.get_or_compute(a, compute)
+    cache.get_or_compute(b, compute)
+    cache.get_or_compute(a, compute)  # a is now the most recently used
+    cache.get_or_compute(c, compute)  # evicts b
+    cache.get_or_compute(a, compute)
+
+    stats = cache.stats()
+    assert compute.calls == 3
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1)
+    assert stats["size"] == 2
+
+
+def test_cache_keys_on_quantized_rows():
+    cache = PredictionCache(maxsize=8, decimals=2, version=lambda: "v1")
+    compute = Counter()
+    row = np.zeros(11)
+
+    cache.get_or_compute(row, compute)
+    cache.get_or_compute(row + 1e-6, compute)
+
+    assert compute.calls == 1
+
+
+def test_cache_invalidates_on_new_model_version():
+    version = ["v1"]
+    cache = PredictionCache(maxsize=8, version=lambda: version[0])
+    compute = Counter()
+    row = np.zeros(11)
+
+    cache.get_or_compute(row, compute)
+    version[0] = "v2"
+    cache.get_or_compute(row, compute)
+
+    assert compute.calls == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_cache_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        PredictionCache(maxsize=0)
@@ -0,0 +1,65 @@
+import io
+import json
+import logging
+import queue
+
+import numpy as np
+import pytest
+
+import prediction
+import prediction_logging
+
+
+@pytest.fixture(autouse=True)
+def restore_logging(monkeypatch):
+    # configure_logging(sample_rate=...) sets the module-wide rate; put it back
+    monkeypatch.setattr(
+        prediction_logging, "_sample_rate", prediction_logging._sample_rate
+    )
+    yield
+    prediction_logging.configure_logging()
+
+
+def test_sampled_predictions_are_logged_as_json():
+    stream = io.StringIO()
+    prediction_logging.configure_logging(sample_rate=1.0, stream=stream)
+    try:
+        prob = prediction.make_prediction_row(np.zeros(11))
+    finally:
+        prediction_logging.shutdown_logging()
+
+    record = json.loads(stream.getvalue().splitlines()[-1])
+    assert record["event"] == "prediction"
+    assert record["churn_probability"] == prob
+    assert record["features"]["tenure"] == 0.0
+
+
+def test_unsampled_predictions_are_not_logged():
+    stream = io.StringIO()
+    prediction_logging.configure_logging(sample_rate=0.0, stream=stream)
+    try:
+        prediction.make_prediction_batch(np.zeros((3, 11)))
+    finally:
+        prediction_logging.shutdown_logging()
+
+    assert stream.getvalue() == ""
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = prediction_logging.DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.makeLogRecord({"msg": "prediction"})
+
+    for _ in range(3):
+        handler.handle(record)
+
+    assert handler.dropped == 2
+
+
+def test_functions_host_mode_propagates_json_lines(caplog):
+    prediction_logging.configure_logging(sample_rate=1.0, propagate=True)
+    with caplog.at_level(logging.INFO):
+        prob = prediction.make_prediction_row(np.zeros(11))
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert caplog.records[-1].name == prediction_logging.LOGGER_NAME
+    assert record["churn_probability"] == prob
@@ -0,0 +1,95 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from backend.main import rank_upload
+from batch_scoring import score_csv
+from feature_store import build_store
+from ranking import merge, rank_csv, rank_store, top_k
+
+DATA_PATH = "input/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+
+@pytest.fixture(scope="module")
+def scored(tmp_path_factory) -> pd.DataFrame:
+    path = tmp_path_factory.mktemp("scores") / "scores.csv"
+    score_csv(DATA_PATH, str(path))
+    return pd.read_csv(path)
+
+
+def test_top_k_matches_a_full_sort(scored):
+    ranking = rank_csv(DATA_PATH, k=50, chunksize=500)
+
+    expected = scored.sort_values("churn_probability", ascending=False).head(50)
+    assert (ranking.rows, ranking.chunks) == (7043, 15)
+    assert np.array_equal(
+        ranking.probabilities, expected["churn_probability"].to_numpy()
+    )
+    assert set(ranking.customer_ids) == set(expected["customerID"])
+
+
+def test_workers_and_feature_store_agree(tmp_path):
+    single = rank_csv(DATA_PATH, k=200, chunksize=1000)
+    parallel = rank_csv(DATA_PATH, k=200, chunksize=1000, workers=2)
+    build_store(DATA_PATH, str(tmp_path / "telco.store"))
+    store = rank_store(str(tmp_path / "telco.store"), k=200, chunksize=1000)
+
+    for other in (parallel, store):
+        assert np.allclose(other.probabilities, single.probabilities, atol=1e-12)
+        assert set(other.customer_ids) == set(single.customer_ids)
+
+
+def test_blank_fields_rank_last():
+    df = pd.read_csv(DATA_PATH, dtype=str, keep_default_na=False).head(50)
+    expected = rank_csv(io.BytesIO(df.to_csv(index=False).encode()), k=5)
+    df.loc[3, "TotalCharges"] = ""
+    df.loc[expected.rows - 1, "tenure"] = ""
+    df.loc[expected.rows - 2, "MonthlyCharges"] = ""
+    blank = df.customerID.iloc[-2:].tolist()
+
+    ranking = rank_csv(io.BytesIO(df.to_csv(index=False).encode()), k=5, chunksize=20)
+    everyone = rank_csv(io.BytesIO(df.to_csv(index=False).encode()), k=50)
+
+    assert not set(blank) & set(ranking.customer_ids)
+    assert np.array_equal(ranking.probabilities, expected.probabilities)
+    assert everyone.customer_ids[-2:].tolist() in (blank, blank[::-1])
+    assert np.isnan(everyone.probabilities[-2:]).all()
+
+
+def test_merge_keeps_k_across_partials():
+    rng = np.random.default_rng(0)
+    probs = rng.random(10_000)
+    ids = np.array([f"c{i}" for i in range(len(probs))], dtype=object)
+    partials = [
+        (1000, *top_k(ids[i : i + 1000], probs[i : i + 1000], 10))
+        for i in range(0, len(probs), 1000)
+    ]
+
+    rows, chunks, best_ids, best_probs = merge(partials, 10)
+
+    order = np.argsort(-probs)[:10]
+    assert (rows, chunks) == (10_000, 10)
+    assert best_ids.tolist() == ids[order].tolist()
+    assert np.array_equal(best_probs, probs[order])
+    with pytest.raises(ValueError):
+        rank_csv(DATA_PATH, k=0)
+
+
+def test_rank_endpoint(scored):
+    with open(DATA_PATH, "rb") as f:
+        upload = UploadFile(io.BytesIO(f.read()), filename="telco.csv")
+
+    result = rank_upload(upload, k=3)
+
+    expected = scored.sort_values("churn_probability", ascending=False).head(3)
+    assert result["rows"] == 7043
+    assert [c["customerID"] for c in result["customers"]] == expected[
+        "customerID"
+    ].tolist()
+
+    with pytest.raises(HTTPException) as e:
+        rank_upload(UploadFile(io.BytesIO(b"tenure\n1\n")), k=3)
+    assert e.value.status_code == 400
@@ -0,0 +1,72 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+import backend.main
+from benchmarks.data import synthetic_features
+from prediction import FoldedModel, get_scorer, make_prediction_batch
+from shared_model import SharedModel, SharedModelPublisher
+
+
+def other_model(scorer):
+    return FoldedModel(weights=scorer.weights * 0.5, bias=scorer.bias + 1.0)
+
+
+def test_workers_score_from_the_published_segment(tmp_path):
+    scorer = get_scorer()
+    publisher = SharedModelPublisher(str(tmp_path / "model.json"))
+    publisher.publish(scorer, "v1")
+    try:
+        shared = SharedModel(str(publisher.pointer))
+
+        rows = synthetic_features(100)
+        assert shared.sha256 == "v1"
+        assert np.array_equal(
+            make_prediction_batch(rows, shared.scorer), scorer.predict_proba(rows)
+        )
+        assert np.array_equal(shared.scorer.mean, scorer.mean)
+        # A view over the segment, not a copy
+        assert not shared.scorer.weights.flags.owndata
+        assert not shared.refresh()
+    finally:
+        publisher.close()
+
+
+def test_republishing_swaps_segments(tmp_path):
+    scorer = get_scorer()
+    publisher = SharedModelPublisher(str(tmp_path / "model.json"))
+    first = publisher.publish(scorer, "v1")
+    try:
+        shared = SharedModel(str(publisher.pointer))
+        old = shared.scorer
+
+        second = publisher.publish(other_model(scorer), "v2")
+
+        assert shared.refresh()
+        assert shared.sha256 == "v2"
+        assert shared.scorer.bias == scorer.bias + 1.0
+        # The old segment is unlinked, but a scorer already in use still works
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(first)
+        rows = synthetic_features(10)
+        assert np.array_equal(old.predict_proba(rows), scorer.predict_proba(rows))
+        assert second != first
+    finally:
+        publisher.close()
+
+
+def test_backend_scores_with_the_shared_model(tmp_path, monkeypatch):
+    publisher = SharedModelPublisher(str(tmp_path / "model.json"))
+    publisher.publish(other_model(get_scorer()), "shared-version")
+    try:
+        shared = SharedModel(str(publisher.pointer))
+        monkeypatch.setattr(backend.main, "SHARED", shared)
+
+        rows = synthetic_features(5)
+        probs = backend.main.score_default_batch(rows)
+
+        assert np.array_equal(probs, shared.scorer.predict_proba(rows))
+        assert backend.main.default_version() == "shared-version"
+    finally:
+        publisher.close()
@@ -0,0 +1,104 @@
+from itertools import product
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from backend.main import SweepRequest, app, predict_sweep
+from encoding import encode_columns
+from prediction import get_scorer, make_prediction_batch
+from sweep import sweep
+
+BASE = {
+    "tenure": 10,
+    "monthly": 70.5,
+    "techsupport": 1,
+    "paperless": 1,
+    "contract_months": 24,
+    "internet_service": "Fiber optic",
+    "payment_method": "Electronic check",
+}
+
+AXES = {
+    "tenure": np.linspace(0, 72, 7).tolist(),
+    "monthly": [18.25, 70.5, 118.75],
+    "contract_months": [1, 12, 24],
+    "internet_service": ["DSL", "Fiber optic", "No"],
+    "payment_method": ["Bank transfer (automatic)", "Mailed check"],
+}
+
+
+def test_sweep_matches_scoring_every_cell():
+    probs = sweep(BASE, AXES, get_scorer())
+
+    cells = list(product(*AXES.values()))
+    columns = list(zip(*cells))
+    n = len(cells)
+    matrix = encode_columns(
+        columns[0],
+        columns[1],
+        [BASE["techsupport"]] * n,
+        [BASE["paperless"]] * n,
+        columns[2],
+        columns[3],
+        columns[4],
+    )
+    expected = make_prediction_batch(matrix).reshape(7, 3, 3, 3, 2)
+    assert probs.shape == expected.shape
+    assert np.abs(probs - expected).max() < 1e-12
+
+
+def test_sweep_keeps_axis_order_and_base_fields():
+    axes = {"payment_method": ["Mailed check"], "tenure": [10, 20]}
+
+    probs = sweep(BASE, axes, get_scorer())
+
+    assert probs.shape == (2, 1)
+    single = sweep(BASE, {"tenure": [10]}, get_scorer())
+    assert abs(probs[0, 0] - single[0]) > 1e-6  # the payment method changed it
+
+
+def test_sweep_endpoint_shapes_and_limits():
+    result = predict_sweep(
+        SweepRequest(
+            base=BASE,
+            tenure={"start": 0, "stop": 72, "num": 73},
+            contract_months=[1, 12, 24],
+        )
+    )
+    assert result["dimensions"] == ["tenure", "contract_months"]
+    assert np.shape(result["churn_probabilities"]) == (73, 3)
+
+    with pytest.raises(HTTPException) as error:
+        predict_sweep(
+            SweepRequest(
+                base=BASE,
+                tenure={"start": 0, "stop": 72, "num": 1000},
+                monthly={"start": 0, "stop": 150, "num": 1001},
+            )
+        )
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("num", [-1, 0, 10**9])
+def test_sweep_rejects_bad_sizes_before_building_the_grid(num):
+    response = TestClient(app).post(
+        "/predict/sweep",
+        json={"base": BASE, "tenure": {"start": 0, "stop": 72, "num": num}},
+    )
+    assert response.status_code == 422
+
+
+def test_sweep_rejects_long_category_lists():
+    response = TestClient(app).post(
+        "/predict/sweep",
+        json={"base": BASE, "contract_months": [1, 12, 24] * 1000},
+    )
+    assert response.status_code == 422
+
+
+def test_sweep_cell_count_does_not_overflow():
+    axes = {dimension: [BASE[dimension]] * 2**16 for dimension in AXES}
+    with pytest.raises(ValueError, match="exceeds"):
+        sweep(BASE, axes, get_scorer())
@@ -0,0 +1,58 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import training
+from benchmarks.bench_training import notebook_loop, notebook_preprocess
+from model_registry import ModelRegistry
+from prediction import FEATURE_ORDER, make_prediction_batch
+
+
+def test_preprocess_matches_notebook():
+    matrix = training.preprocess(training.DATA_PATH)
+
+    X_sel, _, y, _ = notebook_preprocess(pd.read_csv(training.DATA_PATH), FEATURE_ORDER)
+    assert np.array_equal(matrix.X, X_sel.to_numpy(dtype=np.float64))
+    assert np.array_equal(matrix.y, y)
+
+
+def test_candidates_match_notebook_scores():
+    expected = notebook_loop(training.DATA_PATH)
+
+    candidates = training.train_candidates(
+        training.preprocess(training.DATA_PATH), n_jobs=1
+    )
+
+    for candidate in candidates:
+        for metric, value in expected[candidate.name].items():
+            assert abs(candidate.scores[metric] - value) < 1e-12
+
+
+def test_cache_is_rebuilt_when_the_csv_changes(tmp_path):
+    path = tmp_path / "telco.csv"
+    shutil.copy(training.DATA_PATH, path)
+    first = training.load_features(str(path))
+    assert (tmp_path / "telco.features.npz").exists()
+
+    lines = path.read_text().splitlines(keepends=True)
+    path.write_text("".join(lines[:101]))
+
+    assert len(training.load_features(str(path)).y) == 100 < len(first.y)
+
+
+def test_saved_bundle_is_served_by_the_registry(tmp_path):
+    matrix = training.preprocess(training.DATA_PATH)
+    candidate = training.train_candidates(
+        matrix, {"Model_2_Contract": FEATURE_ORDER[:5]}, n_jobs=1
+    )[0]
+    training.save_bundle(candidate, training.bundle_path(candidate.name, tmp_path))
+
+    registry = ModelRegistry(str(tmp_path), default="telco_model_2_contract")
+    registry.refresh()
+
+    expected = candidate.model.predict_proba(
+        candidate.scaler.transform(matrix.select(candidate.features))
+    )[:, 1]
+    probs = make_prediction_batch(matrix.X, registry.get().scorer)
+    assert np.allclose(probs, expected, atol=1e-12)
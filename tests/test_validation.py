@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pytest
+
+from backend.main import predict_batch_endpoint
+from benchmarks.data import synthetic_features, synthetic_requests
+from encoding import encode_columns, encode_row
+from prediction import make_prediction_batch
+from tests.test_wire_formats import CUSTOMER, call
+from validation import validate_columns, validate_features, validate_records
+from wire_formats import BINARY, JSON
+
+
+def test_valid_columns_encode_like_encode_columns():
+    columns = synthetic_requests(1000)
+
+    batch = validate_columns(columns)
+
+    assert batch.valid.all()
+    assert batch.report() == []
+    assert np.array_equal(batch.features, encode_columns(*columns.values()))
+
+
+def test_every_bad_field_is_flagged_per_row():
+    rows = [
+        CUSTOMER,
+        {**CUSTOMER, "tenure": 73},
+        {**CUSTOMER, "monthly": -0.01, "techsupport": 2},
+        {**CUSTOMER, "contract_months": 1.5, "internet_service": "Fibre"},
+        {**CUSTOMER, "tenure": "ten", "payment_method": None},
+        {key: value for key, value in CUSTOMER.items() if key != "paperless"},
+        "not a row",
+        {**CUSTOMER, "tenure": [5]},
+        {**CUSTOMER, "contract_months": 0},
+    ]
+
+    batch = validate_records(rows)
+
+    assert batch.valid.tolist() == [True] + [False] * 7 + [True]
+    assert [sorted(entry["errors"]) for entry in batch.report()] == [
+        ["tenure"],
+        ["monthly", "techsupport"],
+        ["contract_months", "internet_service"],
+        ["payment_method", "tenure"],
+        ["paperless"],
+        sorted(CUSTOMER),
+        ["tenure"],
+    ]
+    # A contract of 0 months was valid before validation and stays so
+    assert np.array_equal(
+        batch.features,
+        np.stack([encode_row(**CUSTOMER), encode_row(**rows[-1])]),
+    )
+
+
+def test_encoded_rows_are_checked():
+    rows = synthetic_features(4)
+    rows[1, 0] = -1
+    rows[2, 2] = 0.5
+    rows[3, 8:11] = 1
+
+    batch = validate_features(rows)
+
+    assert batch.valid.tolist() == [True, False, False, False]
+    assert [list(entry["errors"]) for entry in batch.report()] == [
+        ["tenure"],
+        ["techsupport"],
+        ["payment_method"],
+    ]
+
+
+def test_batch_scores_good_rows_and_reports_bad_ones():
+    rows = [CUSTOMER, {**CUSTOMER, "tenure": 100}, CUSTOMER]
+    expected = make_prediction_batch(encode_row(**CUSTOMER)[None])[0]
+
+    result = json.loads(call(predict_batch_endpoint, json.dumps(rows).encode()))
+    packed = call(predict_batch_endpoint, json.dumps(rows).encode(), JSON, BINARY)
+
+    assert result["churn_probabilities"] == [
+        pytest.approx(expected),
+        None,
+        pytest.approx(expected),
+    ]
+    assert result["errors"] == [
+        {"row": 1, "errors": {"tenure": "must be a number from 0 to 72"}}
+    ]
+    assert np.isnan(np.frombuffer(packed, "<f8")[1])
+
+    # Batches without bad rows keep the response shape they had before
+    clean = json.loads(call(predict_batch_endpoint, json.dumps(rows[:1]).encode()))
+    assert clean == {"churn_probabilities": [pytest.approx(expected)]}
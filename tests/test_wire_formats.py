@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from starlette.requests import Request
+
+import wire_formats
+from backend.main import predict_batch_endpoint, predict_endpoint
+from benchmarks.data import synthetic_features
+from encoding import encode_row
+from prediction import FEATURE_ORDER, make_prediction_batch
+from wire_formats import ARROW, BINARY, JSON, decode_features, negotiate
+
+CUSTOMER = {
+    "tenure": 10,
+    "monthly": 70.5,
+    "techsupport": 1,
+    "paperless": 1,
+    "contract_months": 24,
+    "internet_service": "Fiber optic",
+    "payment_method": "Electronic check",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_engine(request, monkeypatch):
+    """Run a test through orjson and through the standard library fallback."""
+    if request.param == "json":
+        monkeypatch.setattr(wire_formats, "orjson", None)
+    else:
+        assert wire_formats.orjson is not None
+    return request.param
+
+
+def call(endpoint, body, content_type=JSON, accept=JSON, **params):
+    headers = [(b"content-type", content_type.encode()), (b"accept", accept.encode())]
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": headers}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    response = asyncio.run(endpoint(Request(scope, receive), **params))
+    assert response.media_type == accept
+    return response.body
+
+
+def test_batch_formats_agree(json_engine):
+    rows = synthetic_features(100)
+    expected = make_prediction_batch(rows)
+
+    binary = call(predict_batch_endpoint, rows.astype("<f8").tobytes(), BINARY, BINARY)
+    as_json = call(predict_batch_endpoint, rows.tobytes(), BINARY, JSON)
+
+    assert np.array_equal(np.frombuffer(binary, "<f8"), expected)
+    assert json.loads(as_json)["churn_probabilities"] == expected.tolist()
+
+
+def test_json_engines_agree(json_engine):
+    probs = make_prediction_batch(synthetic_features(100))
+    body = wire_formats.dumps({"churn_probabilities": probs, "errors": []})
+
+    assert json.loads(body)["churn_probabilities"] == probs.tolist()
+    assert wire_formats.loads(body) == json.loads(body)
+
+
+def test_arrow_batches():
+    pa = pytest.importorskip("pyarrow")
+    rows = synthetic_features(100)
+    table = pa.table({f: rows[:, i] for i, f in enumerate(FEATURE_ORDER)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    arrow = call(predict_batch_endpoint, sink.getvalue().to_pybytes(), ARROW, ARROW)
+
+    probs = pa.ipc.open_stream(arrow).read_all().column("churn_probability")
+    assert np.array_equal(probs.to_numpy(), make_prediction_batch(rows))
+
+
+def test_single_endpoint_reads_json_and_binary(json_engine):
+    as_json = call(predict_endpoint, json.dumps(CUSTOMER).encode())
+    prob = json.loads(as_json)["churn_probability"]
+
+    batch = call(predict_batch_endpoint, json.dumps([CUSTOMER]).encode(), JSON, BINARY)
+    row = encode_row(**CUSTOMER).tobytes()
+    binary = call(predict_endpoint, row, BINARY, BINARY)
+
+    assert np.frombuffer(batch, "<f8")[0] == prob
+    assert np.frombuffer(binary, "<f8")[0] == prob
+
+
+def test_packed_bodies_are_zero_copy_and_checked():
+    body = synthetic_features(3).tobytes()
+
+    features = decode_features(body, BINARY)
+
+    assert features.shape == (3, 11)
+    assert not features.flags.owndata
+    with pytest.raises(ValueError):
+        decode_features(body[:-1], BINARY)
+
+
+def test_negotiation_errors():
+    assert negotiate("text/html, application/octet-stream;q=0.9") == BINARY
+    assert negotiate("*/*") == JSON
+
+    with pytest.raises(HTTPException) as error:
+        call(predict_endpoint, b"x", "text/csv")
+    assert error.value.status_code == 415
+    with pytest.raises(HTTPException) as error:
+        call(predict_endpoint, json.dumps(CUSTOMER).encode(), JSON, "text/html")
+    assert error.value.status_code == 406
+    with pytest.raises(HTTPException) as error:
+        call(predict_endpoint, synthetic_features(2).tobytes(), BINARY)
+    assert error.value.status_code == 400
+    with pytest.raises(RequestValidationError):
+        call(predict_endpoint, b'{"tenure": "ten"}')
+
+
+def test_function_app_batch_route():
+    import azure.functions as func
+
+    from function_app import predict_batch
+
+    handler = predict_batch.build().get_user_function()
+    rows = synthetic_features(10)
+    request = func.HttpRequest(
+        "POST",
+        "/api/predict/batch",
+        headers={"content-type": BINARY, "accept": BINARY},
+        body=rows.tobytes(),
+    )
+
+    response = handler(request)
+
+    assert response.status_code == 200
+    probs = np.frombuffer(response.get_body(), "<f8")
+    assert np.array_equal(probs, make_prediction_batch(rows))
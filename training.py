@@ -0,0 +1,215 @@
+"""
+Training pipeline for the Telco churn models.
+
+The notebook re-runs its whole preprocessing for every feature set. Here the
+CSV is encoded once into a matrix with every column in ``FEATURE_ORDER``,
+cached next to the CSV, and each candidate model just selects its columns.
+The candidates are fitted in parallel with joblib, with the same split,
+scaling and solver as the notebook, and the chosen one is written as a
+bundle that ``prediction`` and the model registry can load.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from encoding import TELCO_COLUMNS, encode_telco_columns
+from feature_store import LABEL_COLUMN, FeatureStore
+from prediction import FEATURE_ORDER, FoldedModel, _file_sha256
+
+DATA_PATH = "input/WA_Fn-UseC_-Telco-Customer-Churn.csv"
+
+TEST_SIZE = 0.20
+RANDOM_STATE = 42
+SOLVER = "liblinear"
+MAX_ITER = 1000
+
+# Same candidates as the notebook, each a prefix of FEATURE_ORDER
+FEATURE_SETS = {
+    "Model_1_Baseline": FEATURE_ORDER[:3],
+    "Model_2_Contract": FEATURE_ORDER[:5],
+    "Model_3_PaperlessBilling": FEATURE_ORDER[:6],
+    "Model_4_InternetService": FEATURE_ORDER[:8],
+    "Model_5_FinalModel": FEATURE_ORDER[:11],
+}
+
+METRICS = ("accuracy", "f1", "roc_auc")
+
+
+@dataclass(frozen=True)
+class FeatureMatrix:
+    """Encoded customers in ``FEATURE_ORDER`` with their churn labels."""
+
+    X: np.ndarray
+    y: np.ndarray
+
+    def select(self, features: list[str]) -> pd.DataFrame:
+        # A DataFrame so the scaler records feature_names_in_ for the registry
+        columns = [FEATURE_ORDER.index(feature) for feature in features]
+        return pd.DataFrame(self.X[:, columns], columns=features)
+
+
+@dataclass(frozen=True)
+class StoreMatrix:
+    """Training rows read column by column from a feature store.
+
+    Only the columns a candidate selects are copied out of the memory maps.
+    """
+
+    store: FeatureStore
+    rows: np.ndarray
+    y: np.ndarray
+
+    @classmethod
+    def open(cls, directory: str) -> "StoreMatrix":
+        store = FeatureStore(directory)
+        # The notebook drops rows whose TotalCharges is blank
+        rows = np.flatnonzero(~np.isnan(store.column("TotalCharges")))
+        return cls(store, rows, np.asarray(store.column(LABEL_COLUMN)[rows]))
+
+    def select(self, features: list[str]) -> pd.DataFrame:
+        return pd.DataFrame(self.store.select(features, self.rows), columns=features)
+
+
+@dataclass(frozen=True)
+class Candidate:
+    name: str
+    features: list[str]
+    model: object
+    scaler: object
+    scores: dict[str, float]
+    seconds: float
+
+
+def preprocess(path: str = DATA_PATH) -> FeatureMatrix:
+    """Encode a raw Telco CSV the way the notebook does, in one pass."""
+    df = pd.read_csv(
+        path,
+        usecols=[*TELCO_COLUMNS, "TotalCharges", "Churn"],
+        dtype={column: "category" for column in TELCO_COLUMNS[2:]},
+    )
+    # The notebook drops rows whose TotalCharges is blank
+    df = df[pd.to_numeric(df["TotalCharges"], errors="coerce").notna()]
+    X = encode_telco_columns(*(df[column] for column in TELCO_COLUMNS))
+    y = (df["Churn"].str.strip().str.lower() == "yes").to_numpy(dtype=np.int8)
+    return FeatureMatrix(X=X, y=y)
+
+
+def load_features(path: str = DATA_PATH, cache: bool = True) -> FeatureMatrix:
+    """Return the encoded matrix for ``path``, reusing a fresh cached copy."""
+    cache_path = Path(path).with_suffix(".features.npz")
+    source = _file_sha256(path)
+    if cache and cache_path.exists():
+        with np.load(cache_path) as data:
+            if str(data["source_sha256"]) == source:
+                return FeatureMatrix(X=data["X"], y=data["y"])
+
+    matrix = preprocess(path)
+    if cache:
+        np.savez(cache_path, X=matrix.X, y=matrix.y, source_sha256=np.str_(source))
+    return matrix
+
+
+def open_matrix(data: str, cache: bool = True) -> FeatureMatrix | StoreMatrix:
+    """A feature store directory as a StoreMatrix, a CSV as a FeatureMatrix."""
+    if os.path.isdir(data):
+        return StoreMatrix.open(data)
+    return load_features(data, cache=cache)
+
+
+def split_indices(y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """The notebook's stratified train/test split, as row indices."""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(
+        np.arange(len(y)), test_size=TEST_SIZE, stratify=y, random_state=RANDOM_STATE
+    )
+
+
+def evaluate(model, X: np.ndarray, y: np.ndarray) -> dict[str, float]:
+    """Every one of ``METRICS`` for a fitted model on scaled rows."""
+    from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+
+    predicted = model.predict(X)
+    proba = model.predict_proba(X)[:, 1]
+    return {
+        "accuracy": accuracy_score(y, predicted),
+        "f1": f1_score(y, predicted),
+        "roc_auc": roc_auc_score(y, proba),
+    }
+
+
+def fit_candidate(
+    name: str,
+    features: list[str],
+    matrix: FeatureMatrix | StoreMatrix,
+    train: np.ndarray,
+    test: np.ndarray,
+) -> Candidate:
+    """Scale, fit and score one feature set exactly like the notebook."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+
+    start = time.perf_counter()
+    # As in the notebook, the scaler sees every row before the split
+    scaler = StandardScaler()
+    X = scaler.fit_transform(matrix.select(features))
+    model = LogisticRegression(
+        solver=SOLVER, max_iter=MAX_ITER, random_state=RANDOM_STATE
+    )
+    model.fit(X[train], matrix.y[train])
+
+    scores = evaluate(model, X[test], matrix.y[test])
+    return Candidate(
+        name, list(features), model, scaler, scores, time.perf_counter() - start
+    )
+
+
+def train_candidates(
+    matrix: FeatureMatrix | StoreMatrix,
+    feature_sets: dict[str, list[str]] = FEATURE_SETS,
+    n_jobs: int = -1,
+) -> list[Candidate]:
+    """Fit every feature set, in parallel across ``n_jobs`` processes."""
+    train, test = split_indices(matrix.y)
+    return Parallel(n_jobs=n_jobs)(
+        delayed(fit_candidate)(name, features, matrix, train, test)
+        for name, features in feature_sets.items()
+    )
+
+
+def choose(candidates: list[Candidate], metric: str = "roc_auc") -> Candidate:
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+    return max(candidates, key=lambda candidate: candidate.scores[metric])
+
+
+def bundle_path(name: str, directory: str = "models") -> str:
+    """Where ``save_bundle`` writes a candidate by default."""
+    return os.path.join(directory, f"telco_{name.lower()}.joblib")
+
+
+def save_bundle(candidate: Candidate, path: str, **extra) -> str:
+    """Write a joblib bundle plus its folded ``.npz`` export.
+
+    Both files are written under temporary names and renamed into place, so
+    a watching model registry never reads a half-written bundle. ``extra``
+    keys are stored in the bundle next to the model and scaler.
+    """
+    import joblib
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    joblib.dump({"model": candidate.model, "scaler": candidate.scaler, **extra}, tmp)
+    folded = os.path.splitext(path)[0] + ".npz"
+    scorer = FoldedModel.from_bundle(candidate.model, candidate.scaler)
+    scorer.save(folded + ".tmp.npz", source_sha256=_file_sha256(tmp))
+    # The .npz goes first; the registry only looks for it once the bundle lands
+    os.replace(folded + ".tmp.npz", folded)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,183 @@
+"""
+Column-wise validation of raw prediction requests.
+
+``validate_columns`` checks whole columns of request fields at once and
+returns a boolean error mask per field instead of stopping at the first bad
+value:
+
+- tenure must be a number from 0 to ``MAX_TENURE``
+- MonthlyCharges must be a number of at least 0
+- techsupport and paperless must be 0 or 1
+- contract_months must be a whole number; 1 or less is month-to-month, as in
+  ``encode_row``
+- internet_service and payment_method must be known categories, matched
+  case-insensitively; unlike ``encode_row``, unknown strings and typos are
+  errors rather than the baseline category
+
+Valid rows are encoded in the same pass, so a batch can score its good rows
+and report its bad ones together. ``validate_features`` applies the same
+ranges to rows that arrive already encoded.
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from encoding import (
+    CONTRACT_COLUMNS,
+    CONTRACT_MONTH_BOUNDS,
+    CONTRACT_ONEHOT,
+    INTERNET_CODES,
+    INTERNET_COLUMNS,
+    INTERNET_ONEHOT,
+    N_FEATURES,
+    PAYMENT_CODES,
+    PAYMENT_COLUMNS,
+    PAYMENT_ONEHOT,
+    REQUEST_FIELDS,
+)
+
+MAX_TENURE = 72
+
+MESSAGES = {
+    "tenure": f"must be a number from 0 to {MAX_TENURE}",
+    "monthly": "must be a number of at least 0",
+    "techsupport": "must be 0 or 1",
+    "paperless": "must be 0 or 1",
+    "contract_months": "must be a whole number of months",
+    "internet_service": f"must be one of {sorted(INTERNET_CODES)}",
+    "payment_method": f"must be one of {sorted(PAYMENT_CODES)}",
+}
+
+
+@dataclass(frozen=True)
+class ValidatedBatch:
+    """Encoded valid rows plus a per-field error mask over every row."""
+
+    features: np.ndarray
+    valid: np.ndarray
+    errors: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def expand(self, probs: np.ndarray) -> np.ndarray:
+        """Spread the valid rows' results over every row, NaN elsewhere."""
+        out = np.full((len(self.valid), *np.shape(probs)[1:]), np.nan)
+        out[self.valid] = probs
+        return out
+
+    def report(self) -> list[dict]:
+        """One entry per invalid row, naming each failed field."""
+        failed = {field: np.flatnonzero(mask) for field, mask in self.errors.items()}
+        rows: dict[int, dict[str, str]] = {}
+        for field, indices in failed.items():
+            for i in indices.tolist():
+                rows.setdefault(i, {})[field] = MESSAGES[field]
+        return [{"row": i, "errors": rows[i]} for i in sorted(rows)]
+
+
+def _numbers(values: Sequence) -> np.ndarray:
+    """float64 column, NaN wherever a value is not a number."""
+    try:
+        # None becomes NaN; numeric strings are accepted as pydantic does
+        column = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        column = None
+    if column is None or column.shape != (len(values),):
+        # A value that is itself a list, e.g. [5], is not a number
+        return np.fromiter(map(_number, values), np.float64, len(values))
+    return column
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _category_codes(values: Sequence, codes: dict[str, int]) -> np.ndarray:
+    """Row codes of a categorical column, -1 for anything not in ``codes``."""
+
+    def code(value) -> int:
+        if isinstance(value, str):
+            return codes.get(value.lower().strip(), -1)
+        return -1
+
+    try:
+        # Normalize each distinct value once, then map rows through a dict
+        table = {value: code(value) for value in set(values)}
+    except TypeError:  # an unhashable value, e.g. a list
+        return np.fromiter(map(code, values), np.intp, len(values))
+    return np.fromiter(map(table.__getitem__, values), np.intp, len(values))
+
+
+def validate_columns(columns: Mapping[str, Sequence]) -> ValidatedBatch:
+    """Validate and encode request fields given column-wise."""
+    tenure = _numbers(columns["tenure"])
+    monthly = _numbers(columns["monthly"])
+    techsupport = _numbers(columns["techsupport"])
+    paperless = _numbers(columns["paperless"])
+    contract = _numbers(columns["contract_months"])
+    internet = _category_codes(columns["internet_service"], INTERNET_CODES)
+    payment = _category_codes(columns["payment_method"], PAYMENT_CODES)
+
+    # NaN fails every comparison, so missing and non-numeric values are caught
+    errors = {
+        "tenure": ~((tenure >= 0) & (tenure <= MAX_TENURE)),
+        "monthly": ~((monthly >= 0) & np.isfinite(monthly)),
+        "techsupport": ~((techsupport == 0) | (techsupport == 1)),
+        "paperless": ~((paperless == 0) | (paperless == 1)),
+        "contract_months": ~(np.isfinite(contract) & (contract % 1 == 0)),
+        "internet_service": internet < 0,
+        "payment_method": payment < 0,
+    }
+    valid = ~np.logical_or.reduce(list(errors.values()))
+
+    features = np.empty((int(valid.sum()), N_FEATURES), dtype=np.float64)
+    features[:, 0] = tenure[valid]
+    features[:, 1] = monthly[valid]
+    features[:, 2] = techsupport[valid]
+    contract_codes = np.searchsorted(
+        CONTRACT_MONTH_BOUNDS, contract[valid], side="left"
+    )
+    features[:, CONTRACT_COLUMNS] = CONTRACT_ONEHOT[contract_codes]
+    features[:, 5] = paperless[valid]
+    features[:, INTERNET_COLUMNS] = INTERNET_ONEHOT[internet[valid]]
+    features[:, PAYMENT_COLUMNS] = PAYMENT_ONEHOT[payment[valid]]
+    return ValidatedBatch(features, valid, errors)
+
+
+def validate_records(records: Sequence) -> ValidatedBatch:
+    """Validate a list of request dicts; a missing field counts as invalid."""
+    records = [record if isinstance(record, Mapping) else {} for record in records]
+    return validate_columns(
+        {field: [record.get(field) for record in records] for field in REQUEST_FIELDS}
+    )
+
+
+def validate_features(matrix: np.ndarray) -> ValidatedBatch:
+    """Check already encoded rows in ``FEATURE_ORDER`` against the same rules."""
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(-1, N_FEATURES)
+    # One contiguous array per feature; reducing across strided rows is slower
+    columns = np.ascontiguousarray(matrix.T)
+    binary = (columns == 0) | (columns == 1)
+
+    def one_hot(block) -> np.ndarray:
+        # 0/1 flags with at most one set; none set is the baseline category
+        return ~(binary[block].all(axis=0) & (columns[block].sum(axis=0) <= 1))
+
+    errors = {
+        "tenure": ~((columns[0] >= 0) & (columns[0] <= MAX_TENURE)),
+        "monthly": ~((columns[1] >= 0) & np.isfinite(columns[1])),
+        "techsupport": ~binary[2],
+        "paperless": ~binary[5],
+        "contract_months": one_hot(CONTRACT_COLUMNS),
+        "internet_service": one_hot(INTERNET_COLUMNS),
+        "payment_method": one_hot(PAYMENT_COLUMNS),
+    }
+    valid = ~np.logical_or.reduce(list(errors.values()))
+    features = matrix if valid.all() else matrix[valid]
+    return ValidatedBatch(features, valid, errors)
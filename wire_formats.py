@@ -0,0 +1,197 @@
+"""
+Request and response formats for high-volume callers.
+
+Besides JSON, the scoring endpoints accept and return two packed formats:
+
+- ``application/octet-stream``: raw little-endian float64. A request is
+  ``n`` rows of the 11 ``FEATURE_ORDER`` features, 88 bytes per row; the
+  response is ``n`` probabilities, 8 bytes each. Requests are read with
+  ``np.frombuffer``, so rows are scored straight from the request body.
+- ``application/vnd.apache.arrow.stream``: an Arrow IPC stream with one
+  float64 column per ``FEATURE_ORDER`` feature, answered with a single
+  ``churn_probability`` column. Needs the optional ``pyarrow`` package.
+
+JSON is read and written with ``orjson``, which serializes NumPy arrays
+without building a Python float per row. The standard library ``json`` is
+the fallback where orjson is not installed.
+"""
+
+import importlib.util
+import json
+
+import numpy as np
+
+from prediction import FEATURE_ORDER
+
+try:
+    import orjson
+except ImportError:  # a dependency, but the standard library still works
+    orjson = None
+
+JSON = "application/json"
+BINARY = "application/octet-stream"
+ARROW = "application/vnd.apache.arrow.stream"
+MEDIA_TYPES = (JSON, BINARY, ARROW)
+
+# Checked without importing it; pyarrow itself is only imported on use
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+ROW_BYTES = 8 * len(FEATURE_ORDER)
+
+
+class UnsupportedMediaType(ValueError):
+    """Raised for a request body in a format the endpoints cannot read."""
+
+
+class NotAcceptable(ValueError):
+    """Raised when the Accept header names no format the endpoints can write."""
+
+
+def _pyarrow():
+    import pyarrow
+    import pyarrow.ipc
+
+    return pyarrow
+
+
+def _supported(kind: str) -> bool:
+    return kind in MEDIA_TYPES and (kind != ARROW or ARROW_AVAILABLE)
+
+
+def media_type(content_type: str | None) -> str:
+    """The media type of a Content-Type header, JSON when it is missing."""
+    if not content_type:
+        return JSON
+    kind = content_type.split(";")[0].strip().lower()
+    if not _supported(kind):
+        raise UnsupportedMediaType(
+            f"Unsupported Content-Type {kind!r}, expected one of {MEDIA_TYPES}"
+        )
+    return kind
+
+
+def negotiate(accept: str | None) -> str:
+    """The first supported media type listed in an Accept header."""
+    if not accept:
+        return JSON
+    for entry in accept.split(","):
+        kind = entry.split(";")[0].strip().lower()
+        if _supported(kind):
+            return kind
+        if kind in ("*/*", "application/*"):
+            return JSON
+    raise NotAcceptable(
+        f"Cannot respond with {accept!r}, expected one of {MEDIA_TYPES}"
+    )
+
+
+def decode_features(body: bytes, kind: str) -> np.ndarray:
+    """An (n, 11) float64 matrix from a packed request body."""
+    if kind == BINARY:
+        if len(body) % ROW_BYTES:
+            raise ValueError(
+                f"Body of {len(body)} bytes is not a whole number of "
+                f"{ROW_BYTES}-byte rows"
+            )
+        # A read-only view of the body; nothing is copied
+        return np.frombuffer(body, dtype="<f8").reshape(-1, len(FEATURE_ORDER))
+    if kind == ARROW:
+        table = _pyarrow().ipc.open_stream(body).read_all()
+        missing = [
+            feature for feature in FEATURE_ORDER if feature not in table.schema.names
+        ]
+        if missing:
+            raise ValueError(f"Missing feature columns: {missing}")
+        return np.column_stack(
+            [table.column(feature).to_numpy() for feature in FEATURE_ORDER]
+        )
+    raise UnsupportedMediaType(f"Cannot decode features from {kind!r}")
+
+
+def loads(body: bytes):
+    """Parse JSON, through orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def dumps(obj) -> bytes:
+    """JSON bytes, through orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=np.ndarray.tolist).encode()
+
+
+def _arrow_stream(columns: dict, metadata: dict | None = None) -> bytes:
+    pa = _pyarrow()
+    table = pa.table(columns, metadata=metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_probabilities(
+    probs: np.ndarray, kind: str, key: str, errors: list | None = None
+) -> bytes:
+    """Render probabilities in ``kind``; ``key`` names the JSON field.
+
+    Rows that were not scored are NaN in the packed formats and null in
+    JSON, where a non-empty ``errors`` is added alongside the probabilities.
+    """
+    if kind == BINARY:
+        return np.asarray(probs, dtype="<f8").tobytes()
+    if kind == ARROW:
+        return _arrow_stream({"churn_probability": np.atleast_1d(probs)})
+    if not errors:
+        return dumps({key: probs})
+    probs = np.where(np.isnan(probs), None, probs).tolist()
+    return dumps({key: probs, "errors": errors})
+
+
+def encode_explanation(
+    probs: np.ndarray,
+    contributions: np.ndarray,
+    intercept: float,
+    kind: str,
+    key: str,
+    errors: list | None = None,
+) -> bytes:
+    """Render probabilities with each row's per-feature logit contributions.
+
+    Raw float64 rows hold the probability followed by the 11 contributions.
+    Arrow adds one contribution column per ``FEATURE_ORDER`` feature and
+    keeps the intercept in the schema metadata. JSON lists the features
+    once; a single row's contributions are keyed by feature instead.
+    """
+    if kind == BINARY:
+        contributions = np.atleast_2d(contributions)
+        rows = np.empty((len(contributions), 1 + len(FEATURE_ORDER)), dtype="<f8")
+        rows[:, 0] = probs
+        rows[:, 1:] = contributions
+        return rows.tobytes()
+    if kind == ARROW:
+        columns = np.atleast_2d(contributions).T
+        return _arrow_stream(
+            {
+                "churn_probability": np.atleast_1d(probs),
+                **dict(zip(FEATURE_ORDER, columns, strict=True)),
+            },
+            metadata={"intercept": repr(intercept)},
+        )
+    if np.ndim(contributions) == 1:
+        named = dict(zip(FEATURE_ORDER, contributions.tolist(), strict=True))
+        return dumps({key: probs, "intercept": intercept, "contributions": named})
+    body = {
+        key: probs,
+        "intercept": intercept,
+        "features": FEATURE_ORDER,
+        "contributions": contributions,
+    }
+    if errors:
+        body[key] = np.where(np.isnan(probs), None, probs).tolist()
+        body["contributions"] = [
+            None if np.isnan(row[0]) else row for row in contributions.tolist()
+        ]
+        body["errors"] = errors
+    return dumps(body)